@@ -0,0 +1,155 @@
+"""
+Per-Year Aggregate Cube / Cube d'Agrégats par Année
+Summary statistics for every indicator, year and grouping, computed once at load.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bundle import INDICATOR_COLUMNS
+
+STATS = ['mean', 'median', 'min', 'max', 'count', 'sum', 'wmean']
+
+# Weight of each indicator in 'wmean': population for population rates,
+# new cases for per-patient measures. Unlisted (counts) weigh every row alike.
+WEIGHTS = {
+    'Incidence_Rate_ASR': 'Population_Millions',
+    'Mortality_Rate_ASR': 'Population_Millions',
+    'Screening_Coverage_%': 'Population_Millions',
+    'MI_Ratio': 'New_Cases',
+    'Early_Detection_Rate_%': 'New_Cases',
+    'Treatment_Coverage_%': 'New_Cases',
+    'Five_Year_Survival_%': 'New_Cases',
+}
+
+# Grouping levels: None means the whole world
+LEVELS = {
+    'global': None,
+    'hdi': 'HDI_Category',
+    'region': 'Region',
+}
+GLOBAL = 'Global'
+
+
+def _weighted_terms(df):
+    """(value x weight, weight) per row and indicator, zero where the value is missing"""
+    values = df[INDICATOR_COLUMNS].to_numpy(dtype=float)
+    weights = np.column_stack([
+        df[WEIGHTS[col]].to_numpy(dtype=float) if col in WEIGHTS else np.ones(len(df))
+        for col in INDICATOR_COLUMNS
+    ])
+    missing = np.isnan(values)
+    weights[missing] = 0.0
+    return np.where(missing, 0.0, values) * weights, weights
+
+
+class AggregateCube:
+    """mean/median/min/max/count/sum/wmean per (level, year, group, indicator)
+
+    'wmean' is the mean weighted by WEIGHTS, so a large country counts for
+    its population (or its patients) rather than as one row. `table` has a
+    (Level, Year, Group) row index and (stat, indicator) columns. It is built
+    with one grouped pass per level, weighted sums included; afterwards every
+    lookup is a dictionary hit returning a small groups x indicators frame.
+    arrays() / from_arrays() round-trip it through plain arrays, which the
+    dataset stores beside the bundle and memory-maps.
+    """
+
+    def __init__(self, df):
+        products, weights = _weighted_terms(df)
+        width = len(INDICATOR_COLUMNS)
+        terms = pd.DataFrame(np.hstack([products, weights]), index=df.index)
+        terms = pd.concat([df[['Year', *filter(None, LEVELS.values())]], terms], axis=1)
+
+        frames = []
+        for level, column in LEVELS.items():
+            keys = ['Year'] if column is None else ['Year', column]
+            grouped = df.groupby(keys, observed=True, sort=True)[INDICATOR_COLUMNS]
+            sums = terms.groupby(keys, observed=True, sort=True)[list(range(2 * width))].sum().to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                wmean = sums[:, :width] / sums[:, width:]
+            stats = {stat: getattr(grouped, stat)() for stat in STATS if stat != 'wmean'}
+            stats['wmean'] = pd.DataFrame(wmean, index=stats['mean'].index, columns=INDICATOR_COLUMNS)
+            stats = pd.concat(stats, axis=1)
+            if column is None:
+                stats.index = pd.MultiIndex.from_arrays(
+                    [stats.index, [GLOBAL] * len(stats)], names=['Year', 'Group'])
+            else:
+                stats.index = stats.index.set_names(['Year', 'Group'])
+                stats.index = stats.index.set_levels(
+                    stats.index.levels[1].astype(str), level='Group')
+            frames.append(stats)
+        table = pd.concat(frames, keys=list(LEVELS), names=['Level'])
+        self._setup(table.index, {stat: table[stat].to_numpy() for stat in STATS})
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        """Rebuild from arrays() output without copying the stat arrays"""
+        cube = cls.__new__(cls)
+        index = pd.MultiIndex.from_arrays(
+            [meta['levels'], meta['years'], meta['groups']], names=['Level', 'Year', 'Group'])
+        cube._setup(index, {stat: arrays[stat] for stat in STATS})
+        return cube
+
+    @classmethod
+    def patched(cls, cube, update, years):
+        """`cube` with the rows of `years` replaced by `update`, a cube of just those years"""
+        keep = ~np.isin(cube.index.get_level_values('Year'), list(years))
+        index = cube.index[keep].append(update.index)
+        values = {
+            stat: np.concatenate([np.asarray(cube._values[stat])[keep], update._values[stat]])
+            for stat in STATS
+        }
+        # Back to level order, then year, then group name
+        level_order = pd.Index(list(LEVELS)).get_indexer(index.get_level_values('Level'))
+        group_order = pd.factorize(index.get_level_values('Group'), sort=True)[0]
+        order = np.lexsort((group_order, index.get_level_values('Year'), level_order))
+        result = cls.__new__(cls)
+        result._setup(index[order], {stat: values[stat][order] for stat in STATS})
+        return result
+
+    def arrays(self):
+        """(JSON-friendly row labels, {stat: rows x indicators array})"""
+        meta = {
+            'levels': [str(v) for v in self.index.get_level_values('Level')],
+            'years': [int(v) for v in self.index.get_level_values('Year')],
+            'groups': [str(v) for v in self.index.get_level_values('Group')],
+        }
+        return meta, dict(self._values)
+
+    def _setup(self, index, values):
+        self.index = index
+        self._values = values
+
+        # Rows are contiguous per (level, year): cut each stat into O(1) slices
+        levels = index.get_level_values('Level')
+        years = index.get_level_values('Year').to_numpy()
+        groups = index.get_level_values('Group')
+        starts = np.flatnonzero(np.r_[True, (levels[1:] != levels[:-1]) | (years[1:] != years[:-1])])
+        stops = np.r_[starts[1:], len(years)]
+
+        self._cells = {}
+        for stat in STATS:
+            by_stat = pd.DataFrame(values[stat], index=groups, columns=INDICATOR_COLUMNS, copy=False)
+            for start, stop in zip(starts, stops):
+                self._cells[levels[start], int(years[start]), stat] = by_stat.iloc[start:stop]
+
+    @property
+    def table(self):
+        """The whole cube as one (Level, Year, Group) x (stat, indicator) frame"""
+        return pd.concat({
+            stat: pd.DataFrame(self._values[stat], index=self.index, columns=INDICATOR_COLUMNS)
+            for stat in STATS
+        }, axis=1)
+
+    def get(self, year, level='global', stat='mean'):
+        """groups x indicators frame for one year (empty if the year is unknown)"""
+        cell = self._cells.get((level, int(year), stat))
+        if cell is None:
+            return pd.DataFrame(columns=INDICATOR_COLUMNS)
+        return cell
+
+    def global_stat(self, year, stat='mean'):
+        """indicator -> value Series across all countries for one year"""
+        cell = self.get(year, 'global', stat)
+        return cell.iloc[0] if len(cell) else pd.Series(index=INDICATOR_COLUMNS, dtype=float)
@@ -0,0 +1,260 @@
+"""
+Analytics Core / Noyau Analytique
+Every dashboard computation as plain functions over a Dataset - no Streamlit needed.
+
+    from analytics import load, country_profile
+    profile = country_profile(load(), 'Benin', 2023)
+"""
+
+import numpy as np
+import pandas as pd
+
+from bundle import CSV_PATH, INDICATOR_COLUMNS
+from dataset import Dataset
+from geo import mapped
+from peers import FEATURES as PEER_FEATURES
+from projections import LEVEL
+from rules import CONCERN
+
+# Recommended targets for the key indicators (%)
+TARGETS = {
+    'Screening_Coverage_%': 70,
+    'Early_Detection_Rate_%': 60,
+    'Treatment_Coverage_%': 90,
+    'Five_Year_Survival_%': 70,
+}
+
+# MI ratio bands: below MI_GOOD is good, from MI_HIGH up is high
+MI_GOOD = 30
+MI_HIGH = 50
+
+# Decimals kept in the map's animation frames (1 for indicators not listed)
+MAP_DECIMALS = {'New_Cases': 0, 'Deaths': 0, 'Population_Millions': 2}
+
+# Indicators whose 2030 projection is weighed against its target
+OUTLOOK_COLUMNS = ['Five_Year_Survival_%', 'Screening_Coverage_%', 'MI_Ratio']
+
+# Indicators whose first-to-last-year change the trends section reports
+CHANGE_COLUMNS = ['Five_Year_Survival_%', 'Screening_Coverage_%', 'Incidence_Rate_ASR', 'MI_Ratio']
+
+
+def load(csv_path=CSV_PATH):
+    """Load the dataset outside Streamlit"""
+    return Dataset.from_bundle(csv_path)
+
+
+def count_text(value):
+    """A count with thousands separators, or '—' when the source left it blank"""
+    return "—" if pd.isna(value) else f"{int(value):,}"
+
+
+def calculated_metrics(record):
+    """Case fatality (%), cases and deaths per million population for one record"""
+    new_cases = record['New_Cases']
+    population = record['Population_Millions']
+    return {
+        'case_fatality': float(record['Deaths'] / new_cases * 100) if new_cases > 0 else 0.0,
+        'cases_per_million': float(new_cases / population),
+        'deaths_per_million': float(record['Deaths'] / population),
+    }
+
+
+def derived_metrics(df):
+    """calculated_metrics() for every row at once"""
+    new_cases = df['New_Cases'].to_numpy(dtype=float)
+    deaths = df['Deaths'].to_numpy(dtype=float)
+    population = df['Population_Millions'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        case_fatality = np.where(new_cases > 0, deaths / new_cases * 100, 0.0)
+        return pd.DataFrame({
+            'case_fatality': case_fatality,
+            'cases_per_million': new_cases / population,
+            'deaths_per_million': deaths / population,
+        }, index=df.index)
+
+
+def mi_status(mi_ratio):
+    """'good', 'moderate' or 'high' (also the translation keys)"""
+    if mi_ratio < MI_GOOD:
+        return 'good'
+    if mi_ratio < MI_HIGH:
+        return 'moderate'
+    return 'high'
+
+
+def target_gaps(record):
+    """{indicator: (gap to target, target met)} for the key indicators"""
+    return {
+        col: (float(record[col] - target), bool(record[col] >= target))
+        for col, target in TARGETS.items()
+    }
+
+
+def period_change(country_data, columns=CHANGE_COLUMNS):
+    """Change between a country's first and last year, or None with fewer than 2 years
+
+    `country_data` must be sorted by year, as Dataset.country_data() returns it.
+    """
+    if len(country_data) < 2:
+        return None
+    first = country_data.iloc[0]
+    last = country_data.iloc[-1]
+    return {
+        'first_year': int(first['Year']),
+        'last_year': int(last['Year']),
+        'changes': {col: float(last[col] - first[col]) for col in columns},
+    }
+
+
+def indicator_target(indicator):
+    """Target line drawn for an indicator (MI ratio: the 'good' bound), or None"""
+    if indicator == 'MI_Ratio':
+        return MI_GOOD
+    return TARGETS.get(indicator)
+
+
+def map_frames(dataset, indicator):
+    """(ISO-3 codes, Year x Country values rounded for display) of every country on the map"""
+    countries, codes = mapped(dataset.countries)
+    values = dataset.overlay(indicator, countries).round(MAP_DECIMALS.get(indicator, 1))
+    return codes, values
+
+
+def _mean(weighted):
+    # Population- or patient-weighted mean (see aggregates.WEIGHTS), or one vote per country
+    return 'wmean' if weighted else 'mean'
+
+
+def global_average(dataset, year, weighted=False):
+    """indicator -> mean across all countries for one year"""
+    return dataset.aggregates.global_stat(year, _mean(weighted))
+
+
+def region_average(dataset, region, year, weighted=False):
+    """indicator -> mean across the countries of one region for one year"""
+    stats = dataset.aggregates.get(year, 'region', _mean(weighted))
+    return stats.loc[region] if region in stats.index else pd.Series(index=INDICATOR_COLUMNS, dtype=float)
+
+
+def hdi_comparison(dataset, year, weighted=False):
+    """HDI category x indicator means for one year, rounded for display"""
+    return dataset.aggregates.get(year, 'hdi', _mean(weighted)).round(1)
+
+
+def region_comparison(dataset, year, weighted=False):
+    """Region x indicator means for one year, rounded for display"""
+    return dataset.aggregates.get(year, 'region', _mean(weighted)).round(1)
+
+
+def trend_stats(dataset, country, columns=CHANGE_COLUMNS):
+    """indicator -> fitted slope per year, R² and CAGR for one country, or None if unknown"""
+    trends = dataset.trends_for(country)
+    if trends is None:
+        return None
+    return {col: {'slope': float(trends.at[col, 'slope']), 'r2': float(trends.at[col, 'r2']),
+                  'cagr': float(trends.at[col, 'cagr'])} for col in columns}
+
+
+def trend_leaderboard(dataset, indicator, improving=True, n=10, region=None):
+    """Countries whose `indicator` improved (or worsened) fastest, by fitted slope"""
+    return dataset.trends.leaderboard(indicator, improving, n, region)
+
+
+def projection_outlook(dataset, country, columns=OUTLOOK_COLUMNS, year=None):
+    """indicator -> projected value, prediction interval and target for `year`, or None
+
+    `year` defaults to the last projected one: HORIZON, or the last year of
+    data if that is later. `on_track` is whether the projected value meets the target (for the MI
+    ratio: stays below the 'good' bound); None when the indicator has no
+    target or too little data to project.
+    """
+    projection = dataset.projection_for(country)
+    if projection is None:
+        return None
+    year = int(projection.index[-1]) if year is None else year
+    outlook = {}
+    for col in columns:
+        fit, lower, upper = (float(projection.at[year, (band, col)]) for band in ('fit', 'lower', 'upper'))
+        target = indicator_target(col)
+        on_track = None
+        if target is not None and not np.isnan(fit):
+            on_track = fit <= target if col == 'MI_Ratio' else fit >= target
+        outlook[col] = {'year': year, 'fit': fit, 'lower': lower, 'upper': upper, 'level': LEVEL,
+                        'target': target, 'on_track': on_track}
+    return outlook
+
+
+def find_peers(dataset, country, year, years_back=0, k=5):
+    """The `k` countries whose profile `years_back` years earlier was closest to `country`'s in `year`
+
+    Profiles are compared on peers.FEATURES and the HDI category. Returns a
+    Country-indexed frame, nearest first: distance, match year, region and
+    HDI category, then the change in each peer feature from the match year to
+    the peer's latest year - what happened to them next.
+    """
+    match_year = year - years_back
+    peers = dataset.peers.nearest(country, year, k, match_year).join(dataset.matrix.groups())
+    names = peers.index.tolist()
+    for col in PEER_FEATURES:
+        trajectory = dataset.overlay(col, names)
+        peers[col] = (trajectory.ffill().iloc[-1] - trajectory.loc[match_year]) if names else np.nan
+    return peers
+
+
+def peer_trajectories(dataset, country, peers, indicator, since):
+    """Year x Country values of `indicator` from `since` on, for `country` then its peers"""
+    trajectories = dataset.overlay(indicator, [country] + list(peers))
+    return trajectories.loc[since:]
+
+
+def recommendations(dataset, country, year):
+    """(concern rules, success rules) triggered by one record"""
+    rules = dataset.rules_for(country, year)
+    concerns = [rule for rule in rules if rule.kind == CONCERN]
+    successes = [rule for rule in rules if rule.kind != CONCERN]
+    return concerns, successes
+
+
+def _whole(value):
+    """int(value), or None when missing (e.g. the rank of a blank indicator)"""
+    return None if pd.isna(value) else int(value)
+
+
+def country_profile(dataset, country, year):
+    """Everything the dashboard shows for one country and year, as plain Python
+
+    Returns None when the dataset has no record for (country, year).
+    """
+    record = dataset.row(country, year)
+    if record is None:
+        return None
+
+    ranks = dataset.ranks_for(country, year)
+    concerns, successes = recommendations(dataset, country, year)
+    hdi = hdi_comparison(dataset, year)
+    return {
+        'country': country,
+        'year': int(year),
+        'region': str(record['Region']),
+        'hdi_category': str(record['HDI_Category']),
+        'indicators': {col: float(record[col]) for col in INDICATOR_COLUMNS},
+        'calculated': calculated_metrics(record),
+        'mi_status': mi_status(record['MI_Ratio']),
+        'targets': {col: {'target': TARGETS[col], 'gap': gap, 'met': met}
+                    for col, (gap, met) in target_gaps(record).items()},
+        'change': period_change(dataset.country_data(country)),
+        'trends': trend_stats(dataset, country, INDICATOR_COLUMNS),
+        'outlook': projection_outlook(dataset, country),
+        'ranks': {col: {'rank': _whole(row['rank']), 'field': _whole(row['field']),
+                        'percentile': float(row['percentile'])}
+                  for col, row in ranks.iterrows()},
+        'global_average': {col: float(v) for col, v in global_average(dataset, year).items()},
+        'global_weighted_average': {col: float(v)
+                                    for col, v in global_average(dataset, year, weighted=True).items()},
+        'region_average': {col: float(v)
+                           for col, v in region_average(dataset, str(record['Region']), year).items()},
+        'hdi_comparison': {group: {col: float(v) for col, v in values.items()}
+                           for group, values in hdi.iterrows()},
+        'concerns': [rule.code for rule in concerns],
+        'successes': [rule.code for rule in successes],
+    }
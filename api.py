@@ -0,0 +1,389 @@
+"""
+Local JSON API / API JSON Locale
+The dashboard's numbers over HTTP for other tools, cached per dataset version with ETags.
+
+Endpoints (GET, JSON):
+  /v1/meta                                         dataset version, countries and years
+  /v1/profile?country=Benin&year=2023              everything the dashboard shows (analytics.country_profile)
+  /v1/ranks?country=Benin&year=2023                rank, field size and percentile per indicator
+  /v1/hdi?year=2023[&weighted=1]                   HDI category x indicator means
+  /v1/recommendations?country=Benin&year=2023[&lang=fr]   triggered rules with their text
+  /v1/anomalies                                    the load-time validation report
+
+Every response carries an ETag built from the dataset version and the request,
+so a client repeating a request with If-None-Match gets an empty 304 before
+anything is computed or looked up. Other repeats are served as stored bytes
+from a cache that is dropped when the data changes. The dataset refreshes in
+place as the CSV changes, as in the dashboard.
+
+Usage: python api.py [--host 127.0.0.1] [--port 8502]
+       python api.py --bench [--seconds 3] [--clients 4]   # throughput against a local server
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+
+from analytics import _whole, country_profile, hdi_comparison, recommendations
+from bundle import CSV_PATH
+from refresh import LiveDataset
+from translations import TRANSLATIONS, t
+from validate import load_report
+
+# Bump when a response changes shape, so clients' ETags stop matching
+API_VERSION = 1
+PREFIX = '/v1/'
+
+# Stored responses kept across all endpoints
+CACHE_ENTRIES = 4096
+
+
+class ApiError(Exception):
+    """A request the API cannot answer: HTTP status and message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _jsonable(value):
+    """`value` with NumPy scalars as Python numbers and NaN as null"""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# Request parameters
+
+def _country(dataset, params):
+    country = params.get('country')
+    if country is None:
+        raise ApiError(400, "missing parameter: country")
+    if country not in dataset.countries:
+        raise ApiError(404, f"unknown country: {country}")
+    return country
+
+
+def _year(params):
+    try:
+        return int(params['year'])
+    except KeyError:
+        raise ApiError(400, "missing parameter: year") from None
+    except ValueError:
+        raise ApiError(400, f"invalid year: {params['year']}") from None
+
+
+def _flag(params, name):
+    value = params.get(name, '0').lower()
+    if value not in ('0', '1', 'true', 'false'):
+        raise ApiError(400, f"invalid {name}: {value} (use 0 or 1)")
+    return value in ('1', 'true')
+
+
+# Endpoints - each maps (dataset, query parameters) to a JSON-ready value
+
+def meta(dataset, params):
+    return {'version': dataset.version, 'rows': dataset.n_rows,
+            'countries': list(dataset.countries), 'years': list(dataset.years)}
+
+
+def profile(dataset, params):
+    country, year = _country(dataset, params), _year(params)
+    result = country_profile(dataset, country, year)
+    if result is None:
+        raise ApiError(404, f"no record for {country} in {year}")
+    return result
+
+
+def ranks(dataset, params):
+    country, year = _country(dataset, params), _year(params)
+    table = dataset.ranks_for(country, year)
+    if table is None:
+        raise ApiError(404, f"no record for {country} in {year}")
+    history = dataset.rank_history(country)
+    first = history.iloc[0]
+    return {
+        'country': country,
+        'year': year,
+        'first_year': int(history.index[0]),
+        'ranks': {col: {'rank': _whole(row['rank']), 'field': _whole(row['field']),
+                        'percentile': row['percentile'], 'change': _whole(first[col] - row['rank'])}
+                  for col, row in table.iterrows()},
+    }
+
+
+def hdi(dataset, params):
+    year, weighted = _year(params), _flag(params, 'weighted')
+    if year not in dataset.years:
+        raise ApiError(404, f"no data for {year}")
+    stats = hdi_comparison(dataset, year, weighted)
+    return {'year': year, 'weighted': weighted,
+            'groups': {group: values.to_dict() for group, values in stats.iterrows()}}
+
+
+def recommendation_list(dataset, params):
+    country, year = _country(dataset, params), _year(params)
+    lang = params.get('lang', 'en')
+    if lang not in TRANSLATIONS:
+        raise ApiError(400, f"unsupported lang: {lang} (use {', '.join(TRANSLATIONS)})")
+    record = dataset.row(country, year)
+    if record is None:
+        raise ApiError(404, f"no record for {country} in {year}")
+
+    def describe(rule):
+        text = {field: None if getattr(rule, field) is None else t(getattr(rule, field), lang)
+                for field in ('title', 'detail', 'action', 'action_detail')}
+        return {'code': rule.code, 'indicator': rule.column, 'op': rule.op, 'threshold': rule.threshold,
+                'value': record[rule.column], **text}
+
+    concerns, successes = recommendations(dataset, country, year)
+    return {'country': country, 'year': year, 'lang': lang,
+            'concerns': [describe(rule) for rule in concerns],
+            'successes': [describe(rule) for rule in successes]}
+
+
+def anomalies(dataset, params, csv_path=CSV_PATH):
+    report = load_report(csv_path)
+    if report is None or report['sha256'] != dataset.version:
+        raise ApiError(404, "no validation report for this dataset version")
+    return report
+
+
+ENDPOINTS = {
+    'meta': meta,
+    'profile': profile,
+    'ranks': ranks,
+    'hdi': hdi,
+    'recommendations': recommendation_list,
+    'anomalies': anomalies,
+}
+
+
+class ResponseCache:
+    """LRU of encoded response bodies for one dataset version
+
+    A lookup under another version empties it: the stored bodies all
+    describe data that is gone.
+    """
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key):
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return body
+
+    def put(self, version, key, body):
+        with self._lock:
+            if version != self.version or self.max_entries <= 0:
+                return
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class Api:
+    """Request handling independent of the HTTP server: (status, headers, body) per GET"""
+
+    def __init__(self, csv_path=CSV_PATH, cache_entries=CACHE_ENTRIES):
+        self.data = LiveDataset(csv_path)
+        self.cache = ResponseCache(cache_entries)
+        self.endpoints = {**ENDPOINTS, 'anomalies': partial(anomalies, csv_path=csv_path)}
+
+    def respond(self, target, if_none_match=None):
+        """(status, headers, body) for one GET; failures become JSON errors, never exceptions"""
+        try:
+            return self._respond(target, if_none_match)
+        except ApiError as exc:
+            return self._error(exc)
+        except Exception as exc:
+            traceback.print_exc()
+            return self._error(ApiError(500, f"internal error: {type(exc).__name__}"))
+
+    def _respond(self, target, if_none_match):
+        url = urlsplit(target)
+        name = url.path[len(PREFIX):] if url.path.startswith(PREFIX) else None
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            raise ApiError(404, f"unknown endpoint: {url.path} (try {PREFIX}meta)")
+
+        # The same data and request always give the same bytes, so the ETag
+        # is known before anything is computed. Only an exact tag matches:
+        # '*' would answer 304 for requests that should fail
+        params = dict(parse_qsl(url.query))
+        key = f"{name}?{urlencode(sorted(params.items()))}"
+        dataset = self.data.current()
+        etag = '"{}-{}-{}"'.format(API_VERSION, dataset.version[:16],
+                                   hashlib.sha1(key.encode('utf-8')).hexdigest()[:16])
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(',')):
+            return 304, headers, b''
+
+        body = self.cache.get(dataset.version, key)
+        if body is None:
+            value = endpoint(dataset, params)
+            body = json.dumps(_jsonable(value), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self.cache.put(dataset.version, key, body)
+        return 200, headers, body
+
+    @staticmethod
+    def _error(exc):
+        return exc.status, {}, json.dumps({'error': str(exc)}).encode('utf-8')
+
+
+class Handler(BaseHTTPRequestHandler):
+    """HTTP/1.1 front end of an Api (set as the server's `api` attribute)"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive: polling clients reuse one connection
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    quiet = False
+
+    def do_GET(self):
+        status, headers, body = self.server.api.respond(self.path, self.headers.get('If-None-Match'))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=8502, csv_path=CSV_PATH, quiet=False):
+    server = ThreadingHTTPServer((host, port), type('Handler', (Handler,), {'quiet': quiet}))
+    server.daemon_threads = True
+    server.api = Api(csv_path)
+    return server
+
+
+# Throughput benchmark
+
+def _client(port, targets, deadline, conditional, latencies):
+    """Request `targets` in turn over one keep-alive connection until `deadline`"""
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    etags = {}
+    i = 0
+    while time.perf_counter() < deadline:
+        target = targets[i % len(targets)]
+        i += 1
+        headers = {'If-None-Match': etags[target]} if conditional and target in etags else {}
+        start = time.perf_counter()
+        connection.request('GET', target, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status not in (200, 304):
+            raise RuntimeError(f"{target} answered {response.status}")
+        etags[target] = response.getheader('ETag')
+    connection.close()
+
+
+def bench(csv_path=CSV_PATH, seconds=3.0, clients=4):
+    """Requests per second and latency for uncached, cached and 304 responses"""
+    server = make_server(port=0, csv_path=csv_path, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    api = server.api
+    dataset = api.data.current()
+
+    # A polling tool's mix: profiles, ranks and recommendations of many countries
+    rng = np.random.default_rng(0)
+    targets = []
+    for country in rng.choice(list(dataset.countries), min(50, len(dataset.countries)), replace=False):
+        year = dataset.years[-1]
+        query = urlencode({'country': country, 'year': year})
+        targets += [f"{PREFIX}profile?{query}", f"{PREFIX}ranks?{query}", f"{PREFIX}recommendations?{query}"]
+    targets.append(f"{PREFIX}hdi?year={dataset.years[-1]}")
+
+    print(f"{len(targets)} distinct requests, {clients} keep-alive clients, {seconds:.0f} s per mode")
+    print(f"{'mode':<14} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode in ('uncached', 'cached', 'not_modified'):
+        api.cache.clear()
+        api.cache.max_entries = 0 if mode == 'uncached' else CACHE_ENTRIES
+        if mode != 'uncached':
+            for target in targets:
+                api.respond(target)
+        latencies = [[] for _ in range(clients)]
+        deadline = time.perf_counter() + seconds
+        threads = [threading.Thread(target=_client, args=(port, targets, deadline, mode == 'not_modified', lat))
+                   for lat in latencies]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        ms = np.concatenate([np.asarray(lat) for lat in latencies]) * 1000
+        print(f"{mode:<14} {len(ms):>9,} {len(ms) / elapsed:>9,.0f} "
+              f"{np.percentile(ms, 50):>8.2f} {np.percentile(ms, 95):>8.2f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the dashboard's numbers as JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--quiet', action='store_true', help="do not log requests")
+    parser.add_argument('--bench', action='store_true', help="measure throughput against a local server and exit")
+    parser.add_argument('--seconds', type=float, default=3.0, help="benchmark duration per mode")
+    parser.add_argument('--clients', type=int, default=4, help="concurrent benchmark clients")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.csv, args.seconds, args.clients)
+        sys.exit(0)
+    server = make_server(args.host, args.port, args.csv, args.quiet)
+    print(f"Serving {PREFIX}* on http://{args.host}:{server.server_address[1]} "
+          f"(data version {server.api.data.current().version[:12]})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
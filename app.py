@@ -3,12 +3,34 @@ Breast Cancer Global Statistics Dashboard (2003-2023) / Tableau de Bord (2003-20
 Bilingual Interactive Dashboard - English & French / Tableau de Bord Bilingue - Anglais & Français
 """
 
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
+import json
+import time
+
+import startup
+
+with startup.phase('imports'):
+    import streamlit as st
+    import pandas as pd
+    from functools import partial
+
+    from analytics import (
+        MI_GOOD, PEER_FEATURES, TARGETS, calculated_metrics, count_text, find_peers, global_average, hdi_comparison, indicator_target,
+        map_frames, mi_status, peer_trajectories, period_change, projection_outlook, recommendations, region_average, region_comparison,
+        target_gaps, trend_leaderboard, trend_stats
+    )
+    from bundle import CSV_PATH, INDICATOR_COLUMNS
+    from figures import (
+        OVERLAY_MAX_COUNTRIES, FigureCache, choropleth_figure, comparison_figure, gauges_figure,
+        hdi_figure, overlay_figure, region_figure, show_year, small_multiples_figure, trends_figure
+    )
+    from refresh import LiveDataset
+    from translations import INDICATOR_LABELS, t
+    from trends import LEADERBOARD_COLUMNS
+    from validate import load_report
+    import perf
+
+# Timing spans for this rerun (see perf.py)
+perf.start_run()
 
 # Page configuration
 st.set_page_config(
@@ -18,426 +40,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Translation dictionary / Dictionnaire de traductions
-TRANSLATIONS = {
-    'en': {
-        # Header
-        'main_title': 'Pink Board : 🎗️ Breast Cancer Global Statistics Dashboard',
-        'subtitle': 'Raising Awareness Through Data | October Breast Cancer Awareness Month',
-        
-        # Sidebar
-        'filters_title': '🔍 Filters & Settings',
-        'language': 'Language',
-        'select_country': 'Select Country',
-        'select_year': 'Select Year',
-        'show_comparison': 'Show Global Comparison',
-        'show_trends': 'Show Historical Trends',
-        'show_recommendations': 'Show Recommendations',
-        
-        # Main metrics
-        'statistics_title': 'Breast Cancer Statistics',
-        'incidence_rate': 'Incidence Rate (ASR)',
-        'mortality_rate': 'Mortality Rate (ASR)',
-        'new_cases': 'New Cases',
-        'deaths': 'Deaths',
-        'incidence_help': 'Age-Standardized Rate per 100,000 population',
-        'mortality_help': 'Age-Standardized Mortality Rate per 100,000',
-        'cases_help': 'Total new breast cancer cases diagnosed',
-        'deaths_help': 'Total deaths from breast cancer',
-        
-        # Key indicators
-        'key_indicators': '🔑 Key Health Indicators',
-        'screening_coverage': 'Screening Coverage',
-        'early_detection': 'Early Detection Rate',
-        'treatment_coverage': 'Treatment Coverage',
-        'survival_rate': '5-Year Survival Rate',
-        'vs_target': 'vs target',
-        
-        # MI Ratio
-        'mi_ratio': 'Mortality-to-Incidence (MI) Ratio',
-        'mi_help': 'Lower is better. Indicates healthcare system effectiveness',
-        'status': 'Status',
-        'target': 'Target',
-        'good': '🟢 Good',
-        'moderate': '🟡 Moderate',
-        'high': '🔴 High',
-        
-        # Descriptive stats
-        'desc_stats': '📈 Descriptive Statistics',
-        'country_profile': '👥 Country Profile',
-        'region': 'Region',
-        'hdi_category': 'HDI Category',
-        'population': 'Population',
-        'millions': 'millions',
-        'calculated_metrics': '🔢 Calculated Metrics',
-        'case_fatality': 'Case Fatality Rate',
-        'cases_per_million': 'Cases per Million',
-        'deaths_per_million': 'Deaths per Million',
-        
-        # Visual indicators
-        'visual_indicators': '📊 Visual Indicators',
-        'screening': 'Screening',
-        'detection': 'Detection',
-        'treatment': 'Treatment',
-        'survival': 'Survival',
-        
-        # Trends
-        'historical_trends': '📈 Historical Trends',
-        'incidence_mortality': 'Incidence & Mortality',
-        'year': 'Year',
-        'rate_per_100k': 'Rate per 100,000',
-        'coverage_pct': 'Coverage (%)',
-        'survival_pct': 'Survival Rate (%)',
-        'mi_ratio_pct': 'MI Ratio (%)',
-        'trend_title': 'Indicator Evolution',
-        'objective': 'Target',
-        'critical_threshold': 'Critical Threshold',
-        
-        # Changes
-        'survival_change': 'Survival Change',
-        'screening_change': 'Screening Change',
-        'incidence_change': 'Incidence Change',
-        'mi_change': 'MI Ratio Change',
-        'change_from': 'Change from',
-        'to': 'to',
-        
-        # Comparison
-        'global_comparison': '🌍 Global Comparison',
-        'key_metrics_vs_global': 'Key Metrics vs Global Average',
-        'global_average': 'Global Average',
-        'percentage': 'Percentage (%)',
-        'hdi_comparison': '📊 Comparison by HDI Category',
-        'health_metrics_hdi': 'Healthcare Metrics by HDI Category',
-        'country_ranking': 'Where does',
-        'rank': 'rank?',
-        'survival_rank': 'Survival Rate Rank',
-        'screening_rank': 'Screening Coverage Rank',
-        'survival_percentile': 'Survival Percentile',
-        
-        # Recommendations
-        'insights_recommendations': '💡 Key Insights & Recommendations',
-        'positive_aspects': '✅ Positive Aspects',
-        'areas_attention': '⚠️ Areas Requiring Attention',
-        'actionable_recommendations': '🎯 Actionable Recommendations',
-        'general_recommendations': 'General Recommendations for Improvement:',
-        
-        # Concerns
-        'low_screening': 'Low Screening Coverage',
-        'below_target': 'Significantly below the recommended 70% target',
-        'low_detection': 'Low Early Detection',
-        'advanced_stages': 'Majority of cases detected at advanced stages',
-        'low_survival': 'Low Survival Rate',
-        'below_average': 'Below global average, indicating treatment gaps',
-        'high_mi': 'High MI Ratio',
-        'late_detection': 'Indicates late detection and/or inadequate treatment',
-        'inadequate_treatment': 'Inadequate Treatment Coverage',
-        'not_receiving': 'Many diagnosed patients not receiving treatment',
-        
-        # Successes
-        'good_screening': 'Good Screening Coverage',
-        'meets_targets': 'Meets or exceeds recommended targets',
-        'strong_detection': 'Strong Early Detection',
-        'effective_programs': 'Effective early detection programs in place',
-        'high_survival': 'High Survival Rate',
-        'excellent_outcomes': 'Excellent treatment outcomes',
-        'low_mi': 'Low MI Ratio',
-        'effective_response': 'Effective healthcare system response',
-        
-        # Actions
-        'increase_screening': '📍 Increase Screening Programs',
-        'mobile_units': 'Implement mobile screening units in rural areas and provide free mammography services',
-        'enhance_detection': '📍 Enhance Early Detection',
-        'awareness_campaigns': 'Launch awareness campaigns about breast self-examination and clinical breast exams',
-        'improve_treatment': '📍 Improve Treatment Access',
-        'strengthen_infrastructure': 'Strengthen healthcare infrastructure and ensure availability of cancer drugs',
-        'reduce_mi': '📍 Reduce MI Ratio',
-        'focus_quality': 'Focus on both early detection and treatment quality improvements',
-        'expand_treatment': '📍 Expand Treatment Access',
-        'increase_centers': 'Increase oncology centers and train more healthcare professionals',
-        
-        # General recommendations
-        'rec_1': '1. Public Awareness: Conduct regular breast cancer awareness campaigns, especially during October',
-        'rec_2': '2. Education: Educate women about breast self-examination and early warning signs',
-        'rec_3': '3. Healthcare Infrastructure: Invest in diagnostic equipment and treatment facilities',
-        'rec_4': '4. Training: Train healthcare workers in breast cancer detection and treatment',
-        'rec_5': '5. Policy: Implement national breast cancer screening guidelines and programs',
-        'rec_6': '6. Support Groups: Establish patient support networks for emotional and practical assistance',
-        'rec_7': '7. Research: Support local research on breast cancer patterns and effective interventions',
-        'rec_8': '8. Affordability: Make screening and treatment financially accessible to all women',
-        
-        # Understanding data
-        'understanding_data': '📖 Understanding the Data',
-        'what_metrics_mean': '📊 What do these metrics mean?',
-        'how_interpret': '🔍 How to interpret these findings?',
-        
-        # Metric definitions
-        'def_incidence': 'Incidence Rate (ASR): Number of new breast cancer cases per 100,000 women, adjusted for age differences',
-        'def_mortality': 'Mortality Rate (ASR): Number of deaths from breast cancer per 100,000 women, adjusted for age differences',
-        'def_mi_ratio': 'MI Ratio: Mortality-to-Incidence ratio. Lower is better. High ratio suggests late detection or treatment gaps.',
-        'mi_excellent': '< 30%: Excellent healthcare response',
-        'mi_moderate': '30-50%: Moderate, room for improvement',
-        'mi_concerning': '> 50%: Concerning, indicates significant healthcare challenges',
-        'def_screening': 'Screening Coverage: Percentage of target population receiving regular breast cancer screening',
-        'def_detection': 'Early Detection Rate: Percentage of cases detected at early stages (Stage I-II)',
-        'def_treatment': 'Treatment Coverage: Percentage of diagnosed patients receiving appropriate treatment',
-        'def_survival': '5-Year Survival Rate: Percentage of patients alive 5 years after diagnosis',
-        
-        # Interpretation
-        'low_resource': 'For Low-Resource Settings:',
-        'low_resource_1': '- Focus on improving screening coverage as a priority',
-        'low_resource_2': '- Invest in early detection programs (most cost-effective)',
-        'low_resource_3': '- Ensure basic treatment availability before advanced therapies',
-        'medium_resource': 'For Medium-Resource Settings:',
-        'medium_resource_1': '- Maintain and expand screening programs',
-        'medium_resource_2': '- Focus on treatment quality and consistency',
-        'medium_resource_3': '- Reduce disparities between urban and rural areas',
-        'high_resource': 'For High-Resource Settings:',
-        'high_resource_1': '- Optimize screening protocols (avoid over-screening)',
-        'high_resource_2': '- Focus on personalized medicine and advanced treatments',
-        'high_resource_3': '- Address health equity gaps',
-        'red_flags': 'Red Flags:',
-        'red_flag_1': '- MI Ratio > 50%: Urgent need for healthcare system improvements',
-        'red_flag_2': '- Screening < 30%: Critical shortage of screening services',
-        'red_flag_3': '- Survival < 40%: Systemic healthcare challenges',
-        
-        # Footer
-        'footer_awareness': '🎗️ Breast Cancer Awareness Month - October 2025',
-        'footer_detection': 'Early detection saves lives. Regular screening is crucial.',
-        'footer_source': 'Data Source: Global Breast Cancer Statistics (2003-2023)',
-        'footer_source1': '[NB: Some of the data were generated for analysis purposes.]',
-        'footer_purpose': 'Created for awareness and education purposes | GitHub Repository',
-        'footer_author': 'Author : Consolas HODONOU | Data Scientist| E-mail : nevinashodonou@gmail.com',
-        
-        # Sidebar info
-        'about_dashboard': 'About This Dashboard',
-        'about_text': 'This interactive dashboard provides comprehensive breast cancer statistics from 2003-2023 for 90 countries worldwide.',
-        'how_use': 'How to Use:',
-        'how_use_1': '1. Select a country from the dropdown',
-        'how_use_2': '2. Choose a year to analyze',
-        'how_use_3': '3. Toggle comparison and trend views',
-        'how_use_4': '4. Review recommendations',
-        'purpose': 'Purpose:',
-        'purpose_text': 'Raise awareness about breast cancer and help inform evidence-based interventions.',
-        'october_awareness': 'October is Breast Cancer Awareness Month 🎗️',
-        'early_detection': '💪 Early detection saves lives!',
-        
-        # Error
-        'no_data': 'No data available for',
-        'in': 'in',
-    },
-    
-    'fr': {
-        # Header
-        'main_title': 'Pink Board : 🎗️ Tableau de Bord des Statistiques Mondiales sur le Cancer du Sein',
-        'subtitle': 'Sensibilisation par les Données | Octobre - Mois de Sensibilisation au Cancer du Sein',
-        
-        # Sidebar
-        'filters_title': '🔍 Filtres & Paramètres',
-        'language': 'Langue',
-        'select_country': 'Sélectionner un Pays',
-        'select_year': 'Sélectionner une Année',
-        'show_comparison': 'Afficher la Comparaison Mondiale',
-        'show_trends': 'Afficher les Tendances Historiques',
-        'show_recommendations': 'Afficher les Recommandations',
-        
-        # Main metrics
-        'statistics_title': 'Statistiques du Cancer du Sein',
-        'incidence_rate': 'Taux d\'Incidence (TSA)',
-        'mortality_rate': 'Taux de Mortalité (TSA)',
-        'new_cases': 'Nouveaux Cas',
-        'deaths': 'Décès',
-        'incidence_help': 'Taux Standardisé par Âge pour 100 000 habitants',
-        'mortality_help': 'Taux de Mortalité Standardisé par Âge pour 100 000 habitants',
-        'cases_help': 'Total des nouveaux cas de cancer du sein diagnostiqués',
-        'deaths_help': 'Total des décès dus au cancer du sein',
-        
-        # Key indicators
-        'key_indicators': '🔑 Indicateurs Clés de Santé',
-        'screening_coverage': 'Couverture du Dépistage',
-        'early_detection': 'Taux de Détection Précoce',
-        'treatment_coverage': 'Couverture du Traitement',
-        'survival_rate': 'Taux de Survie à 5 Ans',
-        'vs_target': 'vs objectif',
-        
-        # MI Ratio
-        'mi_ratio': 'Ratio Mortalité-Incidence (MI)',
-        'mi_help': 'Plus bas est meilleur. Indique l\'efficacité du système de santé',
-        'status': 'Statut',
-        'target': 'Objectif',
-        'good': '🟢 Bon',
-        'moderate': '🟡 Modéré',
-        'high': '🔴 Élevé',
-        
-        # Descriptive stats
-        'desc_stats': '📈 Statistiques Descriptives',
-        'country_profile': '👥 Profil du Pays',
-        'region': 'Région',
-        'hdi_category': 'Catégorie IDH',
-        'population': 'Population',
-        'millions': 'millions',
-        'calculated_metrics': '🔢 Métriques Calculées',
-        'case_fatality': 'Taux de Létalité',
-        'cases_per_million': 'Cas par Million',
-        'deaths_per_million': 'Décès par Million',
-        
-        # Visual indicators
-        'visual_indicators': '📊 Indicateurs Visuels',
-        'screening': 'Dépistage',
-        'detection': 'Détection',
-        'treatment': 'Traitement',
-        'survival': 'Survie',
-        
-        # Trends
-        'historical_trends': '📈 Tendances Historiques',
-        'incidence_mortality': 'Incidence & Mortalité',
-        'year': 'Année',
-        'rate_per_100k': 'Taux pour 100 000',
-        'coverage_pct': 'Couverture (%)',
-        'survival_pct': 'Taux de Survie (%)',
-        'mi_ratio_pct': 'Ratio MI (%)',
-        'trend_title': 'Évolution des Indicateurs',
-        'objective': 'Objectif',
-        'critical_threshold': 'Seuil Critique',
-        
-        # Changes
-        'survival_change': 'Changement de Survie',
-        'screening_change': 'Changement de Dépistage',
-        'incidence_change': 'Changement d\'Incidence',
-        'mi_change': 'Changement du Ratio MI',
-        'change_from': 'Changement de',
-        'to': 'à',
-        
-        # Comparison
-        'global_comparison': '🌍 Comparaison Mondiale',
-        'key_metrics_vs_global': 'Indicateurs Clés vs Moyenne Mondiale',
-        'global_average': 'Moyenne Mondiale',
-        'percentage': 'Pourcentage (%)',
-        'hdi_comparison': '📊 Comparaison par Catégorie de l\'IDH',
-        'health_metrics_hdi': 'Indicateurs de Santé par Catégorie IDH',
-        'country_ranking': 'Où se classe',
-        'rank': '?',
-        'survival_rank': 'Classement Taux de Survie',
-        'screening_rank': 'Classement Couverture Dépistage',
-        'survival_percentile': 'Percentile de Survie',
-        
-        # Recommendations
-        'insights_recommendations': '💡 Principales Observations & Recommandations',
-        'positive_aspects': '✅ Aspects Positifs',
-        'areas_attention': '⚠️ Domaines Nécessitant une Attention',
-        'actionable_recommendations': '🎯 Recommandations Concrètes',
-        'general_recommendations': 'Recommandations Générales pour l\'Amélioration :',
-        
-        # Concerns
-        'low_screening': 'Faible Couverture du Dépistage',
-        'below_target': 'Significativement en dessous de l\'objectif recommandé de 70%',
-        'low_detection': 'Faible Détection Précoce',
-        'advanced_stages': 'La majorité des cas détectés à des stades avancés',
-        'low_survival': 'Faible Taux de Survie',
-        'below_average': 'En dessous de la moyenne mondiale, indiquant des lacunes dans le traitement',
-        'high_mi': 'Ratio MI Élevé',
-        'late_detection': 'Indique une détection tardive et/ou un traitement inadéquat',
-        'inadequate_treatment': 'Couverture de Traitement Inadéquate',
-        'not_receiving': 'De nombreux patients diagnostiqués ne reçoivent pas de traitement',
-        
-        # Successes
-        'good_screening': 'Bonne Couverture du Dépistage',
-        'meets_targets': 'Atteint ou dépasse les objectifs recommandés',
-        'strong_detection': 'Détection Précoce Efficace',
-        'effective_programs': 'Programmes de détection précoce performants en place',
-        'high_survival': 'Taux de Survie Élevé',
-        'excellent_outcomes': 'Excellents résultats de traitement',
-        'low_mi': 'Ratio MI Faible',
-        'effective_response': 'Réponse efficace du système de santé',
-        
-        # Actions
-        'increase_screening': '📍 Augmenter les Programmes de Dépistage',
-        'mobile_units': 'Mettre en place des unités mobiles de dépistage dans les zones rurales et offrir des mammographies gratuites',
-        'enhance_detection': '📍 Améliorer la Détection Précoce',
-        'awareness_campaigns': 'Lancer des campagnes de sensibilisation sur l\'autopalpation mammaire et les examens cliniques',
-        'improve_treatment': '📍 Améliorer l\'Accès aux Traitements',
-        'strengthen_infrastructure': 'Renforcer les infrastructures de santé et assurer la disponibilité des médicaments anticancéreux',
-        'reduce_mi': '📍 Réduire le Ratio MI',
-        'focus_quality': 'Se concentrer sur l\'amélioration de la détection précoce et de la qualité des traitements',
-        'expand_treatment': '📍 Élargir l\'Accès aux Traitements',
-        'increase_centers': 'Augmenter les centres d\'oncologie et former davantage de professionnels de santé',
-        
-        # General recommendations
-        'rec_1': '1. Sensibilisation Publique : Mener régulièrement des campagnes de sensibilisation au cancer du sein, en particulier en octobre',
-        'rec_2': '2. Éducation : Éduquer les femmes sur l\'autopalpation mammaire et les signes d\'alerte précoces',
-        'rec_3': '3. Infrastructure de Santé : Investir dans les équipements de diagnostic et les installations de traitement',
-        'rec_4': '4. Formation : Former les professionnels de santé à la détection et au traitement du cancer du sein',
-        'rec_5': '5. Politique : Mettre en œuvre des directives et programmes nationaux de dépistage du cancer du sein',
-        'rec_6': '6. Groupes de Soutien : Établir des réseaux de soutien aux patients pour l\'assistance émotionnelle et pratique',
-        'rec_7': '7. Recherche : Soutenir la recherche locale sur les tendances du cancer du sein et les interventions efficaces',
-        'rec_8': '8. Accessibilité Financière : Rendre le dépistage et le traitement financièrement accessibles à toutes les femmes',
-        
-        # Understanding data
-        'understanding_data': '📖 Comprendre les Données',
-        'what_metrics_mean': '📊 Que signifient ces indicateurs ?',
-        'how_interpret': '🔍 Comment interpréter ces résultats ?',
-        
-        # Metric definitions
-        'def_incidence': 'Taux d\'Incidence (TSA) : Nombre de nouveaux cas de cancer du sein pour 100 000 femmes, ajusté pour les différences d\'âge',
-        'def_mortality': 'Taux de Mortalité (TSA) : Nombre de décès dus au cancer du sein pour 100 000 femmes, ajusté pour les différences d\'âge',
-        'def_mi_ratio': 'Ratio MI : Ratio Mortalité-Incidence. Plus bas est meilleur. Un ratio élevé suggère une détection tardive ou des lacunes dans le traitement.',
-        'mi_excellent': '< 30% : Excellente réponse du système de santé',
-        'mi_moderate': '30-50% : Modéré, possibilité d\'amélioration',
-        'mi_concerning': '> 50% : Préoccupant, indique des défis importants dans le système de santé',
-        'def_screening': 'Couverture du Dépistage : Pourcentage de la population cible recevant un dépistage régulier du cancer du sein',
-        'def_detection': 'Taux de Détection Précoce : Pourcentage de cas détectés aux stades précoces (Stade I-II)',
-        'def_treatment': 'Couverture du Traitement : Pourcentage de patients diagnostiqués recevant un traitement approprié',
-        'def_survival': 'Taux de Survie à 5 Ans : Pourcentage de patients vivants 5 ans après le diagnostic',
-        
-        # Interpretation
-        'low_resource': 'Pour les Contextes à Faibles Ressources :',
-        'low_resource_1': '- Se concentrer sur l\'amélioration de la couverture du dépistage comme priorité',
-        'low_resource_2': '- Investir dans les programmes de détection précoce (le plus rentable)',
-        'low_resource_3': '- Assurer la disponibilité des traitements de base avant les thérapies avancées',
-        'medium_resource': 'Pour les Contextes à Ressources Moyennes :',
-        'medium_resource_1': '- Maintenir et élargir les programmes de dépistage',
-        'medium_resource_2': '- Se concentrer sur la qualité et la cohérence des traitements',
-        'medium_resource_3': '- Réduire les disparités entre zones urbaines et rurales',
-        'high_resource': 'Pour les Contextes à Ressources Élevées :',
-        'high_resource_1': '- Optimiser les protocoles de dépistage (éviter le sur-dépistage)',
-        'high_resource_2': '- Se concentrer sur la médecine personnalisée et les traitements avancés',
-        'high_resource_3': '- Aborder les écarts d\'équité en santé',
-        'red_flags': 'Signaux d\'Alarme :',
-        'red_flag_1': '- Ratio MI > 50% : Besoin urgent d\'amélioration du système de santé',
-        'red_flag_2': '- Dépistage < 30% : Pénurie critique des services de dépistage',
-        'red_flag_3': '- Survie < 40% : Défis systémiques dans le système de santé',
-        
-        # Footer
-        'footer_awareness': '🎗️ Mois de Sensibilisation au Cancer du Sein - Octobre 2025',
-        'footer_detection': 'La détection précoce sauve des vies. Le dépistage régulier est crucial.',
-        'footer_source': 'Source des Données : Statistiques Mondiales du Cancer du Sein (2003-2023)', 
-        'footer_source1': '[NB: Une partie des données a été générée dans un but analytique.]',
-        'footer_purpose': 'Créé à des fins de sensibilisation et d\'éducation | Dépôt GitHub',
-        'footer_author': 'Auteure : Consolas HODONOU | Data Scientist| E-mail : nevinashodonou@gmail.com',
-        
-        # Sidebar info
-        'about_dashboard': 'À Propos de ce Tableau de Bord',
-        'about_text': 'Ce tableau de bord interactif fournit des statistiques complètes sur le cancer du sein de 2003 à 2023 pour 90 pays dans le monde.',
-        'how_use': 'Comment Utiliser :',
-        'how_use_1': '1. Sélectionnez un pays dans la liste déroulante',
-        'how_use_2': '2. Choisissez une année à analyser',
-        'how_use_3': '3. Activez/désactivez les vues de comparaison et de tendances',
-        'how_use_4': '4. Consultez les recommandations',
-        'purpose': 'Objectif :',
-        'purpose_text': 'Sensibiliser au cancer du sein et contribuer à éclairer les interventions fondées sur des preuves.',
-        'october_awareness': 'Octobre est le Mois de Sensibilisation au Cancer du Sein 🎗️',
-        'early_detection': '💪 La détection précoce sauve des vies !',
-        
-        # Error
-        'no_data': 'Aucune donnée disponible pour',
-        'in': 'en',
-    }
-}
-
-# Helper function to get translated text
-def t(key, lang='en'):
-    """Get translated text for given key and language"""
-    return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, key)
-
 # Custom CSS
 st.markdown("""
 <style> 
@@ -484,13 +86,33 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
-@st.cache_data
+# Load data - one read-only dataset per process, shared by every session.
+# When the CSV changes, the next rerun folds in just the changed rows and
+# drops only the cached charts they affect (see refresh.py)
+@st.cache_resource(max_entries=1)
 def load_data():
-    df = pd.read_csv("breast_cancer_global_data_2003_2023.csv")
-    return df
+    perf.cache_miss()
+    return LiveDataset(CSV_PATH, FigureCache())
+
+with startup.phase('data_load'), perf.span('data_load', cache='hit'):
+    live_data = load_data()
+    dataset = live_data.current()
+render_start = time.perf_counter()
+
+# Figure cache - serialized chart specs shared by every session
+figure_cache = live_data.figure_cache
+
 
-df = load_data()
+def show_chart(key, build, update=None):
+    """Cached figure for `key`, sent to the browser under a timing span
+
+    `update` may adjust the session's copy of the cached figure first.
+    """
+    fig = figure_cache.figure(key, build)
+    if update is not None:
+        update(fig)
+    with perf.span(f'plotly_chart:{key[0]}'):
+        st.plotly_chart(fig, use_container_width=True)
 
 # Sidebar - Language Selection (at the top)
 st.sidebar.image("rose1.jpeg", width=175)
@@ -506,33 +128,43 @@ lang = st.sidebar.selectbox(
 st.sidebar.title(t('filters_title', lang))
 
 # Country and year selection
-countries = sorted(df['Country'].unique())
+countries = list(dataset.countries)
 default_country = 'Benin' if 'Benin' in countries else countries[0]
 selected_country = st.sidebar.selectbox(t('select_country', lang), countries, index=countries.index(default_country))
 
-years = sorted(df['Year'].unique())
+years = list(dataset.years)
 selected_year = st.sidebar.selectbox(t('select_year', lang), years, index=len(years)-1)
 
-# Filter data
-country_data = df[df['Country'] == selected_country].sort_values('Year')
-year_data = df[df['Year'] == selected_year]
-selected_data = df[(df['Country'] == selected_country) & (df['Year'] == selected_year)]
+# Data integrity - the anomaly report written when the bundle was compiled
+@st.cache_data(max_entries=1, show_spinner=False)
+def anomaly_report(version):
+    report = load_report(CSV_PATH)
+    return report if report is not None and report['sha256'] == version else None
 
-# Additional filters
-st.sidebar.markdown("---")
-show_comparison = st.sidebar.checkbox(t('show_comparison', lang), value=True)
-show_trends = st.sidebar.checkbox(t('show_trends', lang), value=True)
-show_recommendations = st.sidebar.checkbox(t('show_recommendations', lang), value=True)
+report = anomaly_report(dataset.version)
+if report is not None and report['anomalies']:
+    with st.sidebar.expander(f"⚠️ {report['anomalies']:,} {t('data_anomalies', lang)}"):
+        for check, result in report['checks'].items():
+            if result['count']:
+                st.write(f"**{t('check_' + check, lang)}:** {result['count']:,}")
+        st.caption(t('anomalies_note', lang))
+        st.download_button(t('anomaly_report', lang), json.dumps(report, indent=2), file_name='validation.json',
+                           mime='application/json', key='anomaly_report')
+
+# Selected record (precomputed country/year index)
+with perf.span('filter:row'):
+    data = dataset.row(selected_country, selected_year)
 
 # Header
 st.markdown(f'<h1 class="main-header">{t("main_title", lang)}</h1>', unsafe_allow_html=True)
 st.markdown(f'<p class="sub-header">{t("subtitle", lang)}</p>', unsafe_allow_html=True)
 
-# Main content
-if len(selected_data) > 0:
-    data = selected_data.iloc[0]
-    
-    # Overview Section
+# Dashboard sections - each is a fragment, so a widget inside one (e.g. its
+# show/hide toggle) reruns only that section; hidden sections stop right away
+@st.fragment
+@perf.section('overview')
+def overview_section(data, selected_country, selected_year, lang):
+    """Headline statistics, key indicators, MI ratio and country profile"""
     st.header(f"📊 {selected_country} - {t('statistics_title', lang)} ({selected_year})")
     
     col1, col2, col3, col4 = st.columns(4)
@@ -554,14 +186,14 @@ if len(selected_data) > 0:
     with col3:
         st.metric(
             t('new_cases', lang),
-            f"{int(data['New_Cases']):,}",
+            count_text(data['New_Cases']),
             help=t('cases_help', lang)
         )
     
     with col4:
         st.metric(
             t('deaths', lang),
-            f"{int(data['Deaths']):,}",
+            count_text(data['Deaths']),
             help=t('deaths_help', lang)
         )
     
@@ -570,55 +202,27 @@ if len(selected_data) > 0:
     # Key Indicators
     st.subheader(t('key_indicators', lang))
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        screening_color = "normal" if data['Screening_Coverage_%'] >= 70 else "inverse"
-        st.metric(
-            t('screening_coverage', lang),
-            f"{data['Screening_Coverage_%']:.1f}%",
-            delta=f"{data['Screening_Coverage_%'] - 70:.1f}% {t('vs_target', lang)} (70%)",
-            delta_color=screening_color
-        )
-    
-    with col2:
-        detection_color = "normal" if data['Early_Detection_Rate_%'] >= 60 else "inverse"
-        st.metric(
-            t('early_detection', lang),
-            f"{data['Early_Detection_Rate_%']:.1f}%",
-            delta=f"{data['Early_Detection_Rate_%'] - 60:.1f}% {t('vs_target', lang)} (60%)",
-            delta_color=detection_color
-        )
-    
-    with col3:
-        treatment_color = "normal" if data['Treatment_Coverage_%'] >= 90 else "inverse"
-        st.metric(
-            t('treatment_coverage', lang),
-            f"{data['Treatment_Coverage_%']:.1f}%",
-            delta=f"{data['Treatment_Coverage_%'] - 90:.1f}% {t('vs_target', lang)} (90%)",
-            delta_color=treatment_color
-        )
-    
-    with col4:
-        survival_color = "normal" if data['Five_Year_Survival_%'] >= 70 else "inverse"
-        st.metric(
-            t('survival_rate', lang),
-            f"{data['Five_Year_Survival_%']:.1f}%",
-            delta=f"{data['Five_Year_Survival_%'] - 70:.1f}% {t('vs_target', lang)} (70%)",
-            delta_color=survival_color
-        )
+    gaps = target_gaps(data)
+    for col, (column, target) in zip(st.columns(4), TARGETS.items()):
+        gap, met = gaps[column]
+        with col:
+            st.metric(
+                t(INDICATOR_LABELS[column], lang),
+                f"{data[column]:.1f}%",
+                delta=f"{gap:.1f}% {t('vs_target', lang)} ({target}%)",
+                delta_color="normal" if met else "inverse"
+            )
     
     # MI Ratio
     st.markdown("---")
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        mi_status = t('good', lang) if data['MI_Ratio'] < 30 else t('moderate', lang) if data['MI_Ratio'] < 50 else t('high', lang)
         st.metric(
             t('mi_ratio', lang),
             f"{data['MI_Ratio']:.1f}%",
             help=t('mi_help', lang)
         )
-        st.caption(f"{t('status', lang)}: {mi_status} | {t('target', lang)}: < 30%")
+        st.caption(f"{t('status', lang)}: {t(mi_status(data['MI_Ratio']), lang)} | {t('target', lang)}: < {MI_GOOD}%")
     
     # Descriptive Statistics
     st.markdown("---")
@@ -634,371 +238,477 @@ if len(selected_data) > 0:
     
     with col2:
         st.markdown(f"**{t('calculated_metrics', lang)}**")
-        case_fatality = (data['Deaths'] / data['New_Cases'] * 100) if data['New_Cases'] > 0 else 0
-        cases_per_million = (data['New_Cases'] / data['Population_Millions'])
-        deaths_per_million = (data['Deaths'] / data['Population_Millions'])
+        metrics = calculated_metrics(data)
         
-        st.write(f"**{t('case_fatality', lang)}:** {case_fatality:.1f}%")
-        st.write(f"**{t('cases_per_million', lang)}:** {cases_per_million:.1f}")
-        st.write(f"**{t('deaths_per_million', lang)}:** {deaths_per_million:.1f}")
-    
-    # Visual Indicators (Gauges)
+        st.write(f"**{t('case_fatality', lang)}:** {metrics['case_fatality']:.1f}%")
+        st.write(f"**{t('cases_per_million', lang)}:** {metrics['cases_per_million']:.1f}")
+        st.write(f"**{t('deaths_per_million', lang)}:** {metrics['deaths_per_million']:.1f}")
+
+
+@st.fragment
+@perf.section('gauges')
+def gauges_section(data, selected_country, selected_year, lang):
+    """Visual indicator gauges"""
+    label = partial(t, lang=lang)
     st.markdown("---")
     st.subheader(t('visual_indicators', lang))
     
-    fig = make_subplots(
-        rows=1, cols=4,
-        subplot_titles=(t('screening', lang), t('detection', lang), t('treatment', lang), t('survival', lang)),
-        specs=[[{'type': 'indicator'}, {'type': 'indicator'}, 
-               {'type': 'indicator'}, {'type': 'indicator'}]]
+    show_chart(('gauges', selected_country, selected_year, lang), lambda: gauges_figure(data, label))
+
+
+@st.fragment
+@perf.section('map')
+def map_section(selected_year, lang):
+    """World map of one indicator, animated over the years in the browser"""
+    label = partial(t, lang=lang)
+    st.markdown("---")
+    if not st.toggle(t('show_map', lang), value=True, key='show_map'):
+        return
+    st.subheader(t('world_map', lang))
+    
+    indicator = st.selectbox(
+        t('map_indicator', lang), INDICATOR_COLUMNS,
+        index=INDICATOR_COLUMNS.index('Five_Year_Survival_%'),
+        format_func=lambda col: t(INDICATOR_LABELS[col], lang), key='map_indicator'
     )
     
-    # Screening
-    fig.add_trace(go.Indicator(
-        mode="gauge+number",
-        value=data['Screening_Coverage_%'],
-        domain={'x': [0, 1], 'y': [0, 1]},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "#4169E1"},
-            'steps': [
-                {'range': [0, 70], 'color': "lightgray"},
-                {'range': [70, 100], 'color': "lightgreen"}
-            ],
-            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 70}
-        }
-    ), row=1, col=1)
+    # Every year's frame is built once per indicator and shipped together
+    def build():
+        with perf.span('filter:map_frames'):
+            codes, values = map_frames(dataset, indicator)
+        return choropleth_figure(values, codes, indicator, label)
     
-    # Detection
-    fig.add_trace(go.Indicator(
-        mode="gauge+number",
-        value=data['Early_Detection_Rate_%'],
-        domain={'x': [0, 1], 'y': [0, 1]},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "#32CD32"},
-            'steps': [
-                {'range': [0, 60], 'color': "lightgray"},
-                {'range': [60, 100], 'color': "lightgreen"}
-            ],
-            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 60}
-        }
-    ), row=1, col=2)
+    show_chart(('choropleth', None, None, lang, indicator), build,
+               update=lambda fig: show_year(fig, selected_year))
+    st.caption(t('map_note', lang))
+
+
+@st.fragment
+@perf.section('trends')
+def trends_section(selected_country, lang):
+    """Historical trends with projections to 2030, changes and fitted slopes"""
+    with perf.span('filter:country_data'):
+        country_data = dataset.country_data(selected_country)
+    if len(country_data) <= 1:
+        return
+    label = partial(t, lang=lang)
+    st.markdown("---")
+    if not st.toggle(t('show_trends', lang), value=True, key='show_trends'):
+        return
+    st.subheader(f"{t('historical_trends', lang)} - {selected_country} (2003-2023)")
     
-    # Treatment
-    fig.add_trace(go.Indicator(
-        mode="gauge+number",
-        value=data['Treatment_Coverage_%'],
-        domain={'x': [0, 1], 'y': [0, 1]},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "#FF8C00"},
-            'steps': [
-                {'range': [0, 90], 'color': "lightgray"},
-                {'range': [90, 100], 'color': "lightgreen"}
-            ],
-            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 90}
-        }
-    ), row=1, col=3)
+    # Projections are fitted for every country at load; drawing them is a lookup
+    projected = st.toggle(t('show_projection', lang), value=True, key='show_projection')
+    with perf.span('filter:projection'):
+        projection = dataset.projection_for(selected_country) if projected else None
+    show_chart(('trends', selected_country, None, lang, projected),
+               lambda: trends_figure(country_data, selected_country, label, projection))
     
-    # Survival
-    fig.add_trace(go.Indicator(
-        mode="gauge+number",
-        value=data['Five_Year_Survival_%'],
-        domain={'x': [0, 1], 'y': [0, 1]},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "#FF1493"},
-            'steps': [
-                {'range': [0, 70], 'color': "lightgray"},
-                {'range': [70, 100], 'color': "lightgreen"}
-            ],
-            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 70}
-        }
-    ), row=1, col=4)
+    # Changes, with the least-squares slope fitted over every year underneath
+    change = period_change(country_data)
+    with perf.span('filter:trend_stats'):
+        fits = trend_stats(dataset, selected_country)
+    if change is not None:
+        period = f"{t('change_from', lang)} {change['first_year']} {t('to', lang)} {change['last_year']}"
+        change_metrics = [
+            ('Five_Year_Survival_%', 'survival_change', '%'),
+            ('Screening_Coverage_%', 'screening_change', '%'),
+            ('Incidence_Rate_ASR', 'incidence_change', ''),
+            ('MI_Ratio', 'mi_change', '%'),
+        ]
+        for col, (column, label_key, unit) in zip(st.columns(4), change_metrics):
+            with col:
+                fit = fits[column]
+                st.metric(t(label_key, lang), f"{change['changes'][column]:+.1f}{unit}", help=period,
+                          delta=f"{fit['slope']:+.2f}{unit}/{t('per_year', lang)} · R² {fit['r2']:.2f}",
+                          delta_color="off")
     
-    fig.update_layout(height=300, showlegend=False)
-    st.plotly_chart(fig, use_container_width=True)
+    # Where the trends lead by 2030
+    if projected:
+        outlook = projection_outlook(dataset, selected_country)
+        horizon = next(iter(outlook.values()))['year']
+        st.markdown(f"**{t('projection_title', lang)} {horizon}**")
+        outlook_metrics = [
+            ('Five_Year_Survival_%', 'survival_rate'),
+            ('Screening_Coverage_%', 'screening_coverage'),
+            ('MI_Ratio', 'mi_ratio'),
+        ]
+        for col, (column, label_key) in zip(st.columns(3), outlook_metrics):
+            projected_value = outlook[column]
+            if projected_value['on_track'] is None:
+                continue
+            with col:
+                st.metric(
+                    f"{t(label_key, lang)} ({projected_value['year']})", f"{projected_value['fit']:.1f}%",
+                    delta=(f"{projected_value['fit'] - projected_value['target']:+.1f}% "
+                           f"{t('vs_target', lang)} ({projected_value['target']}%)"),
+                    delta_color="inverse" if column == 'MI_Ratio' else "normal",
+                    help=(f"{t('prediction_interval', lang)}: {projected_value['lower']:.1f}% - "
+                          f"{projected_value['upper']:.1f}%")
+                )
+        st.caption(t('projection_note', lang))
+
+
+def _add_region(region_countries):
+    """Button callback: extend the overlay selection with a whole region"""
+    chosen = st.session_state.get('overlay_countries', [])
+    st.session_state['overlay_countries'] = chosen + [c for c in region_countries if c not in chosen]
+
+
+@st.fragment
+@perf.section('overlay')
+def overlay_section(data, selected_country, selected_year, lang):
+    """Several countries' trends on one chart, or one small panel each"""
+    label = partial(t, lang=lang)
+    st.markdown("---")
+    if not st.toggle(t('show_overlay', lang), value=False, key='show_overlay'):
+        return
+    st.subheader(t('overlay_title', lang))
     
-    # Historical Trends
-    if show_trends and len(country_data) > 1:
-        st.markdown("---")
-        st.subheader(f"{t('historical_trends', lang)} - {selected_country} (2003-2023)")
-        
-        fig_trends = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=(t('incidence_mortality', lang), t('screening_coverage', lang), 
-                          t('survival_rate', lang), t('mi_ratio', lang)),
-            vertical_spacing=0.2,
-            horizontal_spacing=0.1
+    st.session_state.setdefault('overlay_countries', [selected_country])
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        chosen = st.multiselect(t('overlay_countries', lang), countries, key='overlay_countries')
+    with col2:
+        indicator = st.selectbox(
+            t('overlay_indicator', lang), INDICATOR_COLUMNS,
+            index=INDICATOR_COLUMNS.index('Five_Year_Survival_%'),
+            format_func=lambda col: t(INDICATOR_LABELS[col], lang), key='overlay_indicator'
         )
-        
-        # Incidence & Mortality
-        fig_trends.add_trace(go.Scatter(
-            x=country_data['Year'], y=country_data['Incidence_Rate_ASR'],
-            name=t('incidence_rate', lang), line=dict(color='#FF1493', width=2),
-            mode='lines+markers'
-        ), row=1, col=1)
-        
-        fig_trends.add_trace(go.Scatter(
-            x=country_data['Year'], y=country_data['Mortality_Rate_ASR'],
-            name=t('mortality_rate', lang), line=dict(color='#DC143C', width=2),
-            mode='lines+markers'
-        ), row=1, col=1)
-        
-        # Screening
-        fig_trends.add_trace(go.Scatter(
-            x=country_data['Year'], y=country_data['Screening_Coverage_%'],
-            name=t('screening', lang), line=dict(color='#4169E1', width=3),
-            fill='tozeroy', mode='lines+markers'
-        ), row=1, col=2)
-        fig_trends.add_hline(y=70, line_dash="dash", line_color="green", 
-                            annotation_text=t('objective', lang), row=1, col=2)
-        
-        # Survival
-        fig_trends.add_trace(go.Scatter(
-            x=country_data['Year'], y=country_data['Five_Year_Survival_%'],
-            name=t('survival', lang), line=dict(color='#FF69B4', width=3),
-            fill='tozeroy', mode='lines+markers'
-        ), row=2, col=1)
-        fig_trends.add_hline(y=70, line_dash="dash", line_color="green", 
-                            annotation_text=t('objective', lang), row=2, col=1)
-        
-        # MI Ratio
-        fig_trends.add_trace(go.Scatter(
-            x=country_data['Year'], y=country_data['MI_Ratio'],
-            name=t('mi_ratio', lang), line=dict(color='#FFB6C1', width=3),
-            fill='tozeroy', mode='lines+markers'
-        ), row=2, col=2)
-        fig_trends.add_hline(y=30, line_dash="dash", line_color="green", 
-                            annotation_text=t('objective', lang), row=2, col=2)
-        fig_trends.add_hline(y=50, line_dash="dash", line_color="orange", 
-                            annotation_text=t('critical_threshold', lang), row=2, col=2)
-        
-        fig_trends.update_xaxes(title_text=t('year', lang))
-        fig_trends.update_yaxes(title_text=t('rate_per_100k', lang), row=1, col=1)
-        fig_trends.update_yaxes(title_text=t('coverage_pct', lang), row=1, col=2)
-        fig_trends.update_yaxes(title_text=t('survival_pct', lang), row=2, col=1)
-        fig_trends.update_yaxes(title_text=t('mi_ratio_pct', lang), row=2, col=2)
-        
-        fig_trends.update_layout(height=600, showlegend=True, title_text=f"{t('trend_title', lang)} - {selected_country}")
-        st.plotly_chart(fig_trends, use_container_width=True)
-        
-        # Changes
-        if len(country_data) >= 2:
-            first_year = country_data.iloc[0]
-            last_year = country_data.iloc[-1]
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                survival_change = last_year['Five_Year_Survival_%'] - first_year['Five_Year_Survival_%']
-                st.metric(t('survival_change', lang), f"{survival_change:+.1f}%",
-                         help=f"{t('change_from', lang)} {int(first_year['Year'])} {t('to', lang)} {int(last_year['Year'])}")
-            
-            with col2:
-                screening_change = last_year['Screening_Coverage_%'] - first_year['Screening_Coverage_%']
-                st.metric(t('screening_change', lang), f"{screening_change:+.1f}%",
-                         help=f"{t('change_from', lang)} {int(first_year['Year'])} {t('to', lang)} {int(last_year['Year'])}")
-            
-            with col3:
-                incidence_change = last_year['Incidence_Rate_ASR'] - first_year['Incidence_Rate_ASR']
-                st.metric(t('incidence_change', lang), f"{incidence_change:+.1f}",
-                         help=f"{t('change_from', lang)} {int(first_year['Year'])} {t('to', lang)} {int(last_year['Year'])}")
-            
-            with col4:
-                mi_change = last_year['MI_Ratio'] - first_year['MI_Ratio']
-                st.metric(t('mi_change', lang), f"{mi_change:+.1f}%",
-                         help=f"{t('change_from', lang)} {int(first_year['Year'])} {t('to', lang)} {int(last_year['Year'])}")
+    with perf.span('filter:region'):
+        year_data = dataset.year_data(selected_year)
+        region_countries = year_data['Country'][year_data['Region'] == data['Region']].astype(str).tolist()
+    st.button(f"{t('overlay_add_region', lang)} ({data['Region']})", on_click=_add_region,
+              args=(region_countries,), key='overlay_add_region')
+    if not chosen:
+        st.info(t('overlay_pick', lang))
+        return
     
-    # Global Comparison
-    if show_comparison:
-        st.markdown("---")
-        st.subheader(f"{t('global_comparison', lang)} - {selected_year}")
-        
-        global_avg_survival = year_data['Five_Year_Survival_%'].mean()
-        global_avg_screening = year_data['Screening_Coverage_%'].mean()
-        
-        fig_comp = go.Figure(data=[
-            go.Bar(name=selected_country, x=[t('survival_rate', lang), t('screening_coverage', lang), 
-                                            t('early_detection', lang), t('treatment_coverage', lang)],
-                  y=[data['Five_Year_Survival_%'], data['Screening_Coverage_%'],
-                     data['Early_Detection_Rate_%'], data['Treatment_Coverage_%']],
-                  marker_color='#FF1493'),
-            go.Bar(name=t('global_average', lang), x=[t('survival_rate', lang), t('screening_coverage', lang),
-                                               t('early_detection', lang), t('treatment_coverage', lang)],
-                  y=[global_avg_survival, global_avg_screening,
-                     year_data['Early_Detection_Rate_%'].mean(),
-                     year_data['Treatment_Coverage_%'].mean()],
-                  marker_color='#4169E1')
-        ])
-        
-        fig_comp.update_layout(
-            title=t('key_metrics_vs_global', lang),
-            yaxis_title=t('percentage', lang),
-            barmode='group',
-            height=400
+    # Column slices of the precomputed year x country matrix
+    with perf.span('filter:overlay'):
+        matrix = dataset.overlay(indicator, chosen)
+    target = indicator_target(indicator)
+    if len(chosen) > OVERLAY_MAX_COUNTRIES:
+        show_chart(('small_multiples', tuple(chosen), None, lang, indicator),
+                   lambda: small_multiples_figure(matrix, indicator, label, target))
+    else:
+        show_chart(('overlay', tuple(chosen), None, lang, indicator),
+                   lambda: overlay_figure(matrix, indicator, label, target))
+    st.caption(f"{t('overlay_small_multiples', lang)} {OVERLAY_MAX_COUNTRIES}.")
+
+
+@st.fragment
+@perf.section('leaderboards')
+def leaderboard_section(data, lang):
+    """Fastest improving and worsening countries by fitted slope"""
+    st.markdown("---")
+    if not st.toggle(t('show_leaderboards', lang), value=False, key='show_leaderboards'):
+        return
+    st.subheader(t('leaderboards', lang))
+    
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        indicator = st.selectbox(
+            t('leaderboard_indicator', lang), LEADERBOARD_COLUMNS,
+            index=LEADERBOARD_COLUMNS.index('Five_Year_Survival_%'),
+            format_func=lambda col: t(INDICATOR_LABELS[col], lang), key='leaderboard_indicator'
         )
-        st.plotly_chart(fig_comp, use_container_width=True)
-        
-        # HDI Comparison
-        st.subheader(t('hdi_comparison', lang))
-        
-        hdi_stats = year_data.groupby('HDI_Category').agg({
-            'Five_Year_Survival_%': 'mean',
-            'Screening_Coverage_%': 'mean'
-        }).round(1)
-        
-        fig_hdi = go.Figure(data=[
-            go.Bar(name=t('survival_rate', lang), x=hdi_stats.index, y=hdi_stats['Five_Year_Survival_%'],
-                  marker_color='#FF1493'),
-            go.Bar(name=t('screening_coverage', lang), x=hdi_stats.index, y=hdi_stats['Screening_Coverage_%'],
-                  marker_color='#4169E1')
-        ])
-        
-        fig_hdi.update_layout(
-            title=t('health_metrics_hdi', lang),
-            yaxis_title=t('percentage', lang),
-            barmode='group',
-            height=400
+    with col2:
+        # Small extracts may have fewer than 10 (or even 3) countries
+        top = st.number_input(t('leaderboard_size', lang), min_value=min(3, len(countries)),
+                              max_value=len(countries), value=min(10, len(countries)), key='leaderboard_size')
+    with col3:
+        same_region = st.checkbox(f"{t('leaderboard_region', lang)} ({data['Region']})", key='leaderboard_region')
+    region = str(data['Region']) if same_region else None
+    
+    # Slices of the trend fits computed for every country at load
+    with perf.span('filter:leaderboards'):
+        boards = {key: trend_leaderboard(dataset, indicator, improving, int(top), region)
+                  for key, improving in (('fastest_improving', True), ('fastest_worsening', False))}
+    
+    column_config = {
+        'slope': st.column_config.NumberColumn(f"{t('slope', lang)} (/{t('per_year', lang)})", format="%+.2f"),
+        'r2': st.column_config.NumberColumn("R²", format="%.2f"),
+        'cagr': st.column_config.NumberColumn(t('cagr', lang), format="percent"),
+        'Region': st.column_config.TextColumn(t('region', lang)),
+        'HDI_Category': st.column_config.TextColumn(t('hdi_category', lang)),
+    }
+    for col, (key, board) in zip(st.columns(2), boards.items()):
+        with col:
+            st.markdown(f"**{t(key, lang)}**")
+            if board.empty:
+                st.info(t('leaderboard_empty', lang))
+                continue
+            st.dataframe(board[['slope', 'r2', 'cagr', 'Region', 'HDI_Category']], use_container_width=True,
+                         column_config=column_config)
+    st.caption(t('leaderboard_note', lang))
+
+
+@st.fragment
+@perf.section('peers')
+def peers_section(selected_country, selected_year, lang):
+    """Countries that once looked like the selected one, and where they went next"""
+    label = partial(t, lang=lang)
+    st.markdown("---")
+    if not st.toggle(t('show_peers', lang), value=False, key='show_peers'):
+        return
+    st.subheader(f"{t('peers_title', lang)} - {selected_country}")
+    
+    col1, col2, col3 = st.columns([2, 1, 2])
+    max_back = int(selected_year) - int(dataset.years[0])
+    years_back = 0
+    with col1:
+        if max_back > 0:
+            years_back = st.slider(t('peer_years_back', lang), 0, max_back, min(10, max_back),
+                                   key='peer_years_back')
+    with col2:
+        k = st.number_input(t('peer_count', lang), min_value=1, max_value=20, value=5, key='peer_count')
+    with col3:
+        indicator = st.selectbox(
+            t('peer_indicator', lang), PEER_FEATURES,
+            index=PEER_FEATURES.index('Five_Year_Survival_%'),
+            format_func=lambda col: t(INDICATOR_LABELS[col], lang), key='peer_indicator'
         )
-        
-        st.plotly_chart(fig_hdi, use_container_width=True)
-        
-        # Country Ranking
-        st.subheader(f"{t('country_ranking', lang)} {selected_country} {t('rank', lang)}")
-        
-        survival_rank = (year_data['Five_Year_Survival_%'] > data['Five_Year_Survival_%']).sum() + 1
-        screening_rank = (year_data['Screening_Coverage_%'] > data['Screening_Coverage_%']).sum() + 1
-        total_countries = len(year_data)
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric(t('survival_rank', lang), f"{survival_rank} / {total_countries}")
-        
-        with col2:
-            st.metric(t('screening_rank', lang), f"{screening_rank} / {total_countries}")
-        
-        with col3:
-            percentile = ((total_countries - survival_rank) / total_countries * 100)
-            st.metric(t('survival_percentile', lang), f"{percentile:.0f}e")
+    match_year = int(selected_year) - years_back
     
-    # Recommendations
-    if show_recommendations:
-        st.markdown("---")
-        st.header(t('insights_recommendations', lang))
-        
-        concerns = []
-        successes = []
-        recommendations = []
-        
-        # Evaluate metrics
-        if data['Screening_Coverage_%'] < 50:
-            concerns.append(f"**{t('low_screening', lang)} ({data['Screening_Coverage_%']:.1f}%)**: {t('below_target', lang)}")
-            recommendations.append(f"{t('increase_screening', lang)}: {t('mobile_units', lang)}")
-        elif data['Screening_Coverage_%'] >= 70:
-            successes.append(f"**{t('good_screening', lang)} ({data['Screening_Coverage_%']:.1f}%)**: {t('meets_targets', lang)}")
-        
-        if data['Early_Detection_Rate_%'] < 50:
-            concerns.append(f"**{t('low_detection', lang)} ({data['Early_Detection_Rate_%']:.1f}%)**: {t('advanced_stages', lang)}")
-            recommendations.append(f"{t('enhance_detection', lang)}: {t('awareness_campaigns', lang)}")
-        elif data['Early_Detection_Rate_%'] >= 60:
-            successes.append(f"**{t('strong_detection', lang)} ({data['Early_Detection_Rate_%']:.1f}%)**: {t('effective_programs', lang)}")
-        
-        if data['Five_Year_Survival_%'] < 50:
-            concerns.append(f"**{t('low_survival', lang)} ({data['Five_Year_Survival_%']:.1f}%)**: {t('below_average', lang)}")
-            recommendations.append(f"{t('improve_treatment', lang)}: {t('strengthen_infrastructure', lang)}")
-        elif data['Five_Year_Survival_%'] >= 70:
-            successes.append(f"**{t('high_survival', lang)} ({data['Five_Year_Survival_%']:.1f}%)**: {t('excellent_outcomes', lang)}")
-        
-        if data['MI_Ratio'] > 50:
-            concerns.append(f"**{t('high_mi', lang)} ({data['MI_Ratio']:.1f}%)**: {t('late_detection', lang)}")
-            recommendations.append(f"{t('reduce_mi', lang)}: {t('focus_quality', lang)}")
-        elif data['MI_Ratio'] < 30:
-            successes.append(f"**{t('low_mi', lang)} ({data['MI_Ratio']:.1f}%)**: {t('effective_response', lang)}")
-        
-        if data['Treatment_Coverage_%'] < 70:
-            concerns.append(f"**{t('inadequate_treatment', lang)} ({data['Treatment_Coverage_%']:.1f}%)**: {t('not_receiving', lang)}")
-            recommendations.append(f"{t('expand_treatment', lang)}: {t('increase_centers', lang)}")
+    # Same-year peers are precomputed; other years scan one year's profiles
+    with perf.span('filter:peers'):
+        peers = find_peers(dataset, selected_country, selected_year, years_back, int(k))
+    if peers.empty:
+        st.info(t('peers_none', lang))
+        return
+    
+    st.markdown(f"**{t('peers_like', lang)} {selected_country} ({selected_year}) "
+                f"{t('peers_in', lang)} {match_year}**")
+    table = peers.drop(columns='year').rename(columns={
+        col: f"Δ {t(INDICATOR_LABELS[col], lang)}" for col in PEER_FEATURES
+    })
+    st.dataframe(
+        table,
+        use_container_width=True,
+        column_config={
+            'distance': st.column_config.NumberColumn(t('peer_distance', lang), format="%.2f"),
+            'Region': st.column_config.TextColumn(t('region', lang)),
+            'HDI_Category': st.column_config.TextColumn(t('hdi_category', lang)),
+            **{f"Δ {t(INDICATOR_LABELS[col], lang)}": st.column_config.NumberColumn(format="%+.1f")
+               for col in PEER_FEATURES},
+        }
+    )
+    
+    chosen = (selected_country, *peers.index)
+    with perf.span('filter:peer_trajectories'):
+        trajectories = peer_trajectories(dataset, selected_country, peers.index, indicator, match_year)
+    show_chart(('peers', chosen, None, lang, indicator, match_year),
+               lambda: overlay_figure(trajectories, indicator, label, indicator_target(indicator)))
+    st.caption(f"{t('peers_note', lang)} {match_year}.")
+
+
+@st.fragment
+@perf.section('comparison')
+def comparison_section(data, selected_country, selected_year, lang):
+    """Global, regional and HDI comparison, country ranking"""
+    label = partial(t, lang=lang)
+    st.markdown("---")
+    if not st.toggle(t('show_comparison', lang), value=True, key='show_comparison'):
+        return
+    st.subheader(f"{t('global_comparison', lang)} - {selected_year}")
+    
+    weighting = st.radio(t('averages', lang), ['unweighted', 'weighted'], format_func=lambda key: t(key, lang),
+                         horizontal=True, key='weighting', help=t('weighting_help', lang))
+    weighted = weighting == 'weighted'
+    region = str(data['Region'])
+    
+    # Precomputed per-year aggregates: dictionary lookups, weighted or not
+    with perf.span('filter:year_aggregates'):
+        global_avg = global_average(dataset, selected_year, weighted)
+        region_avg = region_average(dataset, region, selected_year, weighted)
+        hdi_stats = hdi_comparison(dataset, selected_year, weighted)
+        region_stats = region_comparison(dataset, selected_year, weighted)
+    
+    show_chart(('comparison', selected_country, selected_year, lang, weighting),
+               lambda: comparison_figure(data, global_avg, selected_country, label, region_avg, weighted))
+    
+    # HDI Comparison
+    st.subheader(t('hdi_comparison', lang))
+    
+    show_chart(('hdi', None, selected_year, lang, weighting), lambda: hdi_figure(hdi_stats, label))
+    
+    # Region Comparison
+    st.subheader(t('region_comparison', lang))
+    
+    show_chart(('regions', None, selected_year, lang, weighting), lambda: region_figure(region_stats, label))
+    
+    # Country Ranking
+    st.subheader(f"{t('country_ranking', lang)} {selected_country} {t('rank', lang)}")
+    
+    with perf.span('filter:ranks'):
+        ranks = dataset.ranks_for(selected_country, selected_year)
+        rank_history = dataset.rank_history(selected_country)
+    survival = ranks.loc['Five_Year_Survival_%']
+    screening = ranks.loc['Screening_Coverage_%']
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(t('survival_rank', lang), f"{survival['rank']:.0f} / {survival['field']:.0f}")
+    
+    with col2:
+        st.metric(t('screening_rank', lang), f"{screening['rank']:.0f} / {screening['field']:.0f}")
+    
+    with col3:
+        st.metric(t('survival_percentile', lang), f"{survival['percentile']:.0f}e")
+    
+    # Every indicator: rank this year, places gained since the first year, history
+    st.markdown(f"**{t('all_ranks', lang)}**")
+    first_ranks = rank_history.iloc[0]
+    rank_table = pd.DataFrame({
+        t('indicator', lang): [t(INDICATOR_LABELS[col], lang) for col in ranks.index],
+        t('rank_col', lang): [f"{r:.0f} / {n:.0f}" for r, n in zip(ranks['rank'], ranks['field'])],
+        t('percentile', lang): ranks['percentile'].to_numpy(),
+        t('rank_change', lang): (first_ranks - ranks['rank']).to_numpy(),
+        t('rank_history', lang): [rank_history[col].tolist() for col in ranks.index],
+    })
+    st.dataframe(
+        rank_table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            t('percentile', lang): st.column_config.NumberColumn(format="%.0f"),
+            t('rank_change', lang): st.column_config.NumberColumn(format="%+.0f"),
+            t('rank_history', lang): st.column_config.LineChartColumn(),
+        }
+    )
+    st.caption(f"{t('rank_note', lang)} {rank_history.index[0]} {t('to', lang)} {selected_year}.")
+
+
+@st.fragment
+@perf.section('recommendations')
+def recommendations_section(data, selected_country, selected_year, lang):
+    """Concerns, successes and actionable recommendations"""
+    st.markdown("---")
+    if not st.toggle(t('show_recommendations', lang), value=True, key='show_recommendations'):
+        return
+    st.header(t('insights_recommendations', lang))
+    
+    concerns = []
+    successes = []
+    actions = []
+    
+    # Evaluate metrics (rules are precomputed for every country and year)
+    with perf.span('recommendations'):
+        concern_rules, success_rules = recommendations(dataset, selected_country, selected_year)
+        for rule in concern_rules:
+            concerns.append(f"**{t(rule.title, lang)} ({data[rule.column]:.1f}%)**: {t(rule.detail, lang)}")
+            actions.append(f"{t(rule.action, lang)}: {t(rule.action_detail, lang)}")
+        for rule in success_rules:
+            successes.append(f"**{t(rule.title, lang)} ({data[rule.column]:.1f}%)**: {t(rule.detail, lang)}")
+    
+    # Display
+    if successes:
+        st.markdown('<div class="success-box">', unsafe_allow_html=True)
+        st.markdown(f"### {t('positive_aspects', lang)}")
+        for success in successes:
+            st.markdown(f"- {success}")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    if concerns:
+        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
+        st.markdown(f"### {t('areas_attention', lang)}")
+        for concern in concerns:
+            st.markdown(f"- {concern}")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    if actions:
+        st.markdown('<div class="insight-box">', unsafe_allow_html=True)
+        st.markdown(f"### {t('actionable_recommendations', lang)}")
+        for rec in actions:
+            st.markdown(f"{rec}")
+        
+        st.markdown(f"\n**{t('general_recommendations', lang)}**")
+        for i in range(1, 9):
+            st.markdown(t(f'rec_{i}', lang))
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Outreach cohorts: other countries sharing each concern this year
+    if concern_rules:
+        first_year = dataset.years[0]
+        with st.expander(t('outreach_cohorts', lang)):
+            for rule in concern_rules:
+                with perf.span('recommendations:cohorts'):
+                    flagged = dataset.flags.flagged(rule.code, selected_year)
+                    cleared = dataset.flags.cleared(rule.code, first_year, selected_year)
+                st.markdown(f"**{t(rule.title, lang)}** - {len(flagged)} {t('countries_in', lang)} {selected_year}: {', '.join(flagged)}")
+                if cleared:
+                    st.caption(f"{t('cleared_since', lang)} {first_year}: {', '.join(cleared)}")
+
+
+@st.fragment
+@perf.section('understanding')
+def understanding_section(lang):
+    """Metric definitions and interpretation guide"""
+    st.markdown("---")
+    st.subheader(t('understanding_data', lang))
+    
+    with st.expander(t('what_metrics_mean', lang)):
+        st.markdown(f"""
+        **{t('def_incidence', lang)}**
         
-        # Display
-        if successes:
-            st.markdown('<div class="success-box">', unsafe_allow_html=True)
-            st.markdown(f"### {t('positive_aspects', lang)}")
-            for success in successes:
-                st.markdown(f"- {success}")
-            st.markdown('</div>', unsafe_allow_html=True)
+        **{t('def_mortality', lang)}**
         
-        if concerns:
-            st.markdown('<div class="warning-box">', unsafe_allow_html=True)
-            st.markdown(f"### {t('areas_attention', lang)}")
-            for concern in concerns:
-                st.markdown(f"- {concern}")
-            st.markdown('</div>', unsafe_allow_html=True)
+        **{t('def_mi_ratio', lang)}**
+        - **{t('mi_excellent', lang)}**
+        - **{t('mi_moderate', lang)}**
+        - **{t('mi_concerning', lang)}**
         
-        if recommendations:
-            st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-            st.markdown(f"### {t('actionable_recommendations', lang)}")
-            for rec in recommendations:
-                st.markdown(f"{rec}")
-            
-            st.markdown(f"\n**{t('general_recommendations', lang)}**")
-            for i in range(1, 9):
-                st.markdown(t(f'rec_{i}', lang))
-            st.markdown('</div>', unsafe_allow_html=True)
+        **{t('def_screening', lang)}**
+        - **{t('target', lang)}**: ≥ 70%
         
-        # Understanding data
-        st.markdown("---")
-        st.subheader(t('understanding_data', lang))
+        **{t('def_detection', lang)}**
+        - **{t('target', lang)}**: ≥ 60%
         
-        with st.expander(t('what_metrics_mean', lang)):
-            st.markdown(f"""
-            **{t('def_incidence', lang)}**
-            
-            **{t('def_mortality', lang)}**
-            
-            **{t('def_mi_ratio', lang)}**
-            - **{t('mi_excellent', lang)}**
-            - **{t('mi_moderate', lang)}**
-            - **{t('mi_concerning', lang)}**
-            
-            **{t('def_screening', lang)}**
-            - **{t('target', lang)}**: ≥ 70%
-            
-            **{t('def_detection', lang)}**
-            - **{t('target', lang)}**: ≥ 60%
-            
-            **{t('def_treatment', lang)}**
-            - **{t('target', lang)}**: ≥ 90%
-            
-            **{t('def_survival', lang)}**
-            - **{t('target', lang)}**: ≥ 70%
-            """)
+        **{t('def_treatment', lang)}**
+        - **{t('target', lang)}**: ≥ 90%
         
-        with st.expander(t('how_interpret', lang)):
-            st.markdown(f"""
-            **{t('low_resource', lang)}**
-            {t('low_resource_1', lang)}
-            {t('low_resource_2', lang)}
-            {t('low_resource_3', lang)}
-            
-            **{t('medium_resource', lang)}**
-            {t('medium_resource_1', lang)}
-            {t('medium_resource_2', lang)}
-            {t('medium_resource_3', lang)}
-            
-            **{t('high_resource', lang)}**
-            {t('high_resource_1', lang)}
-            {t('high_resource_2', lang)}
-            {t('high_resource_3', lang)}
-            
-            **{t('red_flags', lang)}**
-            {t('red_flag_1', lang)}
-            {t('red_flag_2', lang)}
-            {t('red_flag_3', lang)}
-            """)
+        **{t('def_survival', lang)}**
+        - **{t('target', lang)}**: ≥ 70%
+        """)
+    
+    with st.expander(t('how_interpret', lang)):
+        st.markdown(f"""
+        **{t('low_resource', lang)}**
+        {t('low_resource_1', lang)}
+        {t('low_resource_2', lang)}
+        {t('low_resource_3', lang)}
+        
+        **{t('medium_resource', lang)}**
+        {t('medium_resource_1', lang)}
+        {t('medium_resource_2', lang)}
+        {t('medium_resource_3', lang)}
+        
+        **{t('high_resource', lang)}**
+        {t('high_resource_1', lang)}
+        {t('high_resource_2', lang)}
+        {t('high_resource_3', lang)}
+        
+        **{t('red_flags', lang)}**
+        {t('red_flag_1', lang)}
+        {t('red_flag_2', lang)}
+        {t('red_flag_3', lang)}
+        """)
 
+
+# Main content
+if data is not None:
+    overview_section(data, selected_country, selected_year, lang)
+    gauges_section(data, selected_country, selected_year, lang)
+    map_section(selected_year, lang)
+    trends_section(selected_country, lang)
+    overlay_section(data, selected_country, selected_year, lang)
+    leaderboard_section(data, lang)
+    peers_section(selected_country, selected_year, lang)
+    comparison_section(data, selected_country, selected_year, lang)
+    recommendations_section(data, selected_country, selected_year, lang)
+    understanding_section(lang)
 else:
     st.error(f"{t('no_data', lang)} {selected_country} {t('in', lang)} {selected_year}")
 
@@ -1035,4 +745,28 @@ st.sidebar.info(f"""
 """)
 
 st.sidebar.markdown("---")
-st.sidebar.success(t('early_detection', lang))
+st.sidebar.success(t('early_detection_saves', lang))
+
+# Close this rerun's timing spans; the opt-in panel shows them
+run = perf.finish_run()
+if st.sidebar.toggle(t('perf_debug', lang), value=False, key='perf_debug'):
+    with st.sidebar.expander(f"{t('perf_this_run', lang)} - {run['ms']:.0f} ms", expanded=True):
+        st.dataframe(
+            pd.DataFrame({
+                t('perf_span', lang): ['\u2003' * span['depth'] + span['name'] for span in run['spans']],
+                'ms': [span.get('ms') for span in run['spans']],
+                'cache': [span.get('cache', '') for span in run['spans']],
+                'bytes': [span.get('bytes') for span in run['spans']],
+                'raw bytes': [span.get('raw_bytes') for span in run['spans']],
+            }),
+            hide_index=True,
+            use_container_width=True,
+        )
+    with st.sidebar.expander(t('perf_recent', lang)):
+        st.dataframe(pd.DataFrame.from_dict(perf.summary(perf.recent_runs()), orient='index'),
+                     use_container_width=True)
+        st.json(figure_cache.stats())
+
+# Cold-start report (printed once per process)
+startup.mark('first_render', render_start)
+startup.finish()
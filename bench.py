@@ -0,0 +1,289 @@
+"""
+Rerun Latency Benchmarks / Bancs d'Essai de Latence
+Times each dashboard section across synthetic data scales and flags regressions.
+
+Each scale (COUNTRIESxYEARSxSUBUNITS) is generated with synth.py and measured
+in its own process: bundle compile, dataset load, the computations and figure
+builds behind every section, and full headless reruns of app.py.
+
+Usage: python bench.py [--scales 90x21x1 1000x30x1] [--save NAME] [--compare NAME]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "bench_results")
+SYNTH_DIR = os.path.join(HERE, ".cache", "synth")
+
+DEFAULT_SCALES = ['90x21x1', '500x30x1', '2000x30x1', '200x21x20']
+SECTIONS = [
+    'compile', 'load', 'trend_fit', 'projection_fit', 'peer_index', 'filtering', 'gauges', 'map', 'trends', 'overlay', 'leaderboards',
+    'peers', 'comparison', 'recommendations', 'app_cold', 'rerun_country', 'rerun_year',
+]
+
+# A section regresses when it is this much slower and also above the noise floor
+TOLERANCE = 0.25
+NOISE_FLOOR_MS = 1.0
+
+
+def parse_scale(scale):
+    countries, years, subunits = (int(part) for part in scale.lower().split('x'))
+    return countries, years, subunits
+
+
+def _summary(samples):
+    ms = np.asarray(samples) * 1000
+    return {
+        'median_ms': round(float(np.median(ms)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'n': len(ms),
+    }
+
+
+def _timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure(csv_path, samples, reruns, seed=0):
+    """Timings for one dataset, run inside the benchmark worker process"""
+    from functools import partial
+
+    from analytics import (
+        find_peers, global_average, hdi_comparison, load, map_frames, peer_trajectories, period_change,
+        recommendations, region_average, region_comparison, target_gaps, trend_leaderboard, trend_stats
+    )
+    from bundle import compile_bundle
+    from figures import (
+        OVERLAY_MAX_COUNTRIES, choropleth_figure, comparison_figure, gauges_figure, hdi_figure,
+        overlay_figure, region_figure, small_multiples_figure, trends_figure
+    )
+    from translations import t
+    from peers import PeerIndex
+    from projections import ProjectionTable
+    from trends import TrendTable
+
+    label = partial(t, lang='en')
+    timings = {}
+
+    start = time.perf_counter()
+    manifest = compile_bundle(csv_path)
+    timings['compile'] = [time.perf_counter() - start]
+    timings['load'] = _timed(lambda: load(csv_path), [()] * 3)
+    dataset = load(csv_path)
+    # The load-time fit of every country's trends, normally read back from the derived store
+    timings['trend_fit'] = _timed(lambda: TrendTable(dataset.matrix), [()] * 3)
+    timings['projection_fit'] = _timed(lambda: ProjectionTable(dataset.trends, dataset.years[-1]), [()] * 3)
+    timings['peer_index'] = _timed(lambda: PeerIndex(dataset.df, dataset.countries, dataset.years), [()])
+
+    rng = np.random.default_rng(seed)
+    countries = list(dataset.countries)
+    pairs = []
+    while len(pairs) < samples:
+        country = countries[rng.integers(len(countries))]
+        years = dataset.country_data(country)['Year']
+        pairs.append((country, int(years.iloc[rng.integers(len(years))])))
+
+    def filtering(country, year):
+        dataset.row(country, year)
+        dataset.country_data(country)
+        dataset.year_data(year)
+
+    def gauges(country, year):
+        data = dataset.row(country, year)
+        target_gaps(data)
+        gauges_figure(data, label).to_json()
+
+    def world_map(country, year):
+        codes, values = map_frames(dataset, 'Five_Year_Survival_%')
+        choropleth_figure(values, codes, 'Five_Year_Survival_%', label).to_json()
+
+    def trends(country, year):
+        country_data = dataset.country_data(country)
+        period_change(country_data)
+        trend_stats(dataset, country)
+        trends_figure(country_data, country, label, dataset.projection_for(country)).to_json()
+
+    def overlay(country, year):
+        # A regional officer's selection: the country and up to 15 others
+        others = [c for c in countries if c != country]
+        chosen = [country] + [others[i] for i in rng.choice(len(others), min(15, len(others)), replace=False)]
+        for selection in (chosen[:OVERLAY_MAX_COUNTRIES], chosen):
+            matrix = dataset.overlay('Five_Year_Survival_%', selection)
+            build = overlay_figure if len(selection) <= OVERLAY_MAX_COUNTRIES else small_multiples_figure
+            build(matrix, 'Five_Year_Survival_%', label).to_json()
+
+    def leaderboards(country, year):
+        region = str(dataset.row(country, year)['Region'])
+        for improving in (True, False):
+            trend_leaderboard(dataset, 'Five_Year_Survival_%', improving)
+            trend_leaderboard(dataset, 'MI_Ratio', improving, region=region)
+
+    def peers(country, year):
+        # This year's peers (precomputed), then peers ten years back with their trajectories
+        find_peers(dataset, country, year)
+        years_back = min(10, year - dataset.years[0])
+        found = find_peers(dataset, country, year, years_back)
+        peer_trajectories(dataset, country, found.index, 'Five_Year_Survival_%', year - years_back)
+
+    def comparison(country, year):
+        data = dataset.row(country, year)
+        region_avg = region_average(dataset, str(data['Region']), year, weighted=True)
+        comparison_figure(data, global_average(dataset, year, weighted=True), country, label,
+                          region_avg, weighted=True).to_json()
+        hdi_figure(hdi_comparison(dataset, year, weighted=True), label).to_json()
+        region_figure(region_comparison(dataset, year, weighted=True), label).to_json()
+        dataset.ranks_for(country, year)
+        dataset.rank_history(country)
+
+    def recommend(country, year):
+        concerns, _ = recommendations(dataset, country, year)
+        for rule in concerns:
+            dataset.flags.flagged(rule.code, year)
+
+    for name, fn in [('filtering', filtering), ('gauges', gauges), ('map', world_map),
+                     ('trends', trends), ('overlay', overlay), ('leaderboards', leaderboards),
+                     ('peers', peers), ('comparison', comparison),
+                     ('recommendations', recommend)]:
+        timings[name] = _timed(fn, pairs)
+
+    # Full script reruns, as a browser session triggers them
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(HERE, "app.py"), default_timeout=600)
+    timings['app_cold'] = _timed(app.run, [()])
+    country_runs = []
+    year_runs = []
+    for country, year in pairs[:reruns]:
+        start = time.perf_counter()
+        app.sidebar.selectbox[1].set_value(country).run()
+        country_runs.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        app.sidebar.selectbox[2].set_value(year).run()
+        year_runs.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(f"app.py raised: {app.exception}")
+    timings['rerun_country'] = country_runs
+    timings['rerun_year'] = year_runs
+
+    return {
+        'source_rows': manifest['source_rows'],
+        'rows': manifest['rows'],
+        'sections': {name: _summary(timings[name]) for name in SECTIONS},
+    }
+
+
+def run_scale(scale, samples, reruns, seed):
+    """Generate the dataset if needed and measure it in a fresh process"""
+    from synth import generate
+
+    csv_path = os.path.join(SYNTH_DIR, f"{scale}-s{seed}.csv")
+    if not os.path.exists(csv_path):
+        generate(csv_path, *parse_scale(scale), seed=seed)
+
+    env = dict(os.environ, DASHBOARD_CSV=csv_path)
+    proc = subprocess.run(
+        [sys.executable, __file__, '--worker', csv_path,
+         '--samples', str(samples), '--reruns', str(reruns), '--seed', str(seed)],
+        env=env, cwd=HERE, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"benchmark worker failed for {scale}:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def results_path(name):
+    return name if name.endswith('.json') else os.path.join(RESULTS_DIR, f"{name}.json")
+
+
+def compare(baseline, current, tolerance=TOLERANCE, floor_ms=NOISE_FLOOR_MS):
+    """Print a section-by-section comparison; return the regressed (scale, section) pairs"""
+    regressions = []
+    print(f"\n{'scale':<12} {'section':<16} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+    for scale, result in current['scales'].items():
+        base_sections = baseline['scales'].get(scale, {}).get('sections', {})
+        for section, stats in result['sections'].items():
+            if section not in base_sections:
+                continue
+            base = base_sections[section]['median_ms']
+            now = stats['median_ms']
+            ratio = now / base if base else float('inf')
+            regressed = now > base * (1 + tolerance) and now - base > floor_ms
+            if regressed:
+                regressions.append((scale, section))
+            print(f"{scale:<12} {section:<16} {base:>10.2f} {now:>10.2f} {ratio:>6.2f}x"
+                  f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard sections across data scales")
+    parser.add_argument('--scales', nargs='*', default=DEFAULT_SCALES, metavar='NxMxK')
+    parser.add_argument('--samples', type=int, default=20, help="country/year pairs per section")
+    parser.add_argument('--reruns', type=int, default=5, help="headless app reruns per interaction")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='NAME', help=f"store results as {RESULTS_DIR}/NAME.json")
+    parser.add_argument('--compare', metavar='NAME', help="compare against stored results")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--worker', metavar='CSV', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        json.dump(measure(args.worker, args.samples, args.reruns, args.seed), sys.stdout)
+        return 0
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'scales': {},
+    }
+    for scale in args.scales:
+        parse_scale(scale)
+        print(f"Benchmarking {scale}...", file=sys.stderr)
+        result = run_scale(scale, args.samples, args.reruns, args.seed)
+        results['scales'][scale] = result
+        print(f"  {result['source_rows']:,} rows, {result['rows']:,} country-years", file=sys.stderr)
+        for section, stats in result['sections'].items():
+            print(f"  {section:<16} median {stats['median_ms']:9.2f} ms   p95 {stats['p95_ms']:9.2f} ms",
+                  file=sys.stderr)
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(results_path(args.save), 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {results_path(args.save)}", file=sys.stderr)
+    if args.compare:
+        with open(results_path(args.compare), encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} section(s) regressed by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
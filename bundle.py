@@ -0,0 +1,331 @@
+"""
+Compiled Columnar Data Bundle / Paquet de Données Colonnaire Compilé
+Compiles the CSV into typed .npy columns so server processes never re-parse text.
+
+Columns are memory-mapped read-only on load, as are the derived arrays
+(index, aggregates, ranks) stored beside them, so every worker process on a
+host shares one page-cache copy instead of holding its own.
+
+Each version of the source gets its own directory, keyed by its sha256, and
+files in it are never rewritten. The manifest beside those directories names
+the current one; it is replaced atomically, so a worker loading during a
+refresh maps one version or the other, never a mix.
+
+Usage: python bundle.py [csv_path]
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+# DASHBOARD_CSV points the dashboard at another extract with the same schema
+CSV_PATH = os.environ.get('DASHBOARD_CSV', "breast_cancer_global_data_2003_2023.csv")
+BUNDLE_ROOT = ".cache"
+BUNDLE_VERSION = 10
+
+# Column schema / Schéma des colonnes
+CATEGORY_COLUMNS = ['Country', 'Region', 'HDI_Category']
+INTEGER_COLUMNS = ['Year', 'New_Cases', 'Deaths']
+FLOAT_COLUMNS = [
+    'Incidence_Rate_ASR', 'Mortality_Rate_ASR', 'MI_Ratio', 'Population_Millions',
+    'Screening_Coverage_%', 'Early_Detection_Rate_%', 'Treatment_Coverage_%',
+    'Five_Year_Survival_%'
+]
+# Numeric indicators in CSV order (everything except the keys)
+INDICATOR_COLUMNS = [
+    'Incidence_Rate_ASR', 'Mortality_Rate_ASR', 'New_Cases', 'Deaths', 'MI_Ratio',
+    'Population_Millions', 'Screening_Coverage_%', 'Early_Detection_Rate_%',
+    'Treatment_Coverage_%', 'Five_Year_Survival_%'
+]
+CSV_DTYPES = {
+    **{col: 'category' for col in CATEGORY_COLUMNS},
+    **{col: 'int64' for col in INTEGER_COLUMNS},
+    **{col: 'float64' for col in FLOAT_COLUMNS},
+}
+
+MANIFEST = "manifest.json"
+COUNTS = "counts.npy"
+HASHES = {'rows': "row_hashes.npy", 'periods': "period_hashes.npy"}
+# Versions kept on disk: the current one and the one before, which workers
+# that have not refreshed yet may still be reading
+KEEP_VERSIONS = 2
+
+
+def bundle_dir(csv_path=CSV_PATH):
+    """Directory holding the compiled bundle versions for a given CSV and the manifest naming the current one"""
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), BUNDLE_ROOT, stem)
+
+
+def version_dir(csv_path, manifest):
+    """Directory holding the files of the bundle version `manifest` describes"""
+    return os.path.join(bundle_dir(csv_path), manifest['directory'])
+
+
+def _file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _narrow_int(values):
+    """Smallest signed integer dtype that holds every value"""
+    if len(values) == 0:
+        return values.astype(np.int16)
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def _column_file(directory, column):
+    # Keep file names free of '%'
+    return os.path.join(directory, column.replace('%', 'pct') + '.npy')
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _write_json(path, value, **kwargs):
+    _write_atomic(path, lambda f: f.write(json.dumps(value, **kwargs).encode('utf-8')))
+
+
+def _publish(directory, final):
+    """Rename the finished `directory` to `final`, or drop it if another process got there first"""
+    try:
+        os.rename(directory, final)
+    except OSError:
+        if not os.path.isdir(final):
+            raise
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _prune(root, keep):
+    """Delete bundle versions under `root` other than the newest KEEP_VERSIONS, always keeping `keep`"""
+    versions = sorted((entry for entry in os.scandir(root)
+                       if entry.is_dir() and entry.name.startswith('v') and entry.name != keep),
+                      key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+    for entry in versions[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compile_bundle(csv_path=CSV_PATH, chunksize=None):
+    """Stream the CSV once and write one typed .npy file per column
+
+    The bundle holds one row per (Country, Year), country by country with
+    years ascending, however many rows the CSV has per pair (see ingest.py).
+    Every source row is validated on the way (see validate.py).
+    """
+    from ingest import DEFAULT_CHUNKSIZE, RowHashes, stream_country_years
+    from validate import Validator
+
+    stat = os.stat(csv_path)
+    validator = Validator()
+    hashes = RowHashes()
+    df, counts, info = stream_country_years(csv_path, chunksize or DEFAULT_CHUNKSIZE, validator, hashes)
+    return write_bundle(csv_path, stat, df, counts, info, hashes, report=validator.report(df, counts, info))
+
+
+def write_bundle(csv_path, stat, df, counts, info, hashes, changes=None, report=None):
+    """Write reduced (Country, Year) rows as the bundle of the CSV as of `stat`
+
+    `counts` (source rows and population behind each reduced value) and
+    `hashes` (ingest.RowHashes, to tell repeats of earlier rows) are kept
+    so rows can be folded in later; `changes` records what differs from
+    the previous bundle, for processes that still hold it (see
+    refresh.py), and `report` is the anomaly report of the rows (see
+    validate.py).
+    """
+    from validate import save_report
+
+    # Everything is written to a private directory, renamed into place, and
+    # only then made current by replacing the manifest
+    root = bundle_dir(csv_path)
+    key = f"v{BUNDLE_VERSION}-{info['sha256'][:16]}"
+    directory = os.path.join(root, f".{key}.tmp-{os.getpid()}")
+    os.makedirs(directory, exist_ok=True)
+    if report is not None:
+        save_report(directory, report)
+
+    columns = {}
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            cat = df[col].cat
+            values = _narrow_int(cat.codes.to_numpy())
+            columns[col] = {'kind': 'category', 'categories': [str(c) for c in cat.categories]}
+        elif col in INTEGER_COLUMNS and df[col].dtype.kind == 'i':
+            # Counts with missing values stay float (see ingest.country_years)
+            values = _narrow_int(df[col].to_numpy())
+            columns[col] = {'kind': 'int'}
+        else:
+            # float64 as used: a scaled or float32 encoding would need decoding
+            # into private memory, defeating the shared mapping (and float32
+            # shifts values like 20.95 across the displayed rounding boundary)
+            values = df[col].to_numpy(dtype=np.float64)
+            columns[col] = {'kind': 'float'}
+        columns[col]['dtype'] = values.dtype.str
+        np.save(_column_file(directory, col), values)
+    np.save(os.path.join(directory, COUNTS), counts.to_numpy(dtype=np.float64))
+    for name, values in hashes.arrays().items():
+        np.save(os.path.join(directory, HASHES[name]), values)
+
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'directory': key,
+        'source': os.path.basename(csv_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': info['sha256'],
+        'source_rows': info['source_rows'],
+        'header': info['header'],
+        'rows': len(df),
+        'order': list(df.columns),
+        'columns': columns,
+        'counts': list(counts.columns),
+        'changes': changes,
+        'anomalies': None if report is None else report['anomalies'],
+    }
+    _write_json(os.path.join(directory, MANIFEST), manifest, indent=2)
+    _publish(directory, os.path.join(root, key))
+    # The published directory may be another process's compile of the same source
+    manifest = {**_read_manifest(os.path.join(root, key)), 'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns, 'changes': changes}
+    _write_json(os.path.join(root, MANIFEST), manifest, indent=2)
+    _prune(root, key)
+    return manifest
+
+
+def ensure_bundle(csv_path=CSV_PATH):
+    """Return an up-to-date manifest, recompiling only when the CSV changed"""
+    directory = bundle_dir(csv_path)
+    manifest = _read_manifest(directory)
+    stat = os.stat(csv_path)
+
+    if (manifest is None or manifest.get('version') != BUNDLE_VERSION
+            or not os.path.isdir(version_dir(csv_path, manifest))):
+        return compile_bundle(csv_path)
+    if manifest['size'] == stat.st_size and manifest['mtime_ns'] == stat.st_mtime_ns:
+        return manifest
+
+    # Touched but maybe not modified: only the hash decides
+    if manifest['size'] == stat.st_size and manifest['sha256'] == _file_sha256(csv_path):
+        manifest['mtime_ns'] = stat.st_mtime_ns
+        _write_json(os.path.join(directory, MANIFEST), manifest, indent=2)
+        return manifest
+    return compile_bundle(csv_path)
+
+
+def read_manifest(csv_path=CSV_PATH):
+    """The current bundle's manifest as stored, or None (no staleness check)"""
+    manifest = _read_manifest(bundle_dir(csv_path))
+    if manifest is None or manifest.get('version') != BUNDLE_VERSION:
+        return None
+    return manifest
+
+
+def load_columns(csv_path=CSV_PATH, check=True):
+    """Load the compiled columns as (manifest, {column: array or Categorical})
+
+    Every returned array is a read-only memory map of the bundle file, so
+    callers can share them freely, across threads and processes. With
+    check=False an existing bundle is loaded even if the CSV has changed.
+    """
+    manifest = (not check and read_manifest(csv_path)) or ensure_bundle(csv_path)
+    return manifest, map_columns(csv_path, manifest)
+
+
+def map_columns(csv_path, manifest):
+    """{column: array or Categorical} of the bundle version `manifest` describes"""
+    directory = version_dir(csv_path, manifest)
+    data = {}
+    for col in manifest['order']:
+        spec = manifest['columns'][col]
+        values = np.load(_column_file(directory, col), mmap_mode='r')
+        if spec['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, categories=spec['categories'])
+        data[col] = values
+    return data
+
+
+def load_counts(csv_path, manifest):
+    """Source rows and population behind each reduced value, one row per row of the bundle version"""
+    counts = np.load(os.path.join(version_dir(csv_path, manifest), COUNTS))
+    return pd.DataFrame(counts, columns=manifest['counts'])
+
+
+def load_hashes(csv_path, manifest):
+    """The bundle version's ingest.RowHashes: every distinct source row read so far"""
+    from ingest import RowHashes
+
+    directory = version_dir(csv_path, manifest)
+    return RowHashes(**{name: np.load(os.path.join(directory, file)) for name, file in HASHES.items()})
+
+
+def _arrays_dir(directory, name, version):
+    tag = hashlib.sha256(str(version).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f"{name}-{tag}")
+
+
+def save_arrays(directory, name, version, arrays, meta=None):
+    """Store precomputed arrays (plus JSON metadata) in a bundle version's `directory`
+
+    `version` tags them: load_arrays() ignores a set saved for other data.
+    Each tag gets its own subdirectory, published whole like the bundle.
+    """
+    final = _arrays_dir(directory, name, version)
+    if _read_manifest(final) is not None:
+        return
+    staging = f"{final}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    for key, values in arrays.items():
+        np.save(os.path.join(staging, f"{key}.npy"), np.asarray(values), allow_pickle=False)
+    _write_json(os.path.join(staging, MANIFEST), {'version': version, 'arrays': list(arrays), 'meta': meta})
+    _publish(staging, final)
+
+
+def load_arrays(directory, name, version):
+    """(meta, {key: read-only memory map}) saved by save_arrays(), or None if missing or stale"""
+    directory = _arrays_dir(directory, name, version)
+    manifest = _read_manifest(directory)
+    if manifest is None or manifest.get('version') != version:
+        return None
+    try:
+        arrays = {key: np.load(os.path.join(directory, f"{key}.npy"), mmap_mode='r')
+                  for key in manifest['arrays']}
+    except (OSError, ValueError):
+        return None
+    return manifest['meta'], arrays
+
+
+def load_bundle(csv_path=CSV_PATH):
+    """Load the dataset as a typed DataFrame from the compiled bundle"""
+    _, data = load_columns(csv_path)
+    return pd.DataFrame(data)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    info = compile_bundle(path)
+    print(f"Compiled {info['source_rows']:,} rows from {info['source']} "
+          f"into {info['rows']:,} country-years in {version_dir(path, info)} ({info['anomalies']:,} anomalies)")
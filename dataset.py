@@ -0,0 +1,301 @@
+"""
+Shared Read-Only Dataset / Jeu de Données Partagé en Lecture Seule
+One immutable dataset per process, shared zero-copy by every dashboard session.
+
+The columns and the derived structures (index orders, aggregates, ranks,
+rule flags, the year x country matrix, per-country trend fits and their
+projections, the peer index) are memory maps of files in the bundle
+version's directory: the first process to load a bundle version computes and
+stores them, every later worker maps them.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from aggregates import AggregateCube
+from bundle import CSV_PATH, load_arrays, load_columns, save_arrays, version_dir
+from matrix import GROUP_COLUMNS, YearCountryMatrix
+from peers import PeerIndex
+from projections import ProjectionTable
+from ranks import RankTable
+from rules import RuleFlags
+from trends import TrendTable
+
+# Bump when the derived structures change shape or meaning
+DERIVED_VERSION = 9
+DERIVED = "derived"
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """DataFrame over frozen arrays that refuses structural changes
+
+    Element writes already fail because the underlying arrays are read-only;
+    this also blocks adding, deleting and in-place replacing columns.
+    Derived frames (filters, sorts, groupbys) are ordinary DataFrames.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Dataset frames are read-only; work on a copy instead")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    insert = _read_only
+    pop = _read_only
+    _update_inplace = _read_only
+    _set_axis = _read_only
+
+
+def _runs(keys, order):
+    """Group `order` into runs of equal keys: {key: slice or positions}
+
+    Runs that are already contiguous in the table become slices, so
+    selecting them is an O(1) view instead of a gather.
+    """
+    if len(order) == 0:
+        return {}
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    stops = np.r_[starts[1:], len(order)]
+    # A run is contiguous when no step inside it differs from +1
+    gaps = np.r_[0, np.cumsum(np.diff(order) != 1)]
+    contiguous = gaps[stops - 1] == gaps[starts]
+    runs = {}
+    for key, start, stop, whole in zip(sorted_keys[starts].tolist(), starts.tolist(), stops.tolist(),
+                                       contiguous.tolist()):
+        if whole:
+            first = int(order[start])
+            runs[key] = slice(first, first + stop - start)
+        else:
+            rows = order[start:stop]
+            rows.setflags(write=False)
+            runs[key] = rows
+    return runs
+
+
+class CountryYearIndex:
+    """Row lookups by country and by year, built once with the data
+
+    Country runs are sorted by year and year runs by country, so every
+    selection comes back pre-sorted.
+    """
+
+    def __init__(self, country, years, orders=None):
+        codes = np.asarray(country.codes)
+        years = np.asarray(years)
+        if orders is None:
+            orders = {
+                'by_country': np.lexsort((years, codes)),
+                'by_year': np.lexsort((codes, years)),
+            }
+        self.orders = orders
+        self.countries = tuple(country.categories[np.unique(codes)].tolist())
+        self.years = tuple(np.unique(years).tolist())
+        self._codes = {name: code for code, name in enumerate(country.categories)}
+        self._years = years
+        self._by_country = _runs(codes, orders['by_country'])
+        self._by_year = _runs(years, orders['by_year'])
+
+    def country_rows(self, country):
+        """Rows of one country, years ascending (empty if unknown)"""
+        return self._by_country.get(self._codes.get(country), slice(0, 0))
+
+    def year_rows(self, year):
+        """Rows of one year, countries in name order (empty if unknown)"""
+        return self._by_year.get(int(year), slice(0, 0))
+
+    def row(self, country, year):
+        """Position of the (country, year) row, or None"""
+        rows = self.country_rows(country)
+        if isinstance(rows, slice):
+            positions = np.arange(rows.start, rows.stop)
+        else:
+            positions = rows
+        years = self._years[rows]
+        i = np.searchsorted(years, year)
+        if i < len(years) and years[i] == year:
+            return int(positions[i])
+        return None
+
+
+class Dataset:
+    """Immutable, process-wide view of the compiled data bundle"""
+
+    __slots__ = ('version', 'n_rows', 'columns', 'df', 'index', 'aggregates', 'ranks', 'flags', 'matrix',
+                 'trends', 'projections', 'peers')
+
+    def __init__(self, columns, version, derived=None):
+        """`derived` is a stored (meta, arrays) pair from derived_arrays(); None computes it"""
+        set_ = object.__setattr__
+        set_(self, 'version', version)
+        set_(self, 'columns', MappingProxyType(dict(columns)))
+        set_(self, 'n_rows', len(next(iter(columns.values()))) if columns else 0)
+        set_(self, 'df', ReadOnlyFrame(dict(columns), copy=False))
+        if derived is None:
+            set_(self, 'index', CountryYearIndex(columns['Country'], columns['Year']))
+            set_(self, 'aggregates', AggregateCube(self.df))
+            set_(self, 'ranks', RankTable(self.df))
+            set_(self, 'flags', RuleFlags(self.df, self.index))
+            set_(self, 'matrix', YearCountryMatrix(self.df, self.index.countries, self.index.years))
+            set_(self, 'trends', TrendTable(self.matrix))
+            set_(self, 'projections', ProjectionTable(self.trends, self.index.years[-1]))
+            set_(self, 'peers', PeerIndex(self.df, self.index.countries, self.index.years))
+            return
+
+        meta, arrays = derived
+        part = {}
+        for key, values in arrays.items():
+            group, name = key.split('.', 1)
+            part.setdefault(group, {})[name] = values
+        set_(self, 'index', CountryYearIndex(columns['Country'], columns['Year'], part['index']))
+        set_(self, 'aggregates', AggregateCube.from_arrays(meta['aggregates'], part['aggregates']))
+        set_(self, 'ranks', RankTable.from_arrays(part['ranks']))
+        set_(self, 'flags', RuleFlags(self.df, self.index, flags=part['flags']['flags']))
+        categories = {col: columns[col].categories for col in GROUP_COLUMNS}
+        set_(self, 'matrix', YearCountryMatrix.from_arrays(
+            part['matrix'], self.index.countries, self.index.years, categories))
+        set_(self, 'trends', TrendTable.from_arrays(part['trends'], self.matrix))
+        set_(self, 'projections', ProjectionTable.from_arrays(part['projections'], self.index.countries))
+        set_(self, 'peers', PeerIndex.from_arrays(part['peers'], self.index.countries, self.index.years))
+
+    @classmethod
+    def from_bundle(cls, csv_path=CSV_PATH, check=True):
+        """Memory-map the bundle and its derived structures, computing those once per version
+
+        With check=False an existing bundle is used even if the CSV has
+        changed since (refresh.py then works out what changed).
+        """
+        manifest, columns = load_columns(csv_path, check)
+        version = manifest['sha256']
+        directory = version_dir(csv_path, manifest)
+        derived = load_arrays(directory, DERIVED, f"{DERIVED_VERSION}:{version}")
+        if derived is None:
+            cls(columns, version).store_derived(directory)
+            derived = load_arrays(directory, DERIVED, f"{DERIVED_VERSION}:{version}")
+        return cls(columns, version, derived)
+
+    def store_derived(self, directory):
+        """Save the derived structures in the bundle version's `directory` for other processes to map"""
+        meta, arrays = self.derived_arrays()
+        save_arrays(directory, DERIVED, f"{DERIVED_VERSION}:{self.version}", arrays, meta)
+
+    def refreshed(self, columns, version, changed):
+        """Dataset over new `columns`, recomputing derived values only where needed
+
+        `changed` lists the (country, year) pairs added, modified or removed
+        since this dataset. Ranks and aggregates are recomputed for their
+        years and rule flags for their rows; everything else is carried over.
+        The year x country matrix is a single scatter and the trend fits and
+        projections one pass each over it, so they are just rebuilt. So is the
+        peer index: new rows shift the standardization of every profile.
+        """
+        df = ReadOnlyFrame(dict(columns), copy=False)
+        keys = pd.MultiIndex.from_arrays([df['Country'].astype(str), df['Year'].astype(np.int64)])
+        old_keys = pd.MultiIndex.from_arrays([self.df['Country'].astype(str), self.df['Year'].astype(np.int64)])
+        old_rows = old_keys.get_indexer(keys)
+        years = sorted({int(year) for _, year in changed})
+        row_dirty = keys.isin(pd.MultiIndex.from_tuples(changed, names=keys.names)) if changed else np.zeros(len(df), bool)
+        row_dirty |= old_rows < 0
+        year_dirty = np.isin(df['Year'].to_numpy(), years)
+
+        def carry(old, dirty, update):
+            out = np.empty((len(df),) + old.shape[1:], dtype=np.result_type(old, update))
+            out[~dirty] = old[old_rows[~dirty]]
+            out[dirty] = update
+            return out
+
+        year_frame = df.iloc[np.flatnonzero(year_dirty)]
+        ranks = RankTable(year_frame).arrays()
+        flags = RuleFlags(df.iloc[np.flatnonzero(row_dirty)], None).flags
+        aggregates = (AggregateCube.patched(self.aggregates, AggregateCube(year_frame), years)
+                      if years else self.aggregates)
+        aggregates_meta, aggregate_arrays = aggregates.arrays()
+
+        index = CountryYearIndex(columns['Country'], columns['Year'])
+        arrays = {f'index.{k}': v for k, v in index.orders.items()}
+        arrays.update({f'aggregates.{k}': v for k, v in aggregate_arrays.items()})
+        arrays.update({f'ranks.{k}': carry(v, year_dirty, ranks[k]) for k, v in self.ranks.arrays().items()})
+        arrays['flags.flags'] = carry(self.flags.flags, row_dirty, flags)
+        matrix = YearCountryMatrix(df, index.countries, index.years)
+        arrays.update({f'matrix.{k}': v for k, v in matrix.arrays().items()})
+        trends = TrendTable(matrix)
+        arrays.update({f'trends.{k}': v for k, v in trends.arrays().items()})
+        projections = ProjectionTable(trends, index.years[-1])
+        arrays.update({f'projections.{k}': v for k, v in projections.arrays().items()})
+        peers = PeerIndex(df, index.countries, index.years)
+        arrays.update({f'peers.{k}': v for k, v in peers.arrays().items()})
+        return Dataset(columns, version, ({'aggregates': aggregates_meta}, arrays))
+
+    def derived_arrays(self):
+        """(meta, {'group.name': array}) for everything computed from the columns"""
+        aggregates_meta, aggregates = self.aggregates.arrays()
+        arrays = {f'index.{k}': v for k, v in self.index.orders.items()}
+        arrays.update({f'aggregates.{k}': v for k, v in aggregates.items()})
+        arrays.update({f'ranks.{k}': v for k, v in self.ranks.arrays().items()})
+        arrays['flags.flags'] = self.flags.flags
+        arrays.update({f'matrix.{k}': v for k, v in self.matrix.arrays().items()})
+        arrays.update({f'trends.{k}': v for k, v in self.trends.arrays().items()})
+        arrays.update({f'projections.{k}': v for k, v in self.projections.arrays().items()})
+        arrays.update({f'peers.{k}': v for k, v in self.peers.arrays().items()})
+        return {'aggregates': aggregates_meta}, arrays
+
+    @property
+    def countries(self):
+        return self.index.countries
+
+    @property
+    def years(self):
+        return self.index.years
+
+    def country_data(self, country):
+        """All years of one country, sorted by year"""
+        return self.df.iloc[self.index.country_rows(country)]
+
+    def year_data(self, year):
+        """All countries for one year"""
+        return self.df.iloc[self.index.year_rows(year)]
+
+    def row(self, country, year):
+        """The (country, year) record as a Series, or None"""
+        position = self.index.row(country, year)
+        return None if position is None else self.df.iloc[position]
+
+    def overlay(self, indicator, countries):
+        """Year x Country values of one indicator for several countries"""
+        return self.matrix.frame(indicator, countries)
+
+    def trends_for(self, country):
+        """indicator x (slope, intercept, r2, cagr, ...) trend fits of one country, or None"""
+        return self.trends.for_country(country)
+
+    def projection_for(self, country):
+        """Year x (band, indicator) projections of one country to 2030, or None"""
+        return self.projections.for_country(country)
+
+    def ranks_for(self, country, year):
+        """indicator x (rank, field, percentile) for one record, or None"""
+        position = self.index.row(country, year)
+        return None if position is None else self.ranks.at(position)
+
+    def rank_history(self, country):
+        """Year x indicator ranks of one country"""
+        return self.ranks.history(self.index.country_rows(country))
+
+    def rules_for(self, country, year):
+        """Recommendation rules triggered by one record"""
+        position = self.index.row(country, year)
+        return [] if position is None else self.flags.active(position)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Dataset is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Dataset is read-only")
+
+    def __repr__(self):
+        return f"Dataset(rows={self.n_rows}, version={self.version[:12]})"
@@ -0,0 +1,491 @@
+"""
+Dashboard Figures / Figures du Tableau de Bord
+Plotly figure builders and a bounded cache of their serialized specs.
+"""
+
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+import perf
+from payload import compact_json
+from translations import INDICATOR_LABELS
+
+# Selections larger than this are drawn as small multiples instead of one overlay
+OVERLAY_MAX_COUNTRIES = 8
+SMALL_MULTIPLES_COLS = 4
+
+
+# Figure builders - `label` maps a translation key to text in the current language
+
+def gauges_figure(data, label):
+    """Screening, detection, treatment and survival gauges for one record"""
+    from plotly.subplots import make_subplots  # only needed on a cache miss
+
+    fig = make_subplots(
+        rows=1, cols=4,
+        subplot_titles=(label('screening'), label('detection'), label('treatment'), label('survival')),
+        specs=[[{'type': 'indicator'}, {'type': 'indicator'},
+               {'type': 'indicator'}, {'type': 'indicator'}]]
+    )
+
+    # Screening
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=data['Screening_Coverage_%'],
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#4169E1"},
+            'steps': [
+                {'range': [0, 70], 'color': "lightgray"},
+                {'range': [70, 100], 'color': "lightgreen"}
+            ],
+            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 70}
+        }
+    ), row=1, col=1)
+
+    # Detection
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=data['Early_Detection_Rate_%'],
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#32CD32"},
+            'steps': [
+                {'range': [0, 60], 'color': "lightgray"},
+                {'range': [60, 100], 'color': "lightgreen"}
+            ],
+            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 60}
+        }
+    ), row=1, col=2)
+
+    # Treatment
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=data['Treatment_Coverage_%'],
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#FF8C00"},
+            'steps': [
+                {'range': [0, 90], 'color': "lightgray"},
+                {'range': [90, 100], 'color': "lightgreen"}
+            ],
+            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 90}
+        }
+    ), row=1, col=3)
+
+    # Survival
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=data['Five_Year_Survival_%'],
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#FF1493"},
+            'steps': [
+                {'range': [0, 70], 'color': "lightgray"},
+                {'range': [70, 100], 'color': "lightgreen"}
+            ],
+            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 70}
+        }
+    ), row=1, col=4)
+
+    fig.update_layout(height=300, showlegend=False)
+    return fig
+
+
+def _rgba(color, alpha):
+    red, green, blue = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({red}, {green}, {blue}, {alpha})"
+
+
+def _add_projection(fig, projection, column, color, row, col, label):
+    """Dashed projected trend of one indicator over a shaded prediction interval"""
+    fit = projection['fit'][column]
+    if fit.isna().all():
+        return
+    years = projection.index
+    first = not any(trace.legendgroup == 'projection' for trace in fig.data)
+    fig.add_trace(go.Scatter(
+        x=years, y=projection['upper'][column], mode='lines', line=dict(width=0),
+        legendgroup='projection', showlegend=False, hoverinfo='skip'
+    ), row=row, col=col)
+    fig.add_trace(go.Scatter(
+        x=years, y=projection['lower'][column], mode='lines', line=dict(width=0),
+        fill='tonexty', fillcolor=_rgba(color, 0.15), legendgroup='projection',
+        name=label('prediction_interval'), showlegend=first, hoverinfo='skip'
+    ), row=row, col=col)
+    fig.add_trace(go.Scatter(
+        x=years, y=fit, mode='lines', line=dict(color=color, width=2, dash='dash'),
+        legendgroup='projection', name=label('projection'), showlegend=first
+    ), row=row, col=col)
+
+
+def trends_figure(country_data, country, label, projection=None):
+    """2x2 indicator evolution for one country (rows sorted by year)
+
+    `projection` (Dataset.projection_for) adds each indicator's projected
+    trend to 2030 as a dashed line over its prediction interval.
+    """
+    from plotly.subplots import make_subplots
+
+    fig_trends = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(label('incidence_mortality'), label('screening_coverage'),
+                      label('survival_rate'), label('mi_ratio')),
+        vertical_spacing=0.2,
+        horizontal_spacing=0.1
+    )
+
+    # Incidence & Mortality
+    fig_trends.add_trace(go.Scatter(
+        x=country_data['Year'], y=country_data['Incidence_Rate_ASR'],
+        name=label('incidence_rate'), line=dict(color='#FF1493', width=2),
+        mode='lines+markers'
+    ), row=1, col=1)
+
+    fig_trends.add_trace(go.Scatter(
+        x=country_data['Year'], y=country_data['Mortality_Rate_ASR'],
+        name=label('mortality_rate'), line=dict(color='#DC143C', width=2),
+        mode='lines+markers'
+    ), row=1, col=1)
+
+    # Screening
+    fig_trends.add_trace(go.Scatter(
+        x=country_data['Year'], y=country_data['Screening_Coverage_%'],
+        name=label('screening'), line=dict(color='#4169E1', width=3),
+        fill='tozeroy', mode='lines+markers'
+    ), row=1, col=2)
+    fig_trends.add_hline(y=70, line_dash="dash", line_color="green",
+                        annotation_text=label('objective'), row=1, col=2)
+
+    # Survival
+    fig_trends.add_trace(go.Scatter(
+        x=country_data['Year'], y=country_data['Five_Year_Survival_%'],
+        name=label('survival'), line=dict(color='#FF69B4', width=3),
+        fill='tozeroy', mode='lines+markers'
+    ), row=2, col=1)
+    fig_trends.add_hline(y=70, line_dash="dash", line_color="green",
+                        annotation_text=label('objective'), row=2, col=1)
+
+    # MI Ratio
+    fig_trends.add_trace(go.Scatter(
+        x=country_data['Year'], y=country_data['MI_Ratio'],
+        name=label('mi_ratio'), line=dict(color='#FFB6C1', width=3),
+        fill='tozeroy', mode='lines+markers'
+    ), row=2, col=2)
+    fig_trends.add_hline(y=30, line_dash="dash", line_color="green",
+                        annotation_text=label('objective'), row=2, col=2)
+    fig_trends.add_hline(y=50, line_dash="dash", line_color="orange",
+                        annotation_text=label('critical_threshold'), row=2, col=2)
+
+    # Projections to 2030
+    if projection is not None:
+        for column, color, row, col in [('Incidence_Rate_ASR', '#FF1493', 1, 1),
+                                        ('Mortality_Rate_ASR', '#DC143C', 1, 1),
+                                        ('Screening_Coverage_%', '#4169E1', 1, 2),
+                                        ('Five_Year_Survival_%', '#FF69B4', 2, 1),
+                                        ('MI_Ratio', '#FFB6C1', 2, 2)]:
+            _add_projection(fig_trends, projection, column, color, row, col, label)
+
+    fig_trends.update_xaxes(title_text=label('year'))
+    fig_trends.update_yaxes(title_text=label('rate_per_100k'), row=1, col=1)
+    fig_trends.update_yaxes(title_text=label('coverage_pct'), row=1, col=2)
+    fig_trends.update_yaxes(title_text=label('survival_pct'), row=2, col=1)
+    fig_trends.update_yaxes(title_text=label('mi_ratio_pct'), row=2, col=2)
+
+    fig_trends.update_layout(height=600, showlegend=True, title_text=f"{label('trend_title')} - {country}")
+    return fig_trends
+
+
+def comparison_figure(data, global_avg, country, label, region_avg=None, weighted=False):
+    """Key coverage and survival metrics vs the global (and regional) average"""
+    metrics = ['Five_Year_Survival_%', 'Screening_Coverage_%', 'Early_Detection_Rate_%', 'Treatment_Coverage_%']
+    names = [label('survival_rate'), label('screening_coverage'), label('early_detection'),
+             label('treatment_coverage')]
+    bars = [
+        go.Bar(name=country, x=names, y=[data[col] for col in metrics], marker_color='#FF1493'),
+        go.Bar(name=label('global_weighted_average' if weighted else 'global_average'), x=names,
+               y=[global_avg[col] for col in metrics], marker_color='#4169E1'),
+    ]
+    if region_avg is not None:
+        bars.append(go.Bar(name=f"{label('region_average')} ({data['Region']})", x=names,
+                           y=[region_avg[col] for col in metrics], marker_color='#9370DB'))
+    fig_comp = go.Figure(data=bars)
+
+    fig_comp.update_layout(
+        title=label('key_metrics_vs_global'),
+        yaxis_title=label('percentage'),
+        barmode='group',
+        height=400
+    )
+    return fig_comp
+
+
+def _group_figure(stats, label, title, height=400):
+    """Mean survival and screening per group (rows of `stats`)"""
+    fig = go.Figure(data=[
+        go.Bar(name=label('survival_rate'), x=stats.index, y=stats['Five_Year_Survival_%'],
+              marker_color='#FF1493'),
+        go.Bar(name=label('screening_coverage'), x=stats.index, y=stats['Screening_Coverage_%'],
+              marker_color='#4169E1')
+    ])
+
+    fig.update_layout(
+        title=title,
+        yaxis_title=label('percentage'),
+        barmode='group',
+        height=height
+    )
+    return fig
+
+
+def hdi_figure(hdi_stats, label):
+    """Mean survival and screening by HDI category"""
+    return _group_figure(hdi_stats, label, label('health_metrics_hdi'))
+
+
+def region_figure(region_stats, label):
+    """Mean survival and screening by region"""
+    fig = _group_figure(region_stats, label, label('health_metrics_region'), height=450)
+    fig.update_xaxes(tickangle=-35)
+    return fig
+
+
+def overlay_figure(matrix, indicator, label, target=None):
+    """One line per country of a Year x Country matrix"""
+    fig = go.Figure()
+    for country in matrix.columns:
+        fig.add_trace(go.Scatter(x=matrix.index, y=matrix[country], name=country, mode='lines+markers'))
+    if target is not None:
+        fig.add_hline(y=target, line_dash="dash", line_color="green", annotation_text=label('objective'))
+
+    fig.update_layout(
+        title=label(INDICATOR_LABELS[indicator]),
+        xaxis_title=label('year'),
+        hovermode='x unified',
+        height=500
+    )
+    return fig
+
+
+def small_multiples_figure(matrix, indicator, label, target=None, cols=SMALL_MULTIPLES_COLS):
+    """One panel per country of a Year x Country matrix, on shared axes
+
+    Each panel also shows the median of the whole selection for reference.
+    """
+    from plotly.subplots import make_subplots
+
+    countries = list(matrix.columns)
+    rows = math.ceil(len(countries) / cols)
+    fig = make_subplots(
+        rows=rows, cols=cols,
+        subplot_titles=countries,
+        shared_xaxes=True, shared_yaxes=True,
+        vertical_spacing=min(0.08, 0.5 / rows),
+        horizontal_spacing=0.03
+    )
+
+    median = matrix.median(axis=1)
+    for i, country in enumerate(countries):
+        row, col = divmod(i, cols)
+        fig.add_trace(go.Scatter(
+            x=matrix.index, y=median, name=label('selection_median'), legendgroup='median',
+            showlegend=i == 0, line=dict(color='lightgray', width=2, dash='dot'), hoverinfo='skip'
+        ), row=row + 1, col=col + 1)
+        fig.add_trace(go.Scatter(
+            x=matrix.index, y=matrix[country], name=country, showlegend=False,
+            line=dict(color='#FF1493', width=2), mode='lines'
+        ), row=row + 1, col=col + 1)
+        if target is not None:
+            fig.add_hline(y=target, line_dash="dash", line_color="green", line_width=1,
+                          row=row + 1, col=col + 1)
+
+    fig.update_annotations(font_size=11)
+    fig.update_layout(
+        title=label(INDICATOR_LABELS[indicator]),
+        height=max(300, 170 * rows),
+        margin=dict(t=80)
+    )
+    return fig
+
+
+def _compact(values):
+    """JSON-ready list: NaN as null, whole numbers without a trailing .0"""
+    return [None if v != v else int(v) if v.is_integer() else v for v in values.tolist()]
+
+
+def choropleth_figure(values, codes, indicator, label):
+    """World map of one indicator with one animation frame per year
+
+    `values` is Year x Country, `codes` the countries' ISO-3 codes. Codes,
+    names and styling are sent once in the base trace; a frame carries only
+    its year's values, and the colour range is fixed across years. The slider
+    and play button switch frames in the browser, without a rerun.
+    """
+    years = [int(year) for year in values.index]
+    grid = values.to_numpy(dtype=float)
+    frames = [_compact(row) for row in grid]
+    finite = grid[np.isfinite(grid)]
+    title = label(INDICATOR_LABELS[indicator])
+
+    fig = go.Figure(
+        data=[go.Choropleth(
+            locations=codes, z=frames[-1], text=list(values.columns),
+            zmin=float(finite.min()) if len(finite) else None,
+            zmax=float(finite.max()) if len(finite) else None,
+            colorscale='RdPu', marker_line_color='white', marker_line_width=0.5,
+            colorbar_title_text='', hovertemplate='%{text}<br>%{z}<extra></extra>'
+        )],
+        frames=[go.Frame(name=str(year), data=[go.Choropleth(z=z)], traces=[0])
+                for year, z in zip(years, frames)]
+    )
+
+    still = {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}, 'transition': {'duration': 0}}
+    fig.update_layout(
+        title=title,
+        geo=dict(showframe=False, showcoastlines=False, showland=True, landcolor='lightgray',
+                 projection_type='natural earth'),
+        sliders=[dict(
+            active=len(years) - 1,
+            currentvalue={'prefix': f"{label('year')}: "},
+            pad={'t': 30},
+            steps=[dict(method='animate', label=str(year), args=[[str(year)], still]) for year in years]
+        )],
+        updatemenus=[dict(
+            type='buttons', direction='left', x=0, y=0, xanchor='right', yanchor='top', pad={'t': 40, 'r': 10},
+            buttons=[
+                dict(label='▶', method='animate',
+                     args=[None, {'frame': {'duration': 600, 'redraw': True}, 'fromcurrent': True,
+                                  'transition': {'duration': 0}}]),
+                dict(label='⏸', method='animate', args=[[None], still]),
+            ]
+        )],
+        height=550,
+        margin=dict(l=0, r=0, t=50, b=0)
+    )
+    return fig
+
+
+def show_year(fig, year):
+    """Start a choropleth_figure() at `year` (its slider step and first frame drawn)"""
+    names = [frame.name for frame in fig.frames]
+    if str(year) in names:
+        i = names.index(str(year))
+        fig.data[0].z = fig.frames[i].data[0].z
+        fig.layout.sliders[0].active = i
+    return fig
+
+
+class FigureCache:
+    """LRU cache of serialized figure specs, keyed by (chart, country, year, lang, ...)
+
+    `country` may also be a tuple of countries, for charts of a selection.
+
+    Specs are compacted (payload.py) and stored as JSON text, which is
+    immutable and safe to share across sessions. A hit rebuilds the Figure
+    without plotly's property validation, the slowest part of building it
+    from scratch. The cache is bounded by entry count and by total spec size.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._specs = OrderedDict()  # key -> (spec, bytes before compaction)
+        self._bytes = 0
+        self._raw_bytes = 0
+        self._lock = threading.Lock()
+
+    def figure(self, key, build):
+        """Cached figure for `key`, calling `build()` only on a miss
+
+        Recorded as span 'figure:<chart>' with the cache outcome, the spec
+        size and its size before compaction (raw_bytes).
+        """
+        with perf.span(f'figure:{key[0]}') as record:
+            with self._lock:
+                entry = self._specs.get(key)
+                if entry is not None:
+                    self._specs.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            record['cache'] = 'miss' if entry is None else 'hit'
+            if entry is None:
+                entry = compact_json(build())
+                self._store(key, entry)
+            spec, raw_bytes = entry
+            record['bytes'] = len(spec)
+            record['raw_bytes'] = raw_bytes
+            return go.Figure(json.loads(spec), _validate=False)
+
+    def _store(self, key, entry):
+        with self._lock:
+            previous = self._specs.pop(key, None)
+            if previous is not None:
+                self._forget(previous)
+            self._specs[key] = entry
+            self._bytes += len(entry[0])
+            self._raw_bytes += entry[1]
+            while self._specs and (len(self._specs) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._specs.popitem(last=False)
+                self._forget(evicted)
+                self.evictions += 1
+
+    def _forget(self, entry):
+        self._bytes -= len(entry[0])
+        self._raw_bytes -= entry[1]
+
+    def invalidate(self, countries=(), years=()):
+        """Drop the specs built from changed data; returns how many were dropped
+
+        A chart keyed by a year depends on every country that year (averages,
+        ranks); one without a year depends on every year of its countries,
+        and one keyed by neither (the world map) on everything.
+        """
+        countries = set(countries)
+        years = set(years)
+
+        def stale_key(key):
+            if key[1] is None and key[2] is None:
+                return bool(countries or years)
+            if key[2] is not None:
+                return key[2] in years
+            keyed = key[1] if isinstance(key[1], tuple) else (key[1],)
+            return not countries.isdisjoint(keyed)
+
+        with self._lock:
+            stale = [key for key in self._specs if stale_key(key)]
+            for key in stale:
+                self._forget(self._specs.pop(key))
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self._bytes = 0
+            self._raw_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._specs),
+                'bytes': self._bytes,
+                'raw_bytes': self._raw_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
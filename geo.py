@@ -0,0 +1,36 @@
+"""
+Country Codes / Codes Pays
+ISO 3166-1 alpha-3 codes placing the dataset's countries on plotly's built-in world map.
+"""
+
+ISO3 = {
+    'Afghanistan': 'AFG', 'Algeria': 'DZA', 'Angola': 'AGO', 'Argentina': 'ARG',
+    'Australia': 'AUS', 'Austria': 'AUT', 'Bangladesh': 'BGD', 'Belgium': 'BEL',
+    'Benin': 'BEN', 'Brazil': 'BRA', 'Burkina Faso': 'BFA', 'Cameroon': 'CMR',
+    'Canada': 'CAN', 'Chad': 'TCD', 'Chile': 'CHL', 'China': 'CHN',
+    'Colombia': 'COL', 'Czech Republic': 'CZE', "Côte d'Ivoire": 'CIV', 'Denmark': 'DNK',
+    'Ecuador': 'ECU', 'Egypt': 'EGY', 'Ethiopia': 'ETH', 'Fiji': 'FJI',
+    'Finland': 'FIN', 'France': 'FRA', 'Germany': 'DEU', 'Ghana': 'GHA',
+    'Greece': 'GRC', 'Guinea': 'GIN', 'Hungary': 'HUN', 'India': 'IND',
+    'Indonesia': 'IDN', 'Iran': 'IRN', 'Iraq': 'IRQ', 'Ireland': 'IRL',
+    'Israel': 'ISR', 'Italy': 'ITA', 'Japan': 'JPN', 'Jordan': 'JOR',
+    'Kazakhstan': 'KAZ', 'Kenya': 'KEN', 'Lebanon': 'LBN', 'Libya': 'LBY',
+    'Madagascar': 'MDG', 'Malaysia': 'MYS', 'Mali': 'MLI', 'Mexico': 'MEX',
+    'Morocco': 'MAR', 'Mozambique': 'MOZ', 'Myanmar': 'MMR', 'Nepal': 'NPL',
+    'Netherlands': 'NLD', 'New Zealand': 'NZL', 'Niger': 'NER', 'Nigeria': 'NGA',
+    'Norway': 'NOR', 'Pakistan': 'PAK', 'Papua New Guinea': 'PNG', 'Peru': 'PER',
+    'Philippines': 'PHL', 'Poland': 'POL', 'Portugal': 'PRT', 'Romania': 'ROU',
+    'Russia': 'RUS', 'Saudi Arabia': 'SAU', 'Senegal': 'SEN', 'Singapore': 'SGP',
+    'South Africa': 'ZAF', 'South Korea': 'KOR', 'Spain': 'ESP', 'Sri Lanka': 'LKA',
+    'Sudan': 'SDN', 'Sweden': 'SWE', 'Switzerland': 'CHE', 'Tanzania': 'TZA',
+    'Thailand': 'THA', 'Tunisia': 'TUN', 'Turkey': 'TUR', 'Uganda': 'UGA',
+    'Ukraine': 'UKR', 'United Arab Emirates': 'ARE', 'United Kingdom': 'GBR', 'United States': 'USA',
+    'Uzbekistan': 'UZB', 'Venezuela': 'VEN', 'Vietnam': 'VNM', 'Yemen': 'YEM',
+    'Zambia': 'ZMB', 'Zimbabwe': 'ZWE',
+}
+
+
+def mapped(countries):
+    """(countries, ISO-3 codes) for those of `countries` that have a code"""
+    known = [country for country in countries if country in ISO3]
+    return known, [ISO3[country] for country in known]
@@ -0,0 +1,336 @@
+"""
+Streaming Ingestion / Ingestion en Flux
+Reduces a CSV of any length to one row per (Country, Year) in fixed-size chunks.
+
+Sub-national or monthly extracts hold many rows per country and year; only the
+chunk being parsed, the running per-(Country, Year) totals and an 8-byte hash
+per distinct source row (to drop exact repeats) are ever in memory, so peak
+memory grows far slower than the file.
+
+Usage: python ingest.py [csv_path] [--chunksize ROWS]
+"""
+
+import argparse
+import hashlib
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bundle import CATEGORY_COLUMNS, CSV_DTYPES, CSV_PATH, INDICATOR_COLUMNS
+
+DEFAULT_CHUNKSIZE = 250_000
+KEYS = ['Country', 'Year']
+
+# How the rows of one country-year (sub-units or periods of an extract) are
+# reduced to one. With a single row per country-year every value is kept as is.
+# - a row repeating an earlier one exactly is dropped;
+# - cases, deaths and population add up across the remaining rows; an extract
+#   with a PERIOD_COLUMN (e.g. months) repeats the whole population in every
+#   period, so its population is divided by the number of periods;
+# - rates and percentages are averaged weighted by population (unweighted
+#   where no row has one), and MI_Ratio is recomputed from the reduced
+#   mortality and incidence.
+SUM_COLUMNS = ['New_Cases', 'Deaths']
+WEIGHT_COLUMN = 'Population_Millions'
+PERIOD_COLUMN = 'Period'
+MEAN_COLUMNS = [col for col in INDICATOR_COLUMNS if col not in SUM_COLUMNS]
+WEIGHTED_COLUMNS = [col for col in MEAN_COLUMNS if col != WEIGHT_COLUMN]
+
+# Per-pair bookkeeping besides the sums: distinct source rows and periods
+ROW_COLUMNS = ['rows', 'periods']
+
+# Categories are read as plain strings (they differ from chunk to chunk);
+# numbers are parsed leniently, as float64, so a blank or malformed cell
+# becomes NaN for the validator to report instead of failing the load
+CHUNK_DTYPES = {col: 'str' for col in CATEGORY_COLUMNS}
+NUMERIC_COLUMNS = [col for col, dtype in CSV_DTYPES.items() if dtype != 'category']
+
+
+class _HashingReader:
+    """Binary file wrapper that hashes everything read through it"""
+
+    def __init__(self, f, digest=None):
+        self._f = f
+        self.digest = digest or hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.digest.update(data)
+        return data
+
+    def __iter__(self):
+        return iter(self.read, b'')
+
+
+class RowHashes:
+    """Hashes of the distinct rows and (Country, Year, period) keys read so far
+
+    Each is a sorted uint64 array grown a chunk at a time. Kept with the
+    bundle, it lets appended rows be checked against every earlier one.
+    """
+
+    def __init__(self, rows=None, periods=None):
+        self.rows = np.zeros(0, dtype=np.uint64) if rows is None else np.asarray(rows, dtype=np.uint64)
+        self.periods = np.zeros(0, dtype=np.uint64) if periods is None else np.asarray(periods, dtype=np.uint64)
+
+    def arrays(self):
+        return {'rows': self.rows, 'periods': self.periods}
+
+    def distinct(self, chunk):
+        """Mask of the chunk's rows that repeat no earlier row (Region and HDI aside)"""
+        values = chunk.drop(columns=['Region', 'HDI_Category'])
+        new, self.rows = _first_seen(self.rows, pd.util.hash_pandas_object(values, index=False).to_numpy())
+        return new
+
+    def new_periods(self, chunk):
+        """Mask of the rows opening a period of their country-year (the first row without a PERIOD_COLUMN)"""
+        keys = chunk[KEYS]
+        if PERIOD_COLUMN in chunk.columns:
+            keys = keys.assign(**{PERIOD_COLUMN: chunk[PERIOD_COLUMN].astype(str)})
+        new, self.periods = _first_seen(self.periods, pd.util.hash_pandas_object(keys, index=False).to_numpy())
+        return new
+
+
+def _first_seen(known, hashes):
+    """(mask of `hashes` neither in sorted `known` nor earlier in `hashes`, the grown `known`)"""
+    unique, first = np.unique(hashes, return_index=True)
+    positions = np.searchsorted(known, unique)
+    found = positions < len(known)
+    found[found] = known[positions[found]] == unique[found]
+    new = np.zeros(len(hashes), dtype=bool)
+    new[first[~found]] = True
+    return new, np.insert(known, positions[~found], unique[~found])
+
+
+def _numeric(chunk):
+    """(chunk with float64 numeric columns, {column: raw text of the cells that are not numbers})"""
+    unparsed = {}
+    numbers = {}
+    for col in NUMERIC_COLUMNS:
+        raw = chunk[col]
+        if raw.dtype.kind not in 'iuf':
+            numbers[col] = pd.to_numeric(raw, errors='coerce')
+            bad = numbers[col].isna() & raw.notna()
+            if bad.any():
+                unparsed[col] = raw[bad]
+        numbers[col] = numbers.get(col, raw).astype(np.float64)
+    return chunk.assign(**numbers), unparsed
+
+
+def _reduce_chunk(chunk, hashes):
+    """(Country, Year)-indexed partial totals of the distinct rows of one chunk"""
+    values = chunk[INDICATOR_COLUMNS]
+    present = values.notna()
+    population = chunk[WEIGHT_COLUMN]
+    parts = pd.concat({
+        'sum': values,
+        'count': present.astype(np.int64),
+        # NaN unless both the value and the population are there
+        'weighted': values[WEIGHTED_COLUMNS].mul(population, axis=0),
+        'weight': present[WEIGHTED_COLUMNS].mul(population, axis=0),
+        'row': pd.DataFrame({'rows': 1, 'periods': hashes.new_periods(chunk).astype(np.int64)},
+                            index=chunk.index),
+    }, axis=1)
+    return parts.groupby([chunk['Country'], chunk['Year']], sort=False).sum()
+
+
+def combine(totals, other):
+    """Add two sets of running totals (either may be None)"""
+    if totals is None or other is None:
+        return other if totals is None else totals
+    return pd.concat([totals, other]).groupby(level=[0, 1], sort=False).sum()
+
+
+def reduce_rows(reader, chunksize=DEFAULT_CHUNKSIZE, validator=None, hashes=None, **read_csv):
+    """Running totals of a CSV stream: (totals, attributes, rows read)
+
+    totals has a (Country, Year) index and ('sum' | 'count' | 'weighted' |
+    'weight' | 'row', column) columns, or is None without rows; attributes
+    maps each country to the (Region, HDI_Category) of its first row. Rows
+    without a Country or Year cannot be placed and are left out. A
+    `validator` (validate.py) sees every chunk before it is folded in;
+    `hashes` (RowHashes) holds the rows already read, and grows.
+    """
+    hashes = RowHashes() if hashes is None else hashes
+    totals = None
+    attributes = {}
+    rows = 0
+    try:
+        chunks = pd.read_csv(reader, dtype=CHUNK_DTYPES, chunksize=chunksize, **read_csv)
+    except pd.errors.EmptyDataError:
+        return None, attributes, rows
+    for chunk in chunks:
+        chunk, unparsed = _numeric(chunk)
+        placed = (chunk['Country'].notna() & chunk['Year'].notna()).to_numpy()
+        keyed = chunk[placed].astype({'Year': np.int64})
+        distinct = hashes.distinct(keyed)
+        if validator is not None:
+            repeated = np.zeros(len(chunk), dtype=bool)
+            repeated[np.flatnonzero(placed)[~distinct]] = True
+            validator.add(chunk, repeated, unparsed)
+        totals = combine(totals, _reduce_chunk(keyed[distinct], hashes))
+        first = keyed.drop_duplicates('Country')
+        for country, region, hdi in zip(first['Country'], first['Region'], first['HDI_Category']):
+            attributes.setdefault(country, (region, hdi))
+        rows += len(chunk)
+    return totals, attributes, rows
+
+
+def totals_of(frame, counts):
+    """Running totals and attributes back from a reduced frame and its counts"""
+    index = pd.MultiIndex.from_arrays(
+        [frame['Country'].astype(str).to_numpy(), frame['Year'].to_numpy(dtype=np.int64)], names=KEYS)
+    parts = {}
+    for col in INDICATOR_COLUMNS:
+        values = frame[col].to_numpy(dtype=float)
+        n = counts[col].to_numpy()
+        parts[('count', col)] = n.astype(np.int64)
+        if col in SUM_COLUMNS:
+            parts[('sum', col)] = np.where(n > 0, values, 0.0)
+            continue
+        scale = counts['periods'].to_numpy() if col == WEIGHT_COLUMN else n
+        parts[('sum', col)] = np.where(n > 0, values * scale, 0.0)
+        if col in WEIGHTED_COLUMNS:
+            weight = counts[f'weight:{col}'].to_numpy()
+            parts[('weighted', col)] = np.where(weight > 0, values * weight, 0.0)
+            parts[('weight', col)] = weight
+    for col in ROW_COLUMNS:
+        parts[('row', col)] = counts[col].to_numpy(dtype=np.int64)
+    totals = pd.DataFrame(parts, index=index)
+    first = frame.drop_duplicates('Country')
+    attributes = {str(c): (str(r), str(h))
+                  for c, r, h in zip(first['Country'], first['Region'], first['HDI_Category'])}
+    return totals, attributes
+
+
+def _reduced(totals):
+    """{indicator: one value per pair} from running totals (see the rules above)"""
+    single = totals[('row', 'rows')].to_numpy() == 1
+    values = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for col in INDICATOR_COLUMNS:
+            sums = totals[('sum', col)].to_numpy()
+            n = totals[('count', col)].to_numpy()
+            if col in SUM_COLUMNS:
+                values[col] = np.where(n > 0, sums, np.nan)
+                continue
+            if col == WEIGHT_COLUMN:
+                values[col] = np.where(n > 0, sums / totals[('row', 'periods')].to_numpy(), np.nan)
+                continue
+            mean = sums / n
+            if col in WEIGHTED_COLUMNS:
+                # A single row keeps the plain mean: it returns that row's value exactly
+                weight = totals[('weight', col)].to_numpy()
+                weighted = ~single & (weight > 0)
+                mean = np.where(weighted, totals[('weighted', col)].to_numpy() / weight, mean)
+            values[col] = mean
+        # Several rows: the ratio of the reduced rates, not the mean of the ratios
+        ratio = values['Mortality_Rate_ASR'] / values['Incidence_Rate_ASR'] * 100
+        recompute = ~single & np.isfinite(ratio)
+        values['MI_Ratio'] = np.where(recompute, ratio, values['MI_Ratio'])
+    return values
+
+
+def country_years(totals, attributes):
+    """(frame, counts) from running totals: one row per (Country, Year), sorted
+
+    counts holds, per pair, the distinct source rows and periods and, per
+    indicator, the rows (and population) behind the value; keeping it lets
+    later rows be folded in exactly (see refresh.py). Cases and deaths stay
+    float64, NaN where missing, unless every pair has them.
+    """
+    columns = ['Country', 'Region', 'HDI_Category', 'Year'] + INDICATOR_COLUMNS
+    count_columns = INDICATOR_COLUMNS + [f'weight:{col}' for col in WEIGHTED_COLUMNS] + ROW_COLUMNS
+    if totals is None:
+        frame = pd.DataFrame({col: pd.Series(dtype=CSV_DTYPES[col]) for col in columns})
+        return frame, pd.DataFrame({col: pd.Series(dtype=np.float64) for col in count_columns})
+
+    totals = totals.sort_index()
+    codes, countries = pd.factorize(totals.index.get_level_values('Country'))
+    frame = pd.DataFrame({
+        'Country': countries.to_numpy()[codes],
+        'Region': np.array([attributes[c][0] for c in countries], dtype=object)[codes],
+        'HDI_Category': np.array([attributes[c][1] for c in countries], dtype=object)[codes],
+        'Year': totals.index.get_level_values('Year'),
+    })
+    for col, values in _reduced(totals).items():
+        frame[col] = np.round(values) if col in SUM_COLUMNS else values
+    for col in CATEGORY_COLUMNS:
+        frame[col] = frame[col].astype('category')
+    # Narrow the integer columns only when nothing is missing
+    integers = {col: dtype for col, dtype in CSV_DTYPES.items()
+                if dtype == 'int64' and frame[col].notna().all()}
+    frame = frame.astype(integers)
+    counts = pd.DataFrame({
+        **{col: totals[('count', col)].to_numpy(dtype=float) for col in INDICATOR_COLUMNS},
+        **{f'weight:{col}': totals[('weight', col)].to_numpy(dtype=float) for col in WEIGHTED_COLUMNS},
+        **{col: totals[('row', col)].to_numpy(dtype=float) for col in ROW_COLUMNS},
+    })
+    return frame, counts
+
+
+def stream_country_years(csv_path=CSV_PATH, chunksize=DEFAULT_CHUNKSIZE, validator=None, hashes=None):
+    """Stream the CSV into a (Country, Year)-sorted frame, one row per pair
+
+    Returns (frame, counts, info) where info holds the raw row count, the
+    header and the file's sha256, gathered in the same single pass. Region
+    and HDI category are taken from each country's first row. Pass
+    `hashes` (an empty RowHashes) to keep the distinct rows' hashes.
+    """
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    with open(csv_path, 'rb') as f:
+        reader = _HashingReader(f)
+        totals, attributes, rows = reduce_rows(reader, chunksize, validator, hashes)
+        # Hash whatever the parser did not need to read
+        for _ in reader:
+            pass
+    frame, counts = country_years(totals, attributes)
+    return frame, counts, {'source_rows': rows, 'header': header, 'sha256': reader.digest.hexdigest()}
+
+
+def stream_appended(csv_path, offset, prefix_sha256, names, chunksize=DEFAULT_CHUNKSIZE, validator=None,
+                    hashes=None):
+    """Totals of only the rows after byte `offset`, if the file merely grew
+
+    Returns (totals, attributes, info) like reduce_rows() plus the whole
+    file's sha256, or None when the first `offset` bytes no longer hash to
+    `prefix_sha256` or do not end a line - then the file was rewritten.
+    `hashes` holds the earlier rows, so repeats of them are dropped too.
+    """
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        remaining = offset
+        last = b''
+        while remaining:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+                return None
+            digest.update(block)
+            last = block[-1:]
+            remaining -= len(block)
+        if digest.hexdigest() != prefix_sha256 or last != b'\n':
+            return None
+
+        reader = _HashingReader(f, digest)
+        totals, attributes, rows = reduce_rows(reader, chunksize, validator, hashes, header=None, names=names)
+        for _ in reader:
+            pass
+    return totals, attributes, {'source_rows': rows, 'header': list(names), 'sha256': digest.hexdigest()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream a CSV down to one row per country and year")
+    parser.add_argument('csv', nargs='?', default=CSV_PATH)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, metavar='ROWS')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    frame, _, info = stream_country_years(args.csv, args.chunksize)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{info['source_rows']:,} rows in chunks of {args.chunksize:,} -> {len(frame):,} country-years "
+          f"in {elapsed:.1f} s, peak RSS {peak:.0f} MB", file=sys.stderr)
@@ -0,0 +1,94 @@
+"""
+Year x Country Matrix / Matrice Année x Pays
+Every indicator as a dense year-by-country block, built once at load.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bundle import INDICATOR_COLUMNS
+
+# Per-country labels kept beside the matrix, taken from each country's latest year
+GROUP_COLUMNS = ['Region', 'HDI_Category']
+
+
+def grid_positions(df, countries, years):
+    """(country position, year position) of every row of `df` on the countries x years grid"""
+    country = df['Country'].array
+    codes = np.asarray(country.codes)
+    lookup = np.full(len(country.categories), -1)
+    lookup[pd.Index(country.categories).get_indexer(countries)] = np.arange(len(countries))
+    return lookup[codes], np.searchsorted(years, df['Year'].to_numpy())
+
+
+class YearCountryMatrix:
+    """Indicator values on a full (country, year) grid, NaN where a record is missing
+
+    `values` has shape (indicators, countries, years): each country's series
+    is one contiguous row, so one country is a view and any selection a
+    single gather of whole rows - no per-country filter pass over the table.
+    frame() hands it out Year x Country, the way the charts plot it, and
+    groups() each country's region and HDI category.
+    """
+
+    def __init__(self, df, countries, years):
+        rows, cols = grid_positions(df, countries, years)
+        values = np.full((len(INDICATOR_COLUMNS), len(countries), len(years)), np.nan)
+        values[:, rows, cols] = df[INDICATOR_COLUMNS].to_numpy(dtype=float).T
+
+        # Each country's latest row: the last of its run when sorted by (country, year)
+        order = np.lexsort((cols, rows))
+        latest = order[np.r_[rows[order][1:] != rows[order][:-1], True]]
+        groups = {col: df[col].array.codes[latest] for col in GROUP_COLUMNS}
+        categories = {col: df[col].array.categories for col in GROUP_COLUMNS}
+        self._setup(values, countries, years, groups, categories)
+
+    @classmethod
+    def from_arrays(cls, arrays, countries, years, categories):
+        """Rebuild from arrays() output (e.g. memory maps) without copying
+
+        `categories` holds the Region and HDI_Category labels their codes refer to.
+        """
+        matrix = cls.__new__(cls)
+        groups = {col: arrays[col] for col in GROUP_COLUMNS}
+        matrix._setup(arrays['values'], countries, years, groups, categories)
+        return matrix
+
+    def arrays(self):
+        return {'values': self.values, **self._group_codes}
+
+    def _setup(self, values, countries, years, groups, categories):
+        self.values = values
+        self.values.setflags(write=False)
+        self._group_codes = groups
+        self.countries = tuple(countries)
+        self.years = pd.Index(years, name='Year')
+        self._positions = {name: i for i, name in enumerate(self.countries)}
+        self._indicators = {col: i for i, col in enumerate(INDICATOR_COLUMNS)}
+        self._groups = pd.DataFrame({
+            col: pd.Categorical.from_codes(groups[col], categories=categories[col]) for col in GROUP_COLUMNS
+        }, index=pd.Index(self.countries, name='Country'))
+
+    def frame(self, indicator, countries=None):
+        """Year x Country values of one indicator, for `countries` (default all)
+
+        Unknown and repeated countries are skipped; the rest keep the order given.
+        """
+        block = self.values[self._indicators[indicator]]
+        if countries is None:
+            return pd.DataFrame(block.T, index=self.years, columns=list(self.countries), copy=False)
+        known = [name for name in dict.fromkeys(countries) if name in self._positions]
+        rows = [self._positions[name] for name in known]
+        return pd.DataFrame(block[rows].T, index=self.years, columns=known, copy=False)
+
+    def groups(self):
+        """Country x (Region, HDI_Category) labels, from each country's latest year"""
+        return self._groups
+
+    def series(self, indicator, country):
+        """One country's values by year (a view), or None if unknown"""
+        position = self._positions.get(country)
+        if position is None:
+            return None
+        return pd.Series(self.values[self._indicators[indicator], position], index=self.years,
+                         name=country, copy=False)
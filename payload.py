@@ -0,0 +1,267 @@
+"""
+Chart Payload Compaction / Compaction des Graphiques
+Shrinks figure specs before they are cached and sent to browsers.
+
+Passes over the spec plotly produces:
+- values are rounded to display precision (1 decimal, 2 for series holding
+  values below 10) and whole numbers are kept exact;
+- each array is re-encoded in its smallest form - a typed array of the
+  narrowest integer type for whole numbers, a short decimal list otherwise
+  (plotly sends every float array as 8-byte base64); evenly spaced x values
+  (years) become x0/dx;
+- styling repeated on every trace of a type, or on every other one (small
+  multiples alternate two kinds of line), moves into the figure's template,
+  which plotly.js applies to those traces cyclically;
+- trace attributes equal to plotly.js defaults, and template defaults for
+  trace types the figure does not draw, are dropped.
+
+Usage: python payload.py [country] [year]   # bytes per dashboard chart, before and after
+"""
+
+import base64
+import json
+import sys
+
+import numpy as np
+
+# Trace attributes holding data values
+VALUE_KEYS = ('x', 'y', 'z', 'value')
+
+# Trace attributes equal to what plotly.js assumes when they are missing
+DEFAULTS = {'xaxis': 'x', 'yaxis': 'y'}
+
+# Trace types whose x can be given as x0/dx
+STEPPED_TYPES = {'scatter', 'bar'}
+
+# Never moved into the template: data, labels, identity and subplot references
+UNSHARED = set(VALUE_KEYS) | {'type', 'name', 'text', 'locations', 'customdata', 'hovertext',
+                              'uid', 'xaxis', 'yaxis', 'geo', 'domain'}
+
+# plotly.js typed array codes, narrowest first
+INT_TYPES = [('i1', np.int8), ('u1', np.uint8), ('i2', np.int16), ('u2', np.uint16),
+             ('i4', np.int32), ('u4', np.uint32)]
+DTYPES = {code: np.dtype(dtype) for code, dtype in INT_TYPES}
+DTYPES.update({'f4': np.dtype(np.float32), 'f8': np.dtype(np.float64)})
+
+
+def decimals_for(values):
+    """Display precision of an array: 1 decimal, 2 if it holds any value below 10"""
+    magnitude = np.abs(values[np.isfinite(values) & (values != 0)])
+    return 2 if len(magnitude) and magnitude.min() < 10 else 1
+
+
+def _decode(value):
+    """A spec array (typed array dict or list) as a float ndarray, or None if not numeric"""
+    if isinstance(value, dict) and 'bdata' in value:
+        dtype = DTYPES.get(value.get('dtype'))
+        if dtype is None:
+            return None
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=dtype).astype(float)
+        shape = value.get('shape')
+        if shape:
+            array = array.reshape([int(n) for n in str(shape).split(',')])
+        return array
+    if isinstance(value, (list, tuple)) and value:
+        # Numbers only: labels such as '2003' must stay text
+        flat = value
+        while flat and isinstance(flat[0], (list, tuple)):
+            flat = [v for row in flat for v in row]
+        if not all(v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in flat):
+            return None
+        try:
+            return np.array(value, dtype=float)
+        except ValueError:  # ragged rows
+            return None
+    return None
+
+
+def _typed(array):
+    """Typed array dict for whole numbers in the narrowest integer type that holds them"""
+    low, high = array.min(), array.max()
+    for code, dtype in INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            spec = {'dtype': code, 'bdata': base64.b64encode(array.astype(dtype).tobytes()).decode('ascii')}
+            if array.ndim > 1:
+                spec['shape'] = ', '.join(str(n) for n in array.shape)
+            return spec
+    return None
+
+
+def _listed(array, decimals):
+    """Nested list of rounded values, NaN as null, whole numbers without '.0'"""
+    rounded = np.round(array, decimals)
+
+    def convert(values):
+        if isinstance(values, list):
+            return [convert(v) for v in values]
+        if values != values:
+            return None
+        return int(values) if values.is_integer() else values
+
+    return convert(rounded.tolist())
+
+
+def quantize(array):
+    """Smallest spec encoding of a numeric array at display precision"""
+    finite = np.isfinite(array)
+    if finite.all() and len(array) and np.all(array == np.round(array)):
+        typed = _typed(array)
+        listed = _listed(array, 0)
+        if typed is not None and len(json.dumps(typed)) < len(json.dumps(listed)):
+            return typed
+        return listed
+    return _listed(array, decimals_for(array))
+
+
+def _compact_trace(trace):
+    for key, default in DEFAULTS.items():
+        if trace.get(key) == default:
+            del trace[key]
+    for key in VALUE_KEYS:
+        if key not in trace:
+            continue
+        value = trace[key]
+        if isinstance(value, float):
+            trace[key] = _listed(np.array([value]), decimals_for(np.array([value])))[0]
+            continue
+        array = _decode(value)
+        if array is not None:
+            trace[key] = quantize(array)
+    _step_x(trace)
+    return trace
+
+
+def _step_x(trace):
+    """Replace an evenly spaced numeric x by x0/dx"""
+    if trace.get('type', 'scatter') not in STEPPED_TYPES or 'x' not in trace:
+        return
+    x = _decode(trace['x'])
+    y = _decode(trace.get('y'))
+    if x is None or x.ndim != 1 or len(x) < 2 or y is None or len(y) != len(x) or not np.isfinite(x).all():
+        return
+    steps = np.diff(x)
+    if np.all(steps == steps[0]) and steps[0] > 0:
+        del trace['x']
+        trace['x0'] = _listed(x[:1], 2)[0]
+        trace['dx'] = _listed(steps[:1], 2)[0]
+
+
+def _size(value):
+    return len(json.dumps(value, separators=(',', ':')))
+
+
+def _merge(base, override):
+    """Nested dict merge, `override` winning - how plotly.js layers a trace over its template"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _shared(traces):
+    """Attributes holding the same value on every trace"""
+    first = traces[0]
+    return {key: value for key, value in first.items()
+            if key not in UNSHARED and all(key in trace and trace[key] == value for trace in traces[1:])}
+
+
+def _hoist(traces, template):
+    """Move styling shared by every trace of a type (or every other one) into the template"""
+    by_type = {}
+    for trace in traces:
+        by_type.setdefault(trace.get('type', 'scatter'), []).append(trace)
+    for kind, group in by_type.items():
+        existing = template['data'].get(kind, [])
+        if len(existing) > 1:
+            continue  # already cycling its own defaults
+        best, best_saved = None, 0
+        for period in (1, 2):
+            if len(group) < 2 * period:
+                continue
+            items = [_shared(group[r::period]) for r in range(period)]
+            saved = sum((len(group[r::period]) - 1) * _size(items[r]) for r in range(period) if items[r])
+            if saved > best_saved:
+                best, best_saved = items, saved
+        if best is None:
+            continue
+        base = existing[0] if existing else {}
+        template['data'][kind] = [_merge(base, item) for item in best]
+        for i, trace in enumerate(group):
+            for key in best[i % len(best)]:
+                del trace[key]
+
+
+def compact(spec):
+    """Compact a figure spec dict in place and return it"""
+    traces = list(spec.get('data', []))
+    for frame in spec.get('frames', []):
+        traces.extend(frame.get('data', []))
+    for trace in traces:
+        _compact_trace(trace)
+
+    # Template defaults only matter for the trace types drawn
+    layout = spec.setdefault('layout', {})
+    template = layout.setdefault('template', {})
+    used = {trace.get('type', 'scatter') for trace in traces}
+    template['data'] = {kind: items for kind, items in template.get('data', {}).items() if kind in used}
+
+    # Frames restyle traces by index, so leave animated figures' traces whole
+    if not spec.get('frames'):
+        _hoist(spec.get('data', []), template)
+    if not template['data']:
+        del template['data']
+    if not template:
+        del layout['template']
+    return spec
+
+
+def compact_json(fig):
+    """(compact JSON text of a figure, size in bytes of plotly's own JSON)"""
+    raw = fig.to_json()
+    return json.dumps(compact(json.loads(raw)), separators=(',', ':')), len(raw)
+
+
+if __name__ == "__main__":
+    from functools import partial
+
+    import streamlit.elements.plotly_chart  # noqa: F401 - installs the dashboard's plotly template
+
+    from analytics import global_average, hdi_comparison, load, map_frames
+    from figures import (
+        choropleth_figure, comparison_figure, gauges_figure, hdi_figure, overlay_figure,
+        small_multiples_figure, trends_figure
+    )
+    from translations import t
+
+    dataset = load()
+    country = sys.argv[1] if len(sys.argv) > 1 else 'Benin'
+    year = int(sys.argv[2]) if len(sys.argv) > 2 else dataset.years[-1]
+    label = partial(t, lang='en')
+    data = dataset.row(country, year)
+    neighbours = list(dataset.countries)[:12]
+    codes, values = map_frames(dataset, 'Five_Year_Survival_%')
+    charts = {
+        'gauges': gauges_figure(data, label),
+        'trends': trends_figure(dataset.country_data(country), country, label,
+                                dataset.projection_for(country)),
+        'comparison': comparison_figure(data, global_average(dataset, year), country, label),
+        'hdi': hdi_figure(hdi_comparison(dataset, year), label),
+        'overlay': overlay_figure(dataset.overlay('Five_Year_Survival_%', neighbours[:5]),
+                                  'Five_Year_Survival_%', label),
+        'small_multiples': small_multiples_figure(dataset.overlay('Five_Year_Survival_%', neighbours),
+                                                  'Five_Year_Survival_%', label),
+        'choropleth': choropleth_figure(values, codes, 'Five_Year_Survival_%', label),
+    }
+
+    print(f"{'chart':<16} {'before':>9} {'after':>9} {'saved':>7}")
+    total_before = total_after = 0
+    for name, fig in charts.items():
+        spec, before = compact_json(fig)
+        total_before += before
+        total_after += len(spec)
+        print(f"{name:<16} {before:>9,} {len(spec):>9,} {1 - len(spec) / before:>6.0%}")
+    print(f"{'total':<16} {total_before:>9,} {total_after:>9,} {1 - total_after / total_before:>6.0%}")
@@ -0,0 +1,143 @@
+"""
+Peer Finder / Recherche de Pays Comparables
+Countries with the most similar indicator profile, in the same year or any other.
+"""
+
+import numpy as np
+import pandas as pd
+
+from matrix import grid_positions
+
+# Profile compared between country-years, each standardized over the whole table
+FEATURES = ['Screening_Coverage_%', 'Early_Detection_Rate_%', 'Treatment_Coverage_%',
+            'Five_Year_Survival_%', 'MI_Ratio']
+HDI_LEVELS = {'Low': 0, 'Medium': 1, 'High': 2, 'Very High': 3}
+
+# Nearest peers stored per country-year; larger k is computed on demand
+NEIGHBOURS = 10
+
+# Rows per block of the pairwise distance pass, bounding its memory
+BLOCK = 1024
+
+
+def _profiles(df):
+    """Row x feature profile: the FEATURES and the HDI category as an ordinal level"""
+    hdi = df['HDI_Category'].array
+    levels = np.array([HDI_LEVELS.get(str(name), np.nan) for name in hdi.categories] + [np.nan])
+    return np.column_stack([df[FEATURES].to_numpy(dtype=float), levels[np.asarray(hdi.codes)]])
+
+
+def _nearest(vectors, k):
+    """(positions, distances) of the k nearest other complete rows of each row
+
+    Squared distances come from |a|² + |b|² - 2a.b, a matrix product per
+    block of rows. Rows with a missing feature have no peers and are no one's.
+    """
+    n = len(vectors)
+    positions = np.full((n, k), -1, dtype=np.int32)
+    distances = np.full((n, k), np.nan, dtype=np.float32)
+    k = min(k, n - 1)
+    if k <= 0:
+        return positions, distances
+    complete = ~np.isnan(vectors).any(axis=1)
+    x = np.where(complete[:, None], vectors, 0.0).astype(float)
+    norms = (x * x).sum(axis=1)
+    for start in range(0, n, BLOCK):
+        stop = min(start + BLOCK, n)
+        d2 = norms[start:stop, None] + norms[None, :] - 2 * x[start:stop] @ x.T
+        d2[:, ~complete] = np.inf
+        d2[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        d2 = np.take_along_axis(d2, nearest, axis=1)
+        order = np.argsort(d2, axis=1, kind='stable')
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        d2 = np.take_along_axis(d2, order, axis=1)
+        found = np.isfinite(d2) & complete[start:stop, None]
+        positions[start:stop, :k] = np.where(found, nearest, -1)
+        distances[start:stop, :k] = np.where(found, np.sqrt(np.maximum(d2, 0)), np.nan)
+    return positions, distances
+
+
+class PeerIndex:
+    """Standardized profiles of every country-year and each one's nearest peers
+
+    `vectors` has shape (years, countries, features): each feature is
+    z-scored over all rows, so a distance means the same in every year and
+    one year's block can be compared with another's. `neighbours` and
+    `distances` (years, countries, NEIGHBOURS) hold each country's closest
+    peers within its own year, found with one blocked pairwise pass per year.
+    Cross-year and larger-k queries scan a single year's block instead.
+    """
+
+    def __init__(self, df, countries, years, k=NEIGHBOURS):
+        rows, cols = grid_positions(df, countries, years)
+        profiles = _profiles(df)
+        spread = np.nanstd(profiles, axis=0)
+        standardized = (profiles - np.nanmean(profiles, axis=0)) / np.where(spread > 0, spread, 1.0)
+        vectors = np.full((len(years), len(countries), profiles.shape[1]), np.nan, dtype=np.float32)
+        vectors[cols, rows] = standardized
+
+        neighbours = np.full((len(years), len(countries), k), -1, dtype=np.int32)
+        distances = np.full((len(years), len(countries), k), np.nan, dtype=np.float32)
+        for i in range(len(years)):
+            neighbours[i], distances[i] = _nearest(vectors[i], k)
+        self._setup({'vectors': vectors, 'neighbours': neighbours, 'distances': distances},
+                    countries, years)
+
+    @classmethod
+    def from_arrays(cls, arrays, countries, years):
+        """Rebuild from arrays() output (e.g. memory maps) without copying"""
+        index = cls.__new__(cls)
+        index._setup(arrays, countries, years)
+        return index
+
+    def arrays(self):
+        return {'vectors': self.vectors, 'neighbours': self.neighbours, 'distances': self.distances}
+
+    def _setup(self, arrays, countries, years):
+        self.vectors = arrays['vectors']
+        self.neighbours = arrays['neighbours']
+        self.distances = arrays['distances']
+        for array in (self.vectors, self.neighbours, self.distances):
+            array.setflags(write=False)
+        self.countries = tuple(countries)
+        self._positions = {name: i for i, name in enumerate(self.countries)}
+        self._years = {int(year): i for i, year in enumerate(years)}
+
+    def nearest(self, country, year, k=5, peer_year=None):
+        """The `k` countries whose `peer_year` profile is closest to `country` in `year`
+
+        `peer_year` defaults to `year`. Returns a Country-indexed frame of
+        (distance, year), nearest first; empty when the country, either year
+        or part of its profile is missing. The country itself is never its own peer.
+        """
+        peer_year = year if peer_year is None else peer_year
+        position = self._positions.get(country)
+        i, j = self._years.get(int(year)), self._years.get(int(peer_year))
+        if position is None or i is None or j is None:
+            return self._frame([], [], peer_year)
+
+        if i == j and k <= self.neighbours.shape[-1]:
+            found = self.neighbours[i, position, :k]
+            keep = found >= 0
+            return self._frame(found[keep], self.distances[i, position, :k][keep], peer_year)
+
+        query = self.vectors[i, position]
+        if np.isnan(query).any():
+            return self._frame([], [], peer_year)
+        d = np.sqrt(((self.vectors[j] - query) ** 2).sum(axis=1, dtype=float))
+        d[np.isnan(d)] = np.inf
+        d[position] = np.inf
+        k = min(k, len(d) - 1)
+        if k <= 0:
+            return self._frame([], [], peer_year)
+        found = np.argpartition(d, k - 1)[:k]
+        found = found[np.argsort(d[found], kind='stable')]
+        found = found[np.isfinite(d[found])]
+        return self._frame(found, d[found], peer_year)
+
+    def _frame(self, positions, distances, year):
+        return pd.DataFrame({
+            'distance': np.asarray(distances, dtype=float),
+            'year': np.full(len(positions), int(year)),
+        }, index=pd.Index([self.countries[p] for p in positions], name='Country'))
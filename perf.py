@@ -0,0 +1,176 @@
+"""
+Rerun Timing Spans / Mesures de Temps par Exécution
+Per-rerun timing spans with cache hits and payload sizes, aggregated to p50/p95.
+
+The dashboard opens a run at the top of every script run (a fragment rerun
+opens its own) and wraps its hot paths in span(). Finished runs are kept in a
+bounded in-process window for the debug panel and, when DASHBOARD_PERF_LOG
+names a file, appended to it as one JSON line each. Outside a run, span() does
+nothing, so shared code (figures.py, report.py workers) can call it freely.
+
+Usage: python perf.py LOG.jsonl [--last N]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+LOG_PATH = os.environ.get('DASHBOARD_PERF_LOG')
+RECENT_RUNS = 1000
+
+_local = threading.local()
+_recent = deque(maxlen=RECENT_RUNS)
+_lock = threading.Lock()
+
+
+def start_run(kind='script', name=None):
+    """Open a run on this thread, replacing any run left open by an error"""
+    _local.run = {'kind': kind, 'name': name, 'start': time.perf_counter(), 'spans': []}
+    _local.stack = []
+
+
+def active():
+    return getattr(_local, 'run', None) is not None
+
+
+@contextmanager
+def span(name, **fields):
+    """Time a block of the current run
+
+    Yields the span record, so the block can add fields such as
+    cache='hit' / 'miss' or bytes=payload size.
+    """
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield {}
+        return
+    record = {'name': name, 'depth': len(_local.stack), **fields}
+    run['spans'].append(record)
+    _local.stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['ms'] = round((time.perf_counter() - start) * 1000, 3)
+        _local.stack.pop()
+
+
+def cache_miss():
+    """Mark the innermost open span as a cache miss
+
+    Called from inside a cached function, whose body only runs on a miss.
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1]['cache'] = 'miss'
+
+
+def finish_run():
+    """Close the current run, keep it in the recent window and log it; returns the run"""
+    run = getattr(_local, 'run', None)
+    if run is None:
+        return None
+    _local.run = None
+    record = {
+        'ts': round(time.time(), 3),
+        'pid': os.getpid(),
+        'kind': run['kind'],
+        'name': run['name'],
+        'ms': round((time.perf_counter() - run['start']) * 1000, 3),
+        'spans': run['spans'],
+    }
+    with _lock:
+        _recent.append(record)
+        if LOG_PATH:
+            with open(LOG_PATH, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    return record
+
+
+def section(name):
+    """Decorator timing a dashboard section as span 'section:<name>'
+
+    A fragment rerunning on its own has no script run around it, so it
+    opens and finishes a run of kind 'fragment'.
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if active():
+                with span(f'section:{name}'):
+                    return fn(*args, **kwargs)
+            start_run('fragment', name)
+            try:
+                with span(f'section:{name}'):
+                    return fn(*args, **kwargs)
+            finally:
+                finish_run()
+        return wrapper
+    return decorate
+
+
+def recent_runs():
+    with _lock:
+        return list(_recent)
+
+
+def summary(runs):
+    """{name: {count, p50_ms, p95_ms, hit_rate, p50_bytes, p50_raw_bytes}} over runs and their spans
+
+    Whole runs appear as 'run:script' and 'run:fragment'. hit_rate and the
+    byte sizes are None for spans that never recorded them; raw_bytes is a
+    payload's size before compaction.
+    """
+    samples = {}
+    for run in runs:
+        samples.setdefault(f"run:{run['kind']}", []).append({'ms': run['ms']})
+        for record in run['spans']:
+            if 'ms' in record:
+                samples.setdefault(record['name'], []).append(record)
+
+    result = {}
+    for name, records in samples.items():
+        ms = np.array([r['ms'] for r in records])
+        caches = [r['cache'] for r in records if 'cache' in r]
+        sizes = [r['bytes'] for r in records if 'bytes' in r]
+        raw_sizes = [r['raw_bytes'] for r in records if 'raw_bytes' in r]
+        result[name] = {
+            'count': len(records),
+            'p50_ms': round(float(np.percentile(ms, 50)), 3),
+            'p95_ms': round(float(np.percentile(ms, 95)), 3),
+            'hit_rate': round(caches.count('hit') / len(caches), 3) if caches else None,
+            'p50_bytes': int(np.percentile(sizes, 50)) if sizes else None,
+            'p50_raw_bytes': int(np.percentile(raw_sizes, 50)) if raw_sizes else None,
+        }
+    return dict(sorted(result.items(), key=lambda item: -item[1]['p95_ms']))
+
+
+def read_log(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="p50/p95 per span from a DASHBOARD_PERF_LOG file")
+    parser.add_argument('log')
+    parser.add_argument('--last', type=int, metavar='N', help="only the last N runs")
+    args = parser.parse_args()
+
+    runs = read_log(args.log)
+    if args.last:
+        runs = runs[-args.last:]
+    print(f"{len(runs)} runs")
+    print(f"{'span':<34} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'hits':>6} {'p50 bytes':>10} {'raw bytes':>10}")
+    for name, stats in summary(runs).items():
+        hits = '' if stats['hit_rate'] is None else f"{stats['hit_rate']:.0%}"
+        size = '' if stats['p50_bytes'] is None else f"{stats['p50_bytes']:,}"
+        raw = '' if stats['p50_raw_bytes'] is None else f"{stats['p50_raw_bytes']:,}"
+        print(f"{name:<34} {stats['count']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {hits:>6} {size:>10} "
+              f"{raw:>10}")
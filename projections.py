@@ -0,0 +1,115 @@
+"""
+Trend Projections / Projections des Tendances
+Every country's linear trends carried forward to 2030, with prediction intervals.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bundle import INDICATOR_COLUMNS
+
+# Last projected year and the coverage of the prediction intervals
+HORIZON = 2030
+LEVEL = 0.95
+Z = 1.959964  # standard normal quantile for LEVEL
+
+# Projections of these stay within 0-100; every other indicator stays non-negative
+PERCENT_COLUMNS = {col for col in INDICATOR_COLUMNS if col.endswith('%')} | {'MI_Ratio'}
+
+BANDS = ['fit', 'lower', 'upper']
+
+
+# Exact two-sided LEVEL quantiles of Student's t for 1 to 30 degrees of freedom
+T_TABLE = np.array([12.7062, 4.3027, 3.1824, 2.7764, 2.5706, 2.4469, 2.3646, 2.3060,
+                    2.2622, 2.2281, 2.2010, 2.1788, 2.1604, 2.1448, 2.1314, 2.1199,
+                    2.1098, 2.1009, 2.0930, 2.0860, 2.0796, 2.0739, 2.0687, 2.0639,
+                    2.0595, 2.0555, 2.0518, 2.0484, 2.0452, 2.0423])
+
+
+def t_quantile(dof):
+    """Two-sided LEVEL quantile of Student's t for `dof` degrees of freedom (array-wise)
+
+    Looked up in T_TABLE up to 30 degrees of freedom. Beyond that, a
+    Cornish-Fisher expansion around the normal quantile is within 0.0001 of
+    the exact value. Fewer than one degree of freedom gives NaN.
+    """
+    v = np.asarray(dof, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expansion = (Z + (Z ** 3 + Z) / (4 * v)
+                     + (5 * Z ** 5 + 16 * Z ** 3 + 3 * Z) / (96 * v ** 2)
+                     + (3 * Z ** 7 + 19 * Z ** 5 + 17 * Z ** 3 - 15 * Z) / (384 * v ** 3))
+    small = (v >= 1) & (v <= len(T_TABLE))
+    exact = T_TABLE[np.where(small, v, 1).astype(int) - 1]
+    return np.where(small, exact, np.where(v > len(T_TABLE), expansion, np.nan))
+
+
+class ProjectionTable:
+    """Fitted value and prediction interval per (indicator, country, projected year)
+
+    Projects the TrendTable's straight-line fits from the dataset's last year
+    to HORIZON in one broadcast over (indicators, countries, years). The
+    interval is the usual regression prediction interval,
+    fit ± t * sd * sqrt(1 + 1/n + (year - mean year)² / Σ(year - mean year)²),
+    so it widens with the distance from the observed years and with noisier
+    series. Values are clipped to the indicator's valid range; countries with
+    fewer than three years of data are NaN.
+    """
+
+    def __init__(self, trends, start, horizon=HORIZON):
+        years = np.arange(start, max(start, horizon) + 1)
+        x = years.astype(float)
+        slope = trends.slope[..., None]
+        fit = trends.intercept[..., None] + slope * x
+        n = trends.n[..., None].astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            leverage = 1 + 1 / n + (x - trends.year_mean[..., None]) ** 2 / trends.year_ss[..., None]
+            half = t_quantile(n - 2) * trends.resid_sd[..., None] * np.sqrt(leverage)
+        half = np.where(n >= 3, half, np.nan)
+
+        # Clip each indicator to its valid range
+        low = np.zeros((len(INDICATOR_COLUMNS), 1, 1))
+        high = np.array([100.0 if col in PERCENT_COLUMNS else np.inf
+                         for col in INDICATOR_COLUMNS])[:, None, None]
+        fit = np.where(n >= 3, fit, np.nan)
+        self._setup({
+            'fit': np.clip(fit, low, high),
+            'lower': np.clip(fit - half, low, high),
+            'upper': np.clip(fit + half, low, high),
+            'years': years.astype(np.int16),
+        }, trends.countries)
+
+    @classmethod
+    def from_arrays(cls, arrays, countries):
+        """Rebuild from arrays() output (e.g. memory maps) without copying"""
+        table = cls.__new__(cls)
+        table._setup(arrays, countries)
+        return table
+
+    def arrays(self):
+        return {**{band: getattr(self, band) for band in BANDS}, 'years': self._years}
+
+    def _setup(self, arrays, countries):
+        for band in BANDS:
+            arrays[band].setflags(write=False)
+            setattr(self, band, arrays[band])
+        self._years = arrays['years']
+        self.years = pd.Index(self._years.astype(int), name='Year')
+        self.countries = tuple(countries)
+        self._positions = {name: i for i, name in enumerate(self.countries)}
+        self._indicators = {col: i for i, col in enumerate(INDICATOR_COLUMNS)}
+
+    def for_country(self, country):
+        """Year x (band, indicator) projections of one country, or None if unknown"""
+        position = self._positions.get(country)
+        if position is None:
+            return None
+        return pd.concat({band: pd.DataFrame(getattr(self, band)[:, position].T, index=self.years,
+                                             columns=list(INDICATOR_COLUMNS))
+                          for band in BANDS}, axis=1)
+
+    def at(self, indicator, year=HORIZON):
+        """Country x band projections of one indicator for one year"""
+        i = self._indicators[indicator]
+        column = self.years.get_loc(year)
+        return pd.DataFrame({band: getattr(self, band)[i, :, column] for band in BANDS},
+                            index=pd.Index(self.countries, name='Country'))
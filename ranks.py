@@ -0,0 +1,87 @@
+"""
+Rank & Percentile Table / Table des Rangs et Percentiles
+Within-year rank of every country on every indicator, computed once at load.
+"""
+
+import pandas as pd
+
+from bundle import INDICATOR_COLUMNS
+
+# Which way each indicator improves; shared with trends.py. Rank 1 is the
+# best value. Raw counts (cases, deaths, population) grow with the country's
+# size, have no better direction and are ranked largest first.
+DIRECTION = {
+    'Incidence_Rate_ASR': 'lower',
+    'Mortality_Rate_ASR': 'lower',
+    'New_Cases': None,
+    'Deaths': None,
+    'MI_Ratio': 'lower',
+    'Population_Millions': None,
+    'Screening_Coverage_%': 'higher',
+    'Early_Detection_Rate_%': 'higher',
+    'Treatment_Coverage_%': 'higher',
+    'Five_Year_Survival_%': 'higher',
+}
+LOWER_IS_BETTER = {col for col, direction in DIRECTION.items() if direction == 'lower'}
+
+
+class RankTable:
+    """Rank, field size and percentile per (row, indicator)
+
+    Ties share the best rank (1, 2, 2, 4). The percentile is the mid-rank
+    percentile: countries ranked below plus half of those tied (self
+    included), over the field size, so tied countries always agree.
+    """
+
+    def __init__(self, df):
+        values = df[INDICATOR_COLUMNS]
+        years = df['Year']
+
+        best_first = values.copy()
+        ascending = [col for col in INDICATOR_COLUMNS if col in LOWER_IS_BETTER]
+        best_first[ascending] = -best_first[ascending]
+        grouped = best_first.groupby(years, sort=False)
+
+        # Rank from the best value: 'min' and 'max' bound each tie group
+        top = grouped.rank(method='min', ascending=False).to_numpy()
+        bottom = grouped.rank(method='max', ascending=False).to_numpy()
+        field = grouped.transform('count').to_numpy().astype(float)
+
+        self._setup({
+            'rank': top,
+            'field': field,
+            'percentile': (field - bottom + 0.5 * (bottom - top + 1)) / field * 100,
+            'years': years.to_numpy(),
+        })
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild from arrays() output (e.g. memory maps) without copying"""
+        table = cls.__new__(cls)
+        table._setup(arrays)
+        return table
+
+    def arrays(self):
+        return {'rank': self.rank, 'field': self.field, 'percentile': self.percentile, 'years': self._years}
+
+    def _setup(self, arrays):
+        self.indicators = list(INDICATOR_COLUMNS)
+        self.rank = arrays['rank']
+        self.field = arrays['field']
+        self.percentile = arrays['percentile']
+        self._years = arrays['years']
+        for array in (self.rank, self.field, self.percentile):
+            array.setflags(write=False)
+
+    def at(self, position):
+        """indicator x (rank, field, percentile) for one dataset row"""
+        return pd.DataFrame({
+            'rank': self.rank[position],
+            'field': self.field[position],
+            'percentile': self.percentile[position],
+        }, index=self.indicators)
+
+    def history(self, rows):
+        """Year x indicator ranks for a run of rows (e.g. one country)"""
+        return pd.DataFrame(self.rank[rows], index=pd.Index(self._years[rows], name='Year'),
+                            columns=self.indicators)
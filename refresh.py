@@ -0,0 +1,177 @@
+"""
+Incremental Data Refresh / Actualisation Incrémentale des Données
+Picks up appended or edited CSV rows without rebuilding everything.
+
+An append is recognised by hashing the part of the file that was already
+compiled; only the new bytes are parsed, and folded into the stored
+per-(Country, Year) totals. Any other edit re-streams the file and diffs it
+against the current bundle. Either way only the changed (Country, Year) pairs
+are recomputed: ranks and aggregates for their years, rule flags for their
+rows, cached figures for their countries and years.
+
+Usage: python refresh.py [csv_path]   # refresh the bundle ahead of the dashboard
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import perf
+from bundle import (
+    CATEGORY_COLUMNS, CSV_PATH, INDICATOR_COLUMNS, _file_sha256, ensure_bundle, load_counts,
+    load_hashes, map_columns, read_manifest, version_dir, write_bundle
+)
+from dataset import Dataset
+from ingest import (
+    DEFAULT_CHUNKSIZE, RowHashes, combine, country_years, stream_appended, stream_country_years, totals_of
+)
+from validate import Validator, load_report
+
+
+def _keyed(df):
+    index = pd.MultiIndex.from_arrays(
+        [df['Country'].astype(str).to_numpy(), df['Year'].to_numpy(dtype=np.int64)],
+        names=['Country', 'Year'])
+    values = {col: df[col].astype(str).to_numpy() for col in CATEGORY_COLUMNS if col != 'Country'}
+    values.update({col: df[col].to_numpy(dtype=float) for col in INDICATOR_COLUMNS})
+    return pd.DataFrame(values, index=index)
+
+
+def changed_pairs(old, new):
+    """(Country, Year) pairs added, removed or holding any different value"""
+    old = _keyed(old)
+    new = _keyed(new)
+    keys = old.index.union(new.index)
+    old = old.reindex(keys)
+    new = new.reindex(keys)
+    differs = (old.ne(new) & ~(old.isna() & new.isna())).any(axis=1)
+    return [(country, int(year)) for country, year in keys[differs.to_numpy()]]
+
+
+def refresh_bundle(csv_path, dataset, chunksize=DEFAULT_CHUNKSIZE):
+    """Bring the bundle up to date with the CSV
+
+    Returns None when `dataset` is already current, else (new dataset,
+    change) where change is {'from', 'mode', 'pairs', 'countries', 'years'}
+    or None if what changed is unknown (treat everything as stale).
+    """
+    stat = os.stat(csv_path)
+    manifest = read_manifest(csv_path)
+    if manifest is not None and (manifest['size'], manifest['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+        if manifest['sha256'] == dataset.version:
+            return None
+        # Another process already refreshed the bundle
+        changes = manifest.get('changes')
+        fresh = Dataset.from_bundle(csv_path)
+        return fresh, changes if changes and changes['from'] == dataset.version else None
+    if manifest is None or manifest['sha256'] != dataset.version:
+        return Dataset.from_bundle(csv_path), None
+
+    # The bundle describes `dataset` and the CSV has moved on
+    # Appended rows are validated on their own and added to the stored report
+    appended = None
+    validator = Validator.resumed(load_report(csv_path, manifest), dataset.df, manifest['source_rows'])
+    if stat.st_size > manifest['size']:
+        hashes = load_hashes(csv_path, manifest)
+        appended = stream_appended(csv_path, manifest['size'], manifest['sha256'], manifest['header'],
+                                   chunksize, validator, hashes)
+    if appended is not None:
+        delta, delta_attributes, info = appended
+        totals, attributes = totals_of(dataset.df, load_counts(csv_path, manifest))
+        frame, counts = country_years(combine(totals, delta), {**delta_attributes, **attributes})
+        pairs = [] if delta is None else [(country, int(year)) for country, year in delta.index]
+        info['source_rows'] += manifest['source_rows']
+        mode = 'append'
+    elif stat.st_size == manifest['size'] and _file_sha256(csv_path) == manifest['sha256']:
+        ensure_bundle(csv_path)  # only touched: record the new mtime
+        return None
+    else:
+        validator = Validator()
+        hashes = RowHashes()
+        frame, counts, info = stream_country_years(csv_path, chunksize, validator, hashes)
+        pairs = changed_pairs(dataset.df, frame)
+        mode = 'rewrite'
+
+    change = {
+        'from': dataset.version,
+        'mode': mode,
+        'pairs': len(pairs),
+        'countries': sorted({country for country, _ in pairs}),
+        'years': sorted({year for _, year in pairs}),
+    }
+    manifest = write_bundle(csv_path, stat, frame, counts, info, hashes, change,
+                            validator.report(frame, counts, info))
+    columns = map_columns(csv_path, manifest)
+    dataset.refreshed(columns, info['sha256'], pairs).store_derived(version_dir(csv_path, manifest))
+    return Dataset.from_bundle(csv_path, check=False), change
+
+
+class LiveDataset:
+    """The current Dataset of a CSV, refreshed in place as the file changes
+
+    current() looks at the file at most every `interval` seconds. One
+    caller applies a change while the others keep serving the previous
+    dataset; the figure cache only loses the charts the change touches.
+    """
+
+    def __init__(self, csv_path=CSV_PATH, figure_cache=None, interval=2.0):
+        self.csv_path = csv_path
+        self.figure_cache = figure_cache
+        self.interval = interval
+        self.dataset = Dataset.from_bundle(csv_path)
+        self.last_change = None
+        self._checked = time.monotonic()
+        self._lock = threading.Lock()
+
+    def current(self):
+        if time.monotonic() - self._checked >= self.interval and self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            except Exception as exc:  # a half-written file: keep serving, retry next interval
+                print(f"Data refresh failed, keeping version {self.dataset.version[:12]}: {exc}",
+                      file=sys.stderr)
+            finally:
+                self._checked = time.monotonic()
+                self._lock.release()
+        return self.dataset
+
+    def refresh(self):
+        """Apply any change now; returns the change, or None"""
+        with self._lock:
+            self._checked = time.monotonic()
+            return self._refresh()
+
+    def _refresh(self):
+        with perf.span('data_refresh') as record:
+            result = refresh_bundle(self.csv_path, self.dataset)
+            if result is None:
+                return None
+            dataset, change = result
+            record['mode'] = change['mode'] if change else 'full'
+            if self.figure_cache is not None:
+                if change is None:
+                    self.figure_cache.clear()
+                else:
+                    self.figure_cache.invalidate(change['countries'], change['years'])
+            self.dataset = dataset
+            self.last_change = change
+            return change
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    start = time.perf_counter()
+    result = refresh_bundle(path, Dataset.from_bundle(path, check=False))
+    elapsed = time.perf_counter() - start
+    if result is None:
+        print("Bundle already up to date")
+    elif result[1] is None:
+        print(f"Rebuilt the bundle in {elapsed:.2f} s")
+    else:
+        change = result[1]
+        print(f"{change['mode']}: {change['pairs']} country-years changed "
+              f"({len(change['countries'])} countries, years {change['years']}) in {elapsed:.2f} s")
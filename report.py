@@ -0,0 +1,278 @@
+"""
+Batch Country Reports / Rapports Pays en Lot
+Renders the dashboard content for many (country, year, language) combinations
+to standalone HTML files, fanned out over a process pool.
+
+Usage: python report.py --out reports [--countries Benin Ghana] [--years 2023]
+                        [--langs en fr] [--workers 8] [--shared-js]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from html import escape
+
+from analytics import (
+    CHANGE_COLUMNS, MI_GOOD, TARGETS, calculated_metrics, count_text, global_average, hdi_comparison,
+    load, mi_status, period_change, recommendations, target_gaps
+)
+from bundle import CSV_PATH, ensure_bundle
+from figures import FigureCache, comparison_figure, gauges_figure, hdi_figure, trends_figure
+from translations import INDICATOR_LABELS, TRANSLATIONS, t
+
+PLOTLY_JS = "plotly.min.js"
+
+CHANGE_LABELS = {
+    'Five_Year_Survival_%': ('survival_change', '%'),
+    'Screening_Coverage_%': ('screening_change', '%'),
+    'Incidence_Rate_ASR': ('incidence_change', ''),
+    'MI_Ratio': ('mi_change', '%'),
+}
+
+STYLE = """
+body { font-family: 'Poppins', sans-serif; max-width: 1100px; margin: auto; padding: 1rem; color: #333; }
+h1 { color: #FF1493; text-align: center; }
+.sub-header { text-align: center; color: #555; }
+.metrics { display: flex; gap: 1rem; flex-wrap: wrap; }
+.metric { flex: 1; min-width: 180px; padding: .5rem 1rem; border: 1px solid #eee; border-radius: 10px; }
+.metric .value { font-size: 1.8rem; }
+.good { color: #28a745; } .bad { color: #dc3545; }
+.success-box { background-color: #d4edda; padding: 1rem; border-radius: 10px; border: 2px solid #28a745; margin: 1rem 0; }
+.warning-box { background-color: #fff3cd; padding: 1rem; border-radius: 10px; border: 2px solid #ffc107; margin: 1rem 0; }
+.insight-box { background-color: #fff3f8; padding: 1rem; border-radius: 10px; border: 2px solid #FF69B4; margin: 1rem 0; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border-bottom: 1px solid #eee; padding: .3rem .6rem; text-align: left; }
+footer { text-align: center; color: #666; padding: 2rem; }
+"""
+
+# Per-worker state, set once by _init_worker
+_dataset = None
+_figures = None
+_plotly_js = None
+_shared_js = False
+
+
+def _metric(label, value, note=None, good=None):
+    cls = '' if good is None else (' good' if good else ' bad')
+    note_html = f'<div class="note{cls}">{escape(note)}</div>' if note else ''
+    return (f'<div class="metric"><div class="label">{escape(label)}</div>'
+            f'<div class="value">{escape(value)}</div>{note_html}</div>')
+
+
+def _figure_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={'responsive': True})
+
+
+def render_report(dataset, figure_cache, country, year, lang, plotly_js, shared_js=False):
+    """One country brief as an HTML string, or None without data
+
+    `plotly_js` is the plotly.js source to inline, or with `shared_js` the
+    URL of a shared copy to reference.
+    """
+    data = dataset.row(country, year)
+    if data is None:
+        return None
+    label = partial(t, lang=lang)
+    parts = []
+
+    # Overview
+    parts.append(f"<h2>📊 {escape(country)} - {escape(label('statistics_title'))} ({year})</h2>")
+    parts.append('<div class="metrics">' + ''.join([
+        _metric(label('incidence_rate'), f"{data['Incidence_Rate_ASR']:.1f}"),
+        _metric(label('mortality_rate'), f"{data['Mortality_Rate_ASR']:.1f}"),
+        _metric(label('new_cases'), count_text(data['New_Cases'])),
+        _metric(label('deaths'), count_text(data['Deaths'])),
+    ]) + '</div>')
+
+    # Key indicators and MI ratio
+    parts.append(f"<h3>{escape(label('key_indicators'))}</h3>")
+    gaps = target_gaps(data)
+    parts.append('<div class="metrics">' + ''.join(
+        _metric(label(INDICATOR_LABELS[column]), f"{data[column]:.1f}%",
+                f"{gaps[column][0]:+.1f}% {label('vs_target')} ({target}%)", gaps[column][1])
+        for column, target in TARGETS.items()
+    ) + _metric(label('mi_ratio'), f"{data['MI_Ratio']:.1f}%",
+                f"{label('status')}: {label(mi_status(data['MI_Ratio']))} | {label('target')}: < {MI_GOOD}%")
+        + '</div>')
+
+    # Descriptive statistics
+    metrics = calculated_metrics(data)
+    parts.append(f"<h3>{escape(label('desc_stats'))}</h3><table>")
+    for key, value in [
+        ('region', data['Region']),
+        ('hdi_category', data['HDI_Category']),
+        ('population', f"{data['Population_Millions']:.2f} {label('millions')}"),
+        ('case_fatality', f"{metrics['case_fatality']:.1f}%"),
+        ('cases_per_million', f"{metrics['cases_per_million']:.1f}"),
+        ('deaths_per_million', f"{metrics['deaths_per_million']:.1f}"),
+    ]:
+        parts.append(f"<tr><th>{escape(label(key))}</th><td>{escape(str(value))}</td></tr>")
+    parts.append("</table>")
+
+    # Gauges
+    parts.append(f"<h3>{escape(label('visual_indicators'))}</h3>")
+    parts.append(_figure_html(figure_cache.figure(
+        ('gauges', country, year, lang), lambda: gauges_figure(data, label))))
+
+    # Historical trends
+    country_data = dataset.country_data(country)
+    if len(country_data) > 1:
+        parts.append(f"<h3>{escape(label('historical_trends'))} - {escape(country)}</h3>")
+        parts.append(_figure_html(figure_cache.figure(
+            ('trends', country, None, lang, True),
+            lambda: trends_figure(country_data, country, label, dataset.projection_for(country)))))
+        change = period_change(country_data)
+        period = f"{label('change_from')} {change['first_year']} {label('to')} {change['last_year']}"
+        parts.append('<div class="metrics">' + ''.join(
+            _metric(label(CHANGE_LABELS[column][0]),
+                    f"{change['changes'][column]:+.1f}{CHANGE_LABELS[column][1]}", period)
+            for column in CHANGE_COLUMNS
+        ) + '</div>')
+
+    # Global comparison and ranking
+    parts.append(f"<h3>{escape(label('global_comparison'))} - {year}</h3>")
+    global_avg = global_average(dataset, year)
+    parts.append(_figure_html(figure_cache.figure(
+        ('comparison', country, year, lang),
+        lambda: comparison_figure(data, global_avg, country, label))))
+    hdi_stats = hdi_comparison(dataset, year)
+    parts.append(_figure_html(figure_cache.figure(
+        ('hdi', None, year, lang), lambda: hdi_figure(hdi_stats, label))))
+
+    ranks = dataset.ranks_for(country, year)
+    parts.append(f"<h3>{escape(label('all_ranks'))}</h3><table>")
+    parts.append(f"<tr><th>{escape(label('indicator'))}</th><th>{escape(label('rank_col'))}</th>"
+                 f"<th>{escape(label('percentile'))}</th></tr>")
+    for column, row in ranks.iterrows():
+        parts.append(f"<tr><td>{escape(label(INDICATOR_LABELS[column]))}</td>"
+                     f"<td>{row['rank']:.0f} / {row['field']:.0f}</td><td>{row['percentile']:.0f}</td></tr>")
+    parts.append("</table>")
+
+    # Recommendations
+    parts.append(f"<h2>{escape(label('insights_recommendations'))}</h2>")
+    concern_rules, success_rules = recommendations(dataset, country, year)
+    if success_rules:
+        parts.append(f'<div class="success-box"><h3>{escape(label("positive_aspects"))}</h3><ul>')
+        parts.extend(f"<li><b>{escape(label(r.title))} ({data[r.column]:.1f}%)</b>: {escape(label(r.detail))}</li>"
+                     for r in success_rules)
+        parts.append('</ul></div>')
+    if concern_rules:
+        parts.append(f'<div class="warning-box"><h3>{escape(label("areas_attention"))}</h3><ul>')
+        parts.extend(f"<li><b>{escape(label(r.title))} ({data[r.column]:.1f}%)</b>: {escape(label(r.detail))}</li>"
+                     for r in concern_rules)
+        parts.append('</ul></div>')
+        parts.append(f'<div class="insight-box"><h3>{escape(label("actionable_recommendations"))}</h3>')
+        parts.extend(f"<p>{escape(label(r.action))}: {escape(label(r.action_detail))}</p>" for r in concern_rules)
+        parts.append(f"<p><b>{escape(label('general_recommendations'))}</b></p>")
+        parts.extend(f"<p>{escape(label(f'rec_{i}'))}</p>" for i in range(1, 9))
+        parts.append('</div>')
+
+    if shared_js:
+        script = f'<script src="{escape(plotly_js)}"></script>'
+    else:
+        script = f'<script type="text/javascript">{plotly_js}</script>'
+    footer = ''.join(f"<p>{escape(label(key))}</p>"
+                     for key in ['footer_awareness', 'footer_detection', 'footer_source', 'footer_source1',
+                                'footer_purpose', 'footer_author'])
+    return f"""<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="utf-8">
+<title>{escape(country)} {year} - {escape(label('statistics_title'))}</title>
+<style>{STYLE}</style>
+{script}
+</head>
+<body>
+<h1>{escape(label('main_title'))}</h1>
+<p class="sub-header">{escape(label('subtitle'))}</p>
+{''.join(parts)}
+<footer>{footer}</footer>
+</body>
+</html>
+"""
+
+
+def report_path(out_dir, country, year, lang):
+    return os.path.join(out_dir, lang, f"{country.replace(' ', '_')}_{year}.html")
+
+
+def _init_worker(csv_path, plotly_js, shared_js):
+    # Each worker loads the dataset, aggregates, ranks and rules once and
+    # keeps its own figure cache, so trend and HDI charts are built once
+    global _dataset, _figures, _plotly_js, _shared_js
+    _dataset = load(csv_path)
+    _figures = FigureCache()
+    _plotly_js = plotly_js
+    _shared_js = shared_js
+
+
+def _render_country(country, years, lang, out_dir):
+    """Write every requested year of one country in one language"""
+    written = 0
+    size = 0
+    for year in years:
+        html = render_report(_dataset, _figures, country, year, lang, _plotly_js, _shared_js)
+        if html is None:
+            continue
+        path = report_path(out_dir, country, year, lang)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        written += 1
+        size += len(html.encode('utf-8'))
+    return written, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render country briefs to HTML")
+    parser.add_argument('--out', default='reports', help="output directory")
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--countries', nargs='*', help="default: every country")
+    parser.add_argument('--years', nargs='*', type=int, help="default: every year")
+    parser.add_argument('--langs', nargs='*', default=list(TRANSLATIONS), choices=list(TRANSLATIONS))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--shared-js', action='store_true',
+                        help=f"write {PLOTLY_JS} once and reference it instead of inlining it in every file")
+    args = parser.parse_args(argv)
+
+    # Compile the bundle once up front so workers only read it
+    ensure_bundle(args.csv)
+    dataset = load(args.csv)
+    countries = args.countries or list(dataset.countries)
+    years = args.years or list(dataset.years)
+
+    from plotly.offline import get_plotlyjs
+    os.makedirs(args.out, exist_ok=True)
+    if args.shared_js:
+        with open(os.path.join(args.out, PLOTLY_JS), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        plotly_js = f"../{PLOTLY_JS}"
+    else:
+        plotly_js = get_plotlyjs()
+    for lang in args.langs:
+        os.makedirs(os.path.join(args.out, lang), exist_ok=True)
+
+    # One task per (country, language): its years share the trend chart
+    tasks = [(country, lang) for lang in args.langs for country in countries]
+    start = time.perf_counter()
+    written = 0
+    size = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.csv, plotly_js, args.shared_js)) as pool:
+        futures = [pool.submit(_render_country, country, years, lang, args.out) for country, lang in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            count, nbytes = future.result()
+            written += count
+            size += nbytes
+            if done % 20 == 0 or done == len(futures):
+                print(f"\r{done}/{len(futures)} tasks, {written} reports", end='', file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    print(f"Wrote {written} reports ({size / 1e6:.1f} MB) to {args.out} in {elapsed:.1f} s "
+          f"- {written / elapsed:.1f} reports/s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Recommendation Rules Engine / Moteur de Règles de Recommandation
+Declarative concern/success rules evaluated over every country and year at once.
+
+Usage: python rules.py RULE YEAR [--cleared-since YEAR]
+       e.g. python rules.py high_mi 2023 --cleared-since 2010
+"""
+
+import argparse
+import operator
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Each field except `code`, `column`, `op`, `threshold` and `kind` is a translation key
+Rule = namedtuple('Rule', 'code column op threshold kind title detail action action_detail')
+
+CONCERN = 'concern'
+SUCCESS = 'success'
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+# Evaluation and display order
+RULES = [
+    Rule('low_screening', 'Screening_Coverage_%', '<', 50, CONCERN,
+         'low_screening', 'below_target', 'increase_screening', 'mobile_units'),
+    Rule('good_screening', 'Screening_Coverage_%', '>=', 70, SUCCESS,
+         'good_screening', 'meets_targets', None, None),
+    Rule('low_detection', 'Early_Detection_Rate_%', '<', 50, CONCERN,
+         'low_detection', 'advanced_stages', 'enhance_detection', 'awareness_campaigns'),
+    Rule('strong_detection', 'Early_Detection_Rate_%', '>=', 60, SUCCESS,
+         'strong_detection', 'effective_programs', None, None),
+    Rule('low_survival', 'Five_Year_Survival_%', '<', 50, CONCERN,
+         'low_survival', 'below_average', 'improve_treatment', 'strengthen_infrastructure'),
+    Rule('high_survival', 'Five_Year_Survival_%', '>=', 70, SUCCESS,
+         'high_survival', 'excellent_outcomes', None, None),
+    Rule('high_mi', 'MI_Ratio', '>', 50, CONCERN,
+         'high_mi', 'late_detection', 'reduce_mi', 'focus_quality'),
+    Rule('low_mi', 'MI_Ratio', '<', 30, SUCCESS,
+         'low_mi', 'effective_response', None, None),
+    Rule('inadequate_treatment', 'Treatment_Coverage_%', '<', 70, CONCERN,
+         'inadequate_treatment', 'not_receiving', 'expand_treatment', 'increase_centers'),
+]
+RULES_BY_CODE = {rule.code: rule for rule in RULES}
+
+
+class RuleFlags:
+    """Boolean (row x rule) matrix of every rule evaluated on every record
+
+    Missing values never trigger a rule.
+    """
+
+    def __init__(self, df, index, rules=RULES, flags=None):
+        self.rules = list(rules)
+        self.codes = [rule.code for rule in self.rules]
+        self._column = {code: j for j, code in enumerate(self.codes)}
+        self._index = index
+
+        # `flags` may be a previously computed matrix, e.g. memory-mapped
+        if flags is None:
+            flags = np.zeros((len(df), len(self.rules)), dtype=bool)
+            for j, rule in enumerate(self.rules):
+                values = df[rule.column].to_numpy(dtype=float)
+                flags[:, j] = OPERATORS[rule.op](values, rule.threshold)
+        flags.setflags(write=False)
+        self.flags = flags
+        self._country_codes = np.asarray(df['Country'].cat.codes)
+        self._country_names = np.asarray(df['Country'].cat.categories, dtype=object)
+
+    def active(self, position):
+        """Rules triggered by one record, in display order"""
+        return [rule for rule, on in zip(self.rules, self.flags[position]) if on]
+
+    def frame(self):
+        """The flags as a DataFrame indexed like the dataset"""
+        return pd.DataFrame(self.flags, columns=self.codes)
+
+    def flagged(self, code, year):
+        """Countries for which `code` fires in `year`, in name order"""
+        rows = self._index.year_rows(year)
+        hits = self.flags[rows, self._column[code]]
+        return list(self._country_names[self._country_codes[rows][hits]])
+
+    def cleared(self, code, since, year):
+        """Countries flagged by `code` in `since` but no longer in `year`"""
+        now = set(self.flagged(code, year))
+        reported = set(self._country_names[self._country_codes[self._index.year_rows(year)]])
+        return [c for c in self.flagged(code, since) if c in reported and c not in now]
+
+
+if __name__ == "__main__":
+    from dataset import Dataset
+
+    parser = argparse.ArgumentParser(description="List countries flagged by a rule")
+    parser.add_argument('rule', choices=sorted(RULES_BY_CODE))
+    parser.add_argument('year', type=int)
+    parser.add_argument('--cleared-since', type=int, metavar='YEAR',
+                        help="list countries flagged in YEAR that are clear in `year`")
+    args = parser.parse_args()
+
+    flags = Dataset.from_bundle().flags
+    if args.cleared_since is None:
+        countries = flags.flagged(args.rule, args.year)
+    else:
+        countries = flags.cleared(args.rule, args.cleared_since, args.year)
+    print("\n".join(countries))
@@ -0,0 +1,72 @@
+"""
+Startup Timing Report / Rapport de Temps de Démarrage
+Breaks a worker's cold start into imports, data load and first render.
+
+The dashboard records each phase once per process; the report is printed to
+stderr when the first script run finishes. Run `python startup.py` to measure
+a cold start headlessly.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+PHASES = ['imports', 'data_load', 'first_render']
+
+_durations = {}
+_reported = False
+
+
+@contextmanager
+def phase(name):
+    """Time a startup phase; only its first occurrence in the process counts"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _durations.setdefault(name, time.perf_counter() - start)
+
+
+def mark(name, since):
+    """Record a phase that started at `since` (a time.perf_counter() value)"""
+    _durations.setdefault(name, time.perf_counter() - since)
+
+
+def durations():
+    """{phase: seconds} recorded so far, in phase order"""
+    ordered = {name: _durations[name] for name in PHASES if name in _durations}
+    ordered.update({name: value for name, value in _durations.items() if name not in ordered})
+    return ordered
+
+
+def report():
+    """Human-readable breakdown of the recorded phases"""
+    timings = durations()
+    total = sum(timings.values())
+    lines = ["Startup timing / Temps de démarrage:"]
+    for name, seconds in timings.items():
+        share = seconds / total * 100 if total else 0
+        lines.append(f"  {name:<14} {seconds * 1000:8.1f} ms  {share:5.1f}%")
+    lines.append(f"  {'total':<14} {total * 1000:8.1f} ms")
+    return "\n".join(lines)
+
+
+def finish():
+    """Print the report once, after the first complete script run"""
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    print(report(), file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    # Cold start of the real script, without a browser or server
+    import os
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py"),
+                            default_timeout=120)
+    app.run()
+    if app.exception:
+        sys.exit(f"app.py raised: {app.exception}")
@@ -0,0 +1,161 @@
+"""
+Synthetic Data Scaler / Générateur de Données Synthétiques
+Writes datasets with the real CSV's schema, scaled to N countries x M years x K sub-units.
+
+Every synthetic country follows a real one: its starting levels and yearly
+trends are perturbed from a per-country linear fit of the real data, and the
+derived columns are recomputed the way the source computes them (cases and
+deaths from rates and population, MI ratio from mortality over incidence).
+With K > 1 each country-year is split into K sub-national rows, which the
+streaming ingestion (ingest.py) folds back into one.
+
+Usage: python synth.py OUT.csv --countries 500 --years 30 [--subunits 10] [--seed 0]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from bundle import CSV_PATH
+
+FIRST_YEAR = 2003
+
+# Columns drawn from the fitted trends, with their CSV precision
+BASE_COLUMNS = {
+    'Incidence_Rate_ASR': 4,
+    'Mortality_Rate_ASR': 3,
+    'Population_Millions': 2,
+    'Screening_Coverage_%': 1,
+    'Early_Detection_Rate_%': 1,
+    'Treatment_Coverage_%': 1,
+    'Five_Year_Survival_%': 1,
+}
+PERCENT_COLUMNS = [col for col in BASE_COLUMNS if col.endswith('%')]
+COLUMN_ORDER = [
+    'Country', 'Region', 'HDI_Category', 'Year', 'Incidence_Rate_ASR', 'Mortality_Rate_ASR',
+    'New_Cases', 'Deaths', 'MI_Ratio', 'Population_Millions', 'Screening_Coverage_%',
+    'Early_Detection_Rate_%', 'Treatment_Coverage_%', 'Five_Year_Survival_%'
+]
+
+# Countries generated and written per block, bounding memory for any N
+BLOCK_COUNTRIES = 500
+
+
+def fit_templates(csv_path=CSV_PATH):
+    """Per real country: attributes, level at the first year, yearly slope and residual spread"""
+    df = pd.read_csv(csv_path).sort_values(['Country', 'Year'])
+    templates = []
+    for country, group in df.groupby('Country', sort=True):
+        t = (group['Year'] - group['Year'].min()).to_numpy(dtype=float)
+        fit = {}
+        for col in BASE_COLUMNS:
+            values = group[col].to_numpy(dtype=float)
+            slope, intercept = np.polyfit(t, values, 1) if len(t) > 1 else (0.0, values[0])
+            spread = float(np.std(values - (intercept + slope * t)))
+            fit[col] = (float(intercept), float(slope), spread)
+        templates.append({
+            'country': country,
+            'region': group['Region'].iloc[0],
+            'hdi': group['HDI_Category'].iloc[0],
+            'fit': fit,
+        })
+    return templates
+
+
+def _country_names(templates, picks):
+    # The first copy of a template keeps the real name, later ones are numbered
+    seen = {}
+    names = []
+    for j in picks:
+        seen[j] = seen.get(j, 0) + 1
+        name = templates[j]['country']
+        names.append(name if seen[j] == 1 else f"{name} {seen[j]}")
+    return names
+
+
+def _block(templates, picks, names, years, subunits, rng):
+    """All rows of a block of synthetic countries as a DataFrame"""
+    n = len(picks)
+    t = np.arange(years, dtype=float)
+
+    # Country-level trajectories, shape (n, years)
+    series = {}
+    for col in BASE_COLUMNS:
+        intercept, slope, spread = (np.array([templates[j]['fit'][col][k] for j in picks]) for k in range(3))
+        level = intercept * rng.lognormal(0, 0.1, n)
+        trend = slope * rng.normal(1, 0.3, n)
+        noise = rng.normal(0, 1, (n, years)) * spread[:, None]
+        series[col] = level[:, None] + trend[:, None] * t + noise
+
+    # Sub-unit shares of population, fixed over time
+    shares = rng.dirichlet(np.full(subunits, 2.0), n) if subunits > 1 else np.ones((n, 1))
+
+    # Expand to (n, years, subunits) with per-sub-unit jitter
+    shape = (n, years, subunits)
+    values = {}
+    for col in BASE_COLUMNS:
+        base = np.broadcast_to(series[col][:, :, None], shape)
+        if col == 'Population_Millions':
+            values[col] = np.maximum(base, 0.1) * shares[:, None, :]
+        elif col in PERCENT_COLUMNS:
+            jitter = rng.normal(0, 2, shape) if subunits > 1 else 0
+            values[col] = np.clip(base + jitter, 0.5, 99.5)
+        else:
+            jitter = rng.lognormal(0, 0.05, shape) if subunits > 1 else 1
+            values[col] = np.maximum(base * jitter, 1.0)
+    values['Mortality_Rate_ASR'] = np.minimum(values['Mortality_Rate_ASR'], values['Incidence_Rate_ASR'] * 0.95)
+    values = {col: np.round(v, BASE_COLUMNS[col]).ravel() for col, v in values.items()}
+    values['Population_Millions'] = np.maximum(values['Population_Millions'], 0.01)
+
+    # Derived columns, computed like the source data
+    population = values['Population_Millions']
+    values['New_Cases'] = np.maximum(np.round(values['Incidence_Rate_ASR'] * population * 10), 1).astype(np.int64)
+    values['Deaths'] = np.round(values['Mortality_Rate_ASR'] * population * 10).astype(np.int64)
+    values['MI_Ratio'] = np.round(values['Mortality_Rate_ASR'] / values['Incidence_Rate_ASR'] * 100, 2)
+
+    rows_per_country = years * subunits
+    values['Country'] = np.repeat(names, rows_per_country)
+    values['Region'] = np.repeat([templates[j]['region'] for j in picks], rows_per_country)
+    values['HDI_Category'] = np.repeat([templates[j]['hdi'] for j in picks], rows_per_country)
+    values['Year'] = np.tile(np.repeat(FIRST_YEAR + np.arange(years), subunits), n)
+    return pd.DataFrame(values)[COLUMN_ORDER]
+
+
+def generate(out_path, countries, years, subunits=1, seed=0, csv_path=CSV_PATH):
+    """Write a synthetic CSV and return its row count
+
+    The first min(countries, real countries) synthetic countries follow
+    distinct real ones; beyond that, templates are drawn at random.
+    """
+    rng = np.random.default_rng(seed)
+    templates = fit_templates(csv_path)
+    distinct = rng.permutation(len(templates))[:countries]
+    extra = rng.integers(0, len(templates), max(countries - len(templates), 0))
+    picks = np.concatenate([distinct, extra])
+    names = _country_names(templates, picks)
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    rows = 0
+    with open(out_path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, countries, BLOCK_COUNTRIES):
+            block = slice(start, start + BLOCK_COUNTRIES)
+            frame = _block(templates, picks[block], names[block], years, subunits, rng)
+            frame.to_csv(f, index=False, header=start == 0)
+            rows += len(frame)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a scaled synthetic dataset")
+    parser.add_argument('out')
+    parser.add_argument('--countries', type=int, default=90)
+    parser.add_argument('--years', type=int, default=21)
+    parser.add_argument('--subunits', type=int, default=1, help="rows per country and year")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rows = generate(args.out, args.countries, args.years, args.subunits, args.seed)
+    print(f"Wrote {rows:,} rows ({args.countries} countries x {args.years} years x "
+          f"{args.subunits} sub-units) to {args.out}")
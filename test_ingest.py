@@ -0,0 +1,88 @@
+"""
+Ingestion Tests / Tests d'Ingestion
+How several source rows of one country-year are reduced (see ingest.py).
+
+Usage: python -m pytest test_ingest.py
+"""
+
+import pandas as pd
+import pytest
+
+from bundle import CSV_PATH, INDICATOR_COLUMNS
+from ingest import PERIOD_COLUMN, stream_country_years
+
+
+@pytest.fixture(scope='module')
+def source():
+    return pd.read_csv(CSV_PATH)
+
+
+def _record(source, country='Benin', year=2023):
+    return source[(source['Country'] == country) & (source['Year'] == year)]
+
+
+def _reduce(tmp_path, frame, chunksize=250_000):
+    path = tmp_path / 'extract.csv'
+    frame.to_csv(path, index=False)
+    reduced, _, _ = stream_country_years(str(path), chunksize)
+    return reduced.set_index(['Country', 'Year'])
+
+
+def _halves(record, periods=False):
+    """Two rows of a record splitting its cases, deaths and, unless `periods`, population"""
+    first, second = record.copy(), record.copy()
+    for half, share in ((first, 0.4), (second, 0.6)):
+        half['New_Cases'] = (record['New_Cases'] * share).round().astype('int64')
+        half['Deaths'] = (record['Deaths'] * share).round().astype('int64')
+        if not periods:
+            half['Population_Millions'] = record['Population_Millions'] * share
+    second['Deaths'] = record['Deaths'] - first['Deaths']
+    second['New_Cases'] = record['New_Cases'] - first['New_Cases']
+    return first, second
+
+
+def test_single_rows_are_unchanged(tmp_path, source):
+    reduced = _reduce(tmp_path, source).reset_index(drop=True)
+    expected = source.sort_values(['Country', 'Year']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(reduced[INDICATOR_COLUMNS], expected[INDICATOR_COLUMNS])
+
+
+def test_repeated_row_counts_once_beside_a_distinct_sub_unit(tmp_path, source):
+    record = _record(source)
+    first, second = _halves(record)
+    others = source[source['Country'] != 'Benin']
+    # The repeat sits in another chunk than the row it repeats
+    reduced = _reduce(tmp_path, pd.concat([others, first, second, first]), chunksize=len(others) + 1)
+    row = reduced.loc[('Benin', 2023)]
+    assert row['New_Cases'] == record['New_Cases'].iloc[0]
+    assert row['Deaths'] == record['Deaths'].iloc[0]
+    assert row['Population_Millions'] == pytest.approx(record['Population_Millions'].iloc[0])
+
+
+def test_sub_units_add_up_population(tmp_path, source):
+    record = _record(source)
+    reduced = _reduce(tmp_path, pd.concat(_halves(record)))
+    row = reduced.loc[('Benin', 2023)]
+    assert row['Population_Millions'] == pytest.approx(record['Population_Millions'].iloc[0])
+    assert row['Incidence_Rate_ASR'] == pytest.approx(record['Incidence_Rate_ASR'].iloc[0])
+    assert row['MI_Ratio'] == pytest.approx(record['Mortality_Rate_ASR'].iloc[0]
+                                            / record['Incidence_Rate_ASR'].iloc[0] * 100)
+
+
+def test_periods_average_population(tmp_path, source):
+    record = _record(source)
+    first, second = _halves(record, periods=True)
+    # Identical values in two periods are not repeats
+    rows = pd.concat([first.assign(**{PERIOD_COLUMN: 1}), second.assign(**{PERIOD_COLUMN: 2}),
+                      first.assign(**{PERIOD_COLUMN: 3})])
+    row = _reduce(tmp_path, rows).loc[('Benin', 2023)]
+    assert row['Population_Millions'] == pytest.approx(record['Population_Millions'].iloc[0])
+    assert row['New_Cases'] == record['New_Cases'].iloc[0] + first['New_Cases'].iloc[0]
+
+
+def test_blank_count_loads_as_missing(tmp_path, source):
+    frame = source.astype({'New_Cases': object})
+    frame.loc[_record(source).index, 'New_Cases'] = ''
+    row = _reduce(tmp_path, frame).loc[('Benin', 2023)]
+    assert pd.isna(row['New_Cases'])
+    assert row['Deaths'] == _record(source)['Deaths'].iloc[0]
@@ -0,0 +1,602 @@
+"""
+Dashboard Translations / Traductions du Tableau de Bord
+English and French text shared by the dashboard and the batch report generator.
+"""
+
+# Translation dictionary / Dictionnaire de traductions
+TRANSLATIONS = {
+    'en': {
+        # Header
+        'main_title': 'Pink Board : 🎗️ Breast Cancer Global Statistics Dashboard',
+        'subtitle': 'Raising Awareness Through Data | October Breast Cancer Awareness Month',
+        
+        # Sidebar
+        'filters_title': '🔍 Filters & Settings',
+        'language': 'Language',
+        'select_country': 'Select Country',
+        'select_year': 'Select Year',
+        'data_anomalies': 'data anomalies',
+        'check_mi_ratio': 'MI ratio ≠ mortality / incidence',
+        'check_deaths_over_cases': 'Deaths above new cases',
+        'check_percent_range': 'Percentages outside 0-100',
+        'check_repeated_row': 'Repeated rows (dropped)',
+        'check_missing_value': 'Blank country, year, cases or deaths',
+        'check_not_a_number': 'Cells that are not numbers',
+        'check_duplicate_key': 'Country-years with more rows than usual',
+        'check_inconsistent_attributes': 'Countries with several regions or HDI categories',
+        'anomalies_note': 'Found while loading the data. Exact repeats of a row are dropped and the rows of a country-year are combined (see ingest.py); a country keeps the region and HDI category of its first row.',
+        'anomaly_report': 'Download the anomaly report (JSON)',
+        'show_comparison': 'Show Global Comparison',
+        'show_trends': 'Show Historical Trends',
+        'show_recommendations': 'Show Recommendations',
+        
+        # Main metrics
+        'statistics_title': 'Breast Cancer Statistics',
+        'incidence_rate': 'Incidence Rate (ASR)',
+        'mortality_rate': 'Mortality Rate (ASR)',
+        'new_cases': 'New Cases',
+        'deaths': 'Deaths',
+        'incidence_help': 'Age-Standardized Rate per 100,000 population',
+        'mortality_help': 'Age-Standardized Mortality Rate per 100,000',
+        'cases_help': 'Total new breast cancer cases diagnosed',
+        'deaths_help': 'Total deaths from breast cancer',
+        
+        # Key indicators
+        'key_indicators': '🔑 Key Health Indicators',
+        'screening_coverage': 'Screening Coverage',
+        'early_detection': 'Early Detection Rate',
+        'treatment_coverage': 'Treatment Coverage',
+        'survival_rate': '5-Year Survival Rate',
+        'vs_target': 'vs target',
+        
+        # MI Ratio
+        'mi_ratio': 'Mortality-to-Incidence (MI) Ratio',
+        'mi_help': 'Lower is better. Indicates healthcare system effectiveness',
+        'status': 'Status',
+        'target': 'Target',
+        'good': '🟢 Good',
+        'moderate': '🟡 Moderate',
+        'high': '🔴 High',
+        
+        # Descriptive stats
+        'desc_stats': '📈 Descriptive Statistics',
+        'country_profile': '👥 Country Profile',
+        'region': 'Region',
+        'hdi_category': 'HDI Category',
+        'population': 'Population',
+        'millions': 'millions',
+        'calculated_metrics': '🔢 Calculated Metrics',
+        'case_fatality': 'Case Fatality Rate',
+        'cases_per_million': 'Cases per Million',
+        'deaths_per_million': 'Deaths per Million',
+        
+        # Visual indicators
+        'visual_indicators': '📊 Visual Indicators',
+        'screening': 'Screening',
+        'detection': 'Detection',
+        'treatment': 'Treatment',
+        'survival': 'Survival',
+        
+        # Trends
+        'historical_trends': '📈 Historical Trends',
+        'incidence_mortality': 'Incidence & Mortality',
+        'year': 'Year',
+        'rate_per_100k': 'Rate per 100,000',
+        'coverage_pct': 'Coverage (%)',
+        'survival_pct': 'Survival Rate (%)',
+        'mi_ratio_pct': 'MI Ratio (%)',
+        'trend_title': 'Indicator Evolution',
+        'objective': 'Target',
+        'critical_threshold': 'Critical Threshold',
+        'show_projection': 'Project trends to 2030',
+        'projection': 'Projected trend',
+        'prediction_interval': '95% prediction interval',
+        'projection_title': '🔮 Outlook for',
+        'projection_note': 'Straight-line trends fitted to every year with data and carried forward; the shaded band is where 95% of outcomes would fall if the trend holds. Projections are not forecasts of policy effects.',
+        
+        # Changes
+        'survival_change': 'Survival Change',
+        'screening_change': 'Screening Change',
+        'incidence_change': 'Incidence Change',
+        'mi_change': 'MI Ratio Change',
+        'change_from': 'Change from',
+        'to': 'to',
+        
+        # Comparison
+        'global_comparison': '🌍 Global Comparison',
+        'key_metrics_vs_global': 'Key Metrics vs Global Average',
+        'global_average': 'Global Average',
+        'global_weighted_average': 'Global Average (weighted)',
+        'region_average': 'Regional Average',
+        'averages': 'Averages',
+        'unweighted': 'One vote per country',
+        'weighted': 'Weighted by population / patients',
+        'weighting_help': 'Weighted averages count incidence, mortality and screening by population, and survival, detection, treatment and MI ratio by new cases.',
+        'region_comparison': '🌐 Comparison by Region',
+        'health_metrics_region': 'Healthcare Metrics by Region',
+        'percentage': 'Percentage (%)',
+        'hdi_comparison': '📊 Comparison by HDI Category',
+        'health_metrics_hdi': 'Healthcare Metrics by HDI Category',
+        'country_ranking': 'Where does',
+        'rank': 'rank?',
+        'survival_rank': 'Survival Rate Rank',
+        'screening_rank': 'Screening Coverage Rank',
+        'survival_percentile': 'Survival Percentile',
+        'all_ranks': 'Rank on Every Indicator',
+        'indicator': 'Indicator',
+        'rank_col': 'Rank',
+        'percentile': 'Percentile',
+        'rank_change': 'Rank Change',
+        'rank_history': 'Rank History',
+        'rank_note': 'Rank 1 is the best value: the lowest for incidence, mortality and MI Ratio, the highest for the coverage and survival rates. New cases, deaths and population have no better value and rank largest first. Ties share the best rank. Rank change counts places gained from',
+        
+        # Recommendations
+        'insights_recommendations': '💡 Key Insights & Recommendations',
+        'positive_aspects': '✅ Positive Aspects',
+        'areas_attention': '⚠️ Areas Requiring Attention',
+        'actionable_recommendations': '🎯 Actionable Recommendations',
+        'general_recommendations': 'General Recommendations for Improvement:',
+        'outreach_cohorts': '👥 Countries Sharing These Concerns',
+        'countries_in': 'countries in',
+        'cleared_since': 'No longer flagged since',
+        
+        # Concerns
+        'low_screening': 'Low Screening Coverage',
+        'below_target': 'Significantly below the recommended 70% target',
+        'low_detection': 'Low Early Detection',
+        'advanced_stages': 'Majority of cases detected at advanced stages',
+        'low_survival': 'Low Survival Rate',
+        'below_average': 'Below global average, indicating treatment gaps',
+        'high_mi': 'High MI Ratio',
+        'late_detection': 'Indicates late detection and/or inadequate treatment',
+        'inadequate_treatment': 'Inadequate Treatment Coverage',
+        'not_receiving': 'Many diagnosed patients not receiving treatment',
+        
+        # Successes
+        'good_screening': 'Good Screening Coverage',
+        'meets_targets': 'Meets or exceeds recommended targets',
+        'strong_detection': 'Strong Early Detection',
+        'effective_programs': 'Effective early detection programs in place',
+        'high_survival': 'High Survival Rate',
+        'excellent_outcomes': 'Excellent treatment outcomes',
+        'low_mi': 'Low MI Ratio',
+        'effective_response': 'Effective healthcare system response',
+        
+        # Actions
+        'increase_screening': '📍 Increase Screening Programs',
+        'mobile_units': 'Implement mobile screening units in rural areas and provide free mammography services',
+        'enhance_detection': '📍 Enhance Early Detection',
+        'awareness_campaigns': 'Launch awareness campaigns about breast self-examination and clinical breast exams',
+        'improve_treatment': '📍 Improve Treatment Access',
+        'strengthen_infrastructure': 'Strengthen healthcare infrastructure and ensure availability of cancer drugs',
+        'reduce_mi': '📍 Reduce MI Ratio',
+        'focus_quality': 'Focus on both early detection and treatment quality improvements',
+        'expand_treatment': '📍 Expand Treatment Access',
+        'increase_centers': 'Increase oncology centers and train more healthcare professionals',
+        
+        # General recommendations
+        'rec_1': '1. Public Awareness: Conduct regular breast cancer awareness campaigns, especially during October',
+        'rec_2': '2. Education: Educate women about breast self-examination and early warning signs',
+        'rec_3': '3. Healthcare Infrastructure: Invest in diagnostic equipment and treatment facilities',
+        'rec_4': '4. Training: Train healthcare workers in breast cancer detection and treatment',
+        'rec_5': '5. Policy: Implement national breast cancer screening guidelines and programs',
+        'rec_6': '6. Support Groups: Establish patient support networks for emotional and practical assistance',
+        'rec_7': '7. Research: Support local research on breast cancer patterns and effective interventions',
+        'rec_8': '8. Affordability: Make screening and treatment financially accessible to all women',
+        
+        # Understanding data
+        'understanding_data': '📖 Understanding the Data',
+        'what_metrics_mean': '📊 What do these metrics mean?',
+        'how_interpret': '🔍 How to interpret these findings?',
+        
+        # Metric definitions
+        'def_incidence': 'Incidence Rate (ASR): Number of new breast cancer cases per 100,000 women, adjusted for age differences',
+        'def_mortality': 'Mortality Rate (ASR): Number of deaths from breast cancer per 100,000 women, adjusted for age differences',
+        'def_mi_ratio': 'MI Ratio: Mortality-to-Incidence ratio. Lower is better. High ratio suggests late detection or treatment gaps.',
+        'mi_excellent': '< 30%: Excellent healthcare response',
+        'mi_moderate': '30-50%: Moderate, room for improvement',
+        'mi_concerning': '> 50%: Concerning, indicates significant healthcare challenges',
+        'def_screening': 'Screening Coverage: Percentage of target population receiving regular breast cancer screening',
+        'def_detection': 'Early Detection Rate: Percentage of cases detected at early stages (Stage I-II)',
+        'def_treatment': 'Treatment Coverage: Percentage of diagnosed patients receiving appropriate treatment',
+        'def_survival': '5-Year Survival Rate: Percentage of patients alive 5 years after diagnosis',
+        
+        # Interpretation
+        'low_resource': 'For Low-Resource Settings:',
+        'low_resource_1': '- Focus on improving screening coverage as a priority',
+        'low_resource_2': '- Invest in early detection programs (most cost-effective)',
+        'low_resource_3': '- Ensure basic treatment availability before advanced therapies',
+        'medium_resource': 'For Medium-Resource Settings:',
+        'medium_resource_1': '- Maintain and expand screening programs',
+        'medium_resource_2': '- Focus on treatment quality and consistency',
+        'medium_resource_3': '- Reduce disparities between urban and rural areas',
+        'high_resource': 'For High-Resource Settings:',
+        'high_resource_1': '- Optimize screening protocols (avoid over-screening)',
+        'high_resource_2': '- Focus on personalized medicine and advanced treatments',
+        'high_resource_3': '- Address health equity gaps',
+        'red_flags': 'Red Flags:',
+        'red_flag_1': '- MI Ratio > 50%: Urgent need for healthcare system improvements',
+        'red_flag_2': '- Screening < 30%: Critical shortage of screening services',
+        'red_flag_3': '- Survival < 40%: Systemic healthcare challenges',
+        
+        # Footer
+        'footer_awareness': '🎗️ Breast Cancer Awareness Month - October 2025',
+        'footer_detection': 'Early detection saves lives. Regular screening is crucial.',
+        'footer_source': 'Data Source: Global Breast Cancer Statistics (2003-2023)',
+        'footer_source1': '[NB: Some of the data were generated for analysis purposes.]',
+        'footer_purpose': 'Created for awareness and education purposes | GitHub Repository',
+        'footer_author': 'Author : Consolas HODONOU | Data Scientist| E-mail : nevinashodonou@gmail.com',
+        
+        # Sidebar info
+        'about_dashboard': 'About This Dashboard',
+        'about_text': 'This interactive dashboard provides comprehensive breast cancer statistics from 2003-2023 for 90 countries worldwide.',
+        'how_use': 'How to Use:',
+        'how_use_1': '1. Select a country from the dropdown',
+        'how_use_2': '2. Choose a year to analyze',
+        'how_use_3': '3. Toggle comparison and trend views',
+        'how_use_4': '4. Review recommendations',
+        'purpose': 'Purpose:',
+        'purpose_text': 'Raise awareness about breast cancer and help inform evidence-based interventions.',
+        'october_awareness': 'October is Breast Cancer Awareness Month 🎗️',
+        'early_detection_saves': '💪 Early detection saves lives!',
+        
+        # World map
+        'show_map': 'Show World Map',
+        'world_map': '🗺️ World Map',
+        'map_indicator': 'Map indicator',
+        'map_note': 'Drag the slider or press ▶ to move through the years; grey countries have no data.',
+        
+        # Multi-country overlay
+        'show_overlay': 'Compare Several Countries',
+        'overlay_title': '🌍 Multi-Country Comparison',
+        'overlay_countries': 'Countries to compare',
+        'overlay_indicator': 'Indicator',
+        'overlay_add_region': 'Add countries of the same region',
+        'overlay_pick': 'Pick at least one country to compare.',
+        'overlay_small_multiples': 'One panel per country for selections larger than',
+        'selection_median': 'Selection median',
+        
+        # Trend leaderboards
+        'per_year': 'yr',
+        'show_leaderboards': 'Show Trend Leaderboards',
+        'leaderboards': '🏁 Fastest Improving & Worsening Countries',
+        'leaderboard_indicator': 'Indicator',
+        'leaderboard_size': 'Countries',
+        'leaderboard_region': 'Same region only',
+        'fastest_improving': 'Fastest improving',
+        'fastest_worsening': 'Fastest worsening',
+        'slope': 'Slope',
+        'cagr': 'Annual growth (CAGR)',
+        'leaderboard_empty': 'No country moved this way.',
+        'leaderboard_note': 'Slope is the least-squares trend over every year with data (at least 3); R² shows how straight the trend is. For incidence, mortality and MI Ratio, improving means falling. Raw counts are not ranked, as they grow with population. Click a column header to sort.',
+        
+        # Peer finder
+        'show_peers': 'Find Similar Countries',
+        'peers_title': '🧭 Similar Countries',
+        'peer_years_back': 'Years back',
+        'peer_count': 'Peers',
+        'peer_indicator': 'Trajectory indicator',
+        'peer_distance': 'Distance',
+        'peers_like': 'Countries most like',
+        'peers_in': 'as they were in',
+        'peers_none': 'No comparable countries for this year.',
+        'peers_note': 'Similarity compares screening, early detection, treatment, survival, MI ratio and HDI category, each standardized across all countries and years (smaller distance = more similar). Δ columns show how each peer changed from its matching year to its latest year; the chart follows them from',
+        
+        # Performance debug panel
+        'perf_debug': '⏱️ Performance debug',
+        'perf_this_run': 'This run',
+        'perf_recent': 'Recent runs (this server process)',
+        'perf_span': 'Span',
+        
+        # Error
+        'no_data': 'No data available for',
+        'in': 'in',
+    },
+    
+    'fr': {
+        # Header
+        'main_title': 'Pink Board : 🎗️ Tableau de Bord des Statistiques Mondiales sur le Cancer du Sein',
+        'subtitle': 'Sensibilisation par les Données | Octobre - Mois de Sensibilisation au Cancer du Sein',
+        
+        # Sidebar
+        'filters_title': '🔍 Filtres & Paramètres',
+        'language': 'Langue',
+        'select_country': 'Sélectionner un Pays',
+        'select_year': 'Sélectionner une Année',
+        'data_anomalies': 'anomalies dans les données',
+        'check_mi_ratio': 'Ratio MI ≠ mortalité / incidence',
+        'check_deaths_over_cases': 'Décès supérieurs aux nouveaux cas',
+        'check_percent_range': 'Pourcentages hors de 0-100',
+        'check_repeated_row': 'Lignes répétées (ignorées)',
+        'check_missing_value': 'Pays, année, cas ou décès vides',
+        'check_not_a_number': 'Cellules qui ne sont pas des nombres',
+        'check_duplicate_key': 'Pays-années avec plus de lignes que d\'habitude',
+        'check_inconsistent_attributes': 'Pays avec plusieurs régions ou catégories IDH',
+        'anomalies_note': 'Détectées au chargement des données. Les répétitions exactes d\'une ligne sont ignorées et les lignes d\'un pays-année sont combinées (voir ingest.py) ; un pays garde la région et la catégorie IDH de sa première ligne.',
+        'anomaly_report': 'Télécharger le rapport d\'anomalies (JSON)',
+        'show_comparison': 'Afficher la Comparaison Mondiale',
+        'show_trends': 'Afficher les Tendances Historiques',
+        'show_recommendations': 'Afficher les Recommandations',
+        
+        # Main metrics
+        'statistics_title': 'Statistiques du Cancer du Sein',
+        'incidence_rate': 'Taux d\'Incidence (TSA)',
+        'mortality_rate': 'Taux de Mortalité (TSA)',
+        'new_cases': 'Nouveaux Cas',
+        'deaths': 'Décès',
+        'incidence_help': 'Taux Standardisé par Âge pour 100 000 habitants',
+        'mortality_help': 'Taux de Mortalité Standardisé par Âge pour 100 000 habitants',
+        'cases_help': 'Total des nouveaux cas de cancer du sein diagnostiqués',
+        'deaths_help': 'Total des décès dus au cancer du sein',
+        
+        # Key indicators
+        'key_indicators': '🔑 Indicateurs Clés de Santé',
+        'screening_coverage': 'Couverture du Dépistage',
+        'early_detection': 'Taux de Détection Précoce',
+        'treatment_coverage': 'Couverture du Traitement',
+        'survival_rate': 'Taux de Survie à 5 Ans',
+        'vs_target': 'vs objectif',
+        
+        # MI Ratio
+        'mi_ratio': 'Ratio Mortalité-Incidence (MI)',
+        'mi_help': 'Plus bas est meilleur. Indique l\'efficacité du système de santé',
+        'status': 'Statut',
+        'target': 'Objectif',
+        'good': '🟢 Bon',
+        'moderate': '🟡 Modéré',
+        'high': '🔴 Élevé',
+        
+        # Descriptive stats
+        'desc_stats': '📈 Statistiques Descriptives',
+        'country_profile': '👥 Profil du Pays',
+        'region': 'Région',
+        'hdi_category': 'Catégorie IDH',
+        'population': 'Population',
+        'millions': 'millions',
+        'calculated_metrics': '🔢 Métriques Calculées',
+        'case_fatality': 'Taux de Létalité',
+        'cases_per_million': 'Cas par Million',
+        'deaths_per_million': 'Décès par Million',
+        
+        # Visual indicators
+        'visual_indicators': '📊 Indicateurs Visuels',
+        'screening': 'Dépistage',
+        'detection': 'Détection',
+        'treatment': 'Traitement',
+        'survival': 'Survie',
+        
+        # Trends
+        'historical_trends': '📈 Tendances Historiques',
+        'incidence_mortality': 'Incidence & Mortalité',
+        'year': 'Année',
+        'rate_per_100k': 'Taux pour 100 000',
+        'coverage_pct': 'Couverture (%)',
+        'survival_pct': 'Taux de Survie (%)',
+        'mi_ratio_pct': 'Ratio MI (%)',
+        'trend_title': 'Évolution des Indicateurs',
+        'objective': 'Objectif',
+        'critical_threshold': 'Seuil Critique',
+        'show_projection': 'Projeter les tendances jusqu\'en 2030',
+        'projection': 'Tendance projetée',
+        'prediction_interval': 'Intervalle de prédiction à 95 %',
+        'projection_title': '🔮 Perspectives pour',
+        'projection_note': 'Tendances linéaires ajustées sur toutes les années disponibles et prolongées ; la bande ombrée est l\'intervalle où tomberaient 95 % des résultats si la tendance se maintient. Les projections ne prévoient pas l\'effet des politiques.',
+        
+        # Changes
+        'survival_change': 'Changement de Survie',
+        'screening_change': 'Changement de Dépistage',
+        'incidence_change': 'Changement d\'Incidence',
+        'mi_change': 'Changement du Ratio MI',
+        'change_from': 'Changement de',
+        'to': 'à',
+        
+        # Comparison
+        'global_comparison': '🌍 Comparaison Mondiale',
+        'key_metrics_vs_global': 'Indicateurs Clés vs Moyenne Mondiale',
+        'global_average': 'Moyenne Mondiale',
+        'global_weighted_average': 'Moyenne Mondiale (pondérée)',
+        'region_average': 'Moyenne Régionale',
+        'averages': 'Moyennes',
+        'unweighted': 'Une voix par pays',
+        'weighted': 'Pondérées par population / patientes',
+        'weighting_help': 'Les moyennes pondérées comptent l\'incidence, la mortalité et le dépistage selon la population, et la survie, la détection, le traitement et le ratio MI selon les nouveaux cas.',
+        'region_comparison': '🌐 Comparaison par Région',
+        'health_metrics_region': 'Indicateurs de Santé par Région',
+        'percentage': 'Pourcentage (%)',
+        'hdi_comparison': '📊 Comparaison par Catégorie de l\'IDH',
+        'health_metrics_hdi': 'Indicateurs de Santé par Catégorie IDH',
+        'country_ranking': 'Où se classe',
+        'rank': '?',
+        'survival_rank': 'Classement Taux de Survie',
+        'screening_rank': 'Classement Couverture Dépistage',
+        'survival_percentile': 'Percentile de Survie',
+        'all_ranks': 'Classement sur Tous les Indicateurs',
+        'indicator': 'Indicateur',
+        'rank_col': 'Rang',
+        'percentile': 'Percentile',
+        'rank_change': 'Évolution du Rang',
+        'rank_history': 'Historique du Rang',
+        'rank_note': 'Le rang 1 correspond à la meilleure valeur : la plus faible pour l\'incidence, la mortalité et le Ratio MI, la plus élevée pour les taux de couverture et de survie. Les nouveaux cas, les décès et la population n\'ont pas de meilleure valeur et sont classés du plus grand au plus petit. Les ex aequo partagent le meilleur rang. L\'évolution compte les places gagnées de',
+        
+        # Recommendations
+        'insights_recommendations': '💡 Principales Observations & Recommandations',
+        'positive_aspects': '✅ Aspects Positifs',
+        'areas_attention': '⚠️ Domaines Nécessitant une Attention',
+        'actionable_recommendations': '🎯 Recommandations Concrètes',
+        'general_recommendations': 'Recommandations Générales pour l\'Amélioration :',
+        'outreach_cohorts': '👥 Pays Partageant ces Préoccupations',
+        'countries_in': 'pays en',
+        'cleared_since': 'Ne sont plus signalés depuis',
+        
+        # Concerns
+        'low_screening': 'Faible Couverture du Dépistage',
+        'below_target': 'Significativement en dessous de l\'objectif recommandé de 70%',
+        'low_detection': 'Faible Détection Précoce',
+        'advanced_stages': 'La majorité des cas détectés à des stades avancés',
+        'low_survival': 'Faible Taux de Survie',
+        'below_average': 'En dessous de la moyenne mondiale, indiquant des lacunes dans le traitement',
+        'high_mi': 'Ratio MI Élevé',
+        'late_detection': 'Indique une détection tardive et/ou un traitement inadéquat',
+        'inadequate_treatment': 'Couverture de Traitement Inadéquate',
+        'not_receiving': 'De nombreux patients diagnostiqués ne reçoivent pas de traitement',
+        
+        # Successes
+        'good_screening': 'Bonne Couverture du Dépistage',
+        'meets_targets': 'Atteint ou dépasse les objectifs recommandés',
+        'strong_detection': 'Détection Précoce Efficace',
+        'effective_programs': 'Programmes de détection précoce performants en place',
+        'high_survival': 'Taux de Survie Élevé',
+        'excellent_outcomes': 'Excellents résultats de traitement',
+        'low_mi': 'Ratio MI Faible',
+        'effective_response': 'Réponse efficace du système de santé',
+        
+        # Actions
+        'increase_screening': '📍 Augmenter les Programmes de Dépistage',
+        'mobile_units': 'Mettre en place des unités mobiles de dépistage dans les zones rurales et offrir des mammographies gratuites',
+        'enhance_detection': '📍 Améliorer la Détection Précoce',
+        'awareness_campaigns': 'Lancer des campagnes de sensibilisation sur l\'autopalpation mammaire et les examens cliniques',
+        'improve_treatment': '📍 Améliorer l\'Accès aux Traitements',
+        'strengthen_infrastructure': 'Renforcer les infrastructures de santé et assurer la disponibilité des médicaments anticancéreux',
+        'reduce_mi': '📍 Réduire le Ratio MI',
+        'focus_quality': 'Se concentrer sur l\'amélioration de la détection précoce et de la qualité des traitements',
+        'expand_treatment': '📍 Élargir l\'Accès aux Traitements',
+        'increase_centers': 'Augmenter les centres d\'oncologie et former davantage de professionnels de santé',
+        
+        # General recommendations
+        'rec_1': '1. Sensibilisation Publique : Mener régulièrement des campagnes de sensibilisation au cancer du sein, en particulier en octobre',
+        'rec_2': '2. Éducation : Éduquer les femmes sur l\'autopalpation mammaire et les signes d\'alerte précoces',
+        'rec_3': '3. Infrastructure de Santé : Investir dans les équipements de diagnostic et les installations de traitement',
+        'rec_4': '4. Formation : Former les professionnels de santé à la détection et au traitement du cancer du sein',
+        'rec_5': '5. Politique : Mettre en œuvre des directives et programmes nationaux de dépistage du cancer du sein',
+        'rec_6': '6. Groupes de Soutien : Établir des réseaux de soutien aux patients pour l\'assistance émotionnelle et pratique',
+        'rec_7': '7. Recherche : Soutenir la recherche locale sur les tendances du cancer du sein et les interventions efficaces',
+        'rec_8': '8. Accessibilité Financière : Rendre le dépistage et le traitement financièrement accessibles à toutes les femmes',
+        
+        # Understanding data
+        'understanding_data': '📖 Comprendre les Données',
+        'what_metrics_mean': '📊 Que signifient ces indicateurs ?',
+        'how_interpret': '🔍 Comment interpréter ces résultats ?',
+        
+        # Metric definitions
+        'def_incidence': 'Taux d\'Incidence (TSA) : Nombre de nouveaux cas de cancer du sein pour 100 000 femmes, ajusté pour les différences d\'âge',
+        'def_mortality': 'Taux de Mortalité (TSA) : Nombre de décès dus au cancer du sein pour 100 000 femmes, ajusté pour les différences d\'âge',
+        'def_mi_ratio': 'Ratio MI : Ratio Mortalité-Incidence. Plus bas est meilleur. Un ratio élevé suggère une détection tardive ou des lacunes dans le traitement.',
+        'mi_excellent': '< 30% : Excellente réponse du système de santé',
+        'mi_moderate': '30-50% : Modéré, possibilité d\'amélioration',
+        'mi_concerning': '> 50% : Préoccupant, indique des défis importants dans le système de santé',
+        'def_screening': 'Couverture du Dépistage : Pourcentage de la population cible recevant un dépistage régulier du cancer du sein',
+        'def_detection': 'Taux de Détection Précoce : Pourcentage de cas détectés aux stades précoces (Stade I-II)',
+        'def_treatment': 'Couverture du Traitement : Pourcentage de patients diagnostiqués recevant un traitement approprié',
+        'def_survival': 'Taux de Survie à 5 Ans : Pourcentage de patients vivants 5 ans après le diagnostic',
+        
+        # Interpretation
+        'low_resource': 'Pour les Contextes à Faibles Ressources :',
+        'low_resource_1': '- Se concentrer sur l\'amélioration de la couverture du dépistage comme priorité',
+        'low_resource_2': '- Investir dans les programmes de détection précoce (le plus rentable)',
+        'low_resource_3': '- Assurer la disponibilité des traitements de base avant les thérapies avancées',
+        'medium_resource': 'Pour les Contextes à Ressources Moyennes :',
+        'medium_resource_1': '- Maintenir et élargir les programmes de dépistage',
+        'medium_resource_2': '- Se concentrer sur la qualité et la cohérence des traitements',
+        'medium_resource_3': '- Réduire les disparités entre zones urbaines et rurales',
+        'high_resource': 'Pour les Contextes à Ressources Élevées :',
+        'high_resource_1': '- Optimiser les protocoles de dépistage (éviter le sur-dépistage)',
+        'high_resource_2': '- Se concentrer sur la médecine personnalisée et les traitements avancés',
+        'high_resource_3': '- Aborder les écarts d\'équité en santé',
+        'red_flags': 'Signaux d\'Alarme :',
+        'red_flag_1': '- Ratio MI > 50% : Besoin urgent d\'amélioration du système de santé',
+        'red_flag_2': '- Dépistage < 30% : Pénurie critique des services de dépistage',
+        'red_flag_3': '- Survie < 40% : Défis systémiques dans le système de santé',
+        
+        # Footer
+        'footer_awareness': '🎗️ Mois de Sensibilisation au Cancer du Sein - Octobre 2025',
+        'footer_detection': 'La détection précoce sauve des vies. Le dépistage régulier est crucial.',
+        'footer_source': 'Source des Données : Statistiques Mondiales du Cancer du Sein (2003-2023)', 
+        'footer_source1': '[NB: Une partie des données a été générée dans un but analytique.]',
+        'footer_purpose': 'Créé à des fins de sensibilisation et d\'éducation | Dépôt GitHub',
+        'footer_author': 'Auteure : Consolas HODONOU | Data Scientist| E-mail : nevinashodonou@gmail.com',
+        
+        # Sidebar info
+        'about_dashboard': 'À Propos de ce Tableau de Bord',
+        'about_text': 'Ce tableau de bord interactif fournit des statistiques complètes sur le cancer du sein de 2003 à 2023 pour 90 pays dans le monde.',
+        'how_use': 'Comment Utiliser :',
+        'how_use_1': '1. Sélectionnez un pays dans la liste déroulante',
+        'how_use_2': '2. Choisissez une année à analyser',
+        'how_use_3': '3. Activez/désactivez les vues de comparaison et de tendances',
+        'how_use_4': '4. Consultez les recommandations',
+        'purpose': 'Objectif :',
+        'purpose_text': 'Sensibiliser au cancer du sein et contribuer à éclairer les interventions fondées sur des preuves.',
+        'october_awareness': 'Octobre est le Mois de Sensibilisation au Cancer du Sein 🎗️',
+        'early_detection_saves': '💪 La détection précoce sauve des vies !',
+        
+        # World map
+        'show_map': 'Afficher la Carte du Monde',
+        'world_map': '🗺️ Carte du Monde',
+        'map_indicator': 'Indicateur de la carte',
+        'map_note': 'Faites glisser le curseur ou appuyez sur ▶ pour parcourir les années ; les pays en gris n\'ont pas de données.',
+        
+        # Multi-country overlay
+        'show_overlay': 'Comparer Plusieurs Pays',
+        'overlay_title': '🌍 Comparaison Multi-Pays',
+        'overlay_countries': 'Pays à comparer',
+        'overlay_indicator': 'Indicateur',
+        'overlay_add_region': 'Ajouter les pays de la même région',
+        'overlay_pick': 'Choisissez au moins un pays à comparer.',
+        'overlay_small_multiples': 'Un panneau par pays pour les sélections de plus de',
+        'selection_median': 'Médiane de la sélection',
+        
+        # Classements des tendances
+        'per_year': 'an',
+        'show_leaderboards': 'Afficher les Classements des Tendances',
+        'leaderboards': '🏁 Pays en Plus Forte Amélioration et Dégradation',
+        'leaderboard_indicator': 'Indicateur',
+        'leaderboard_size': 'Pays',
+        'leaderboard_region': 'Même région seulement',
+        'fastest_improving': 'Plus forte amélioration',
+        'fastest_worsening': 'Plus forte dégradation',
+        'slope': 'Pente',
+        'cagr': 'Croissance annuelle (TCAC)',
+        'leaderboard_empty': 'Aucun pays n\'a évolué dans ce sens.',
+        'leaderboard_note': 'La pente est la tendance des moindres carrés sur toutes les années disponibles (au moins 3) ; le R² indique à quel point elle est régulière. Pour l\'incidence, la mortalité et le Ratio MI, s\'améliorer signifie baisser. Les effectifs bruts ne sont pas classés, car ils croissent avec la population. Cliquez sur un en-tête de colonne pour trier.',
+        
+        # Recherche de pays comparables
+        'show_peers': 'Trouver des Pays Comparables',
+        'peers_title': '🧭 Pays Comparables',
+        'peer_years_back': 'Années en arrière',
+        'peer_count': 'Pays comparables',
+        'peer_indicator': 'Indicateur de trajectoire',
+        'peer_distance': 'Distance',
+        'peers_like': 'Pays les plus proches de',
+        'peers_in': 'tels qu\'ils étaient en',
+        'peers_none': 'Aucun pays comparable pour cette année.',
+        'peers_note': 'La similarité compare dépistage, détection précoce, traitement, survie, ratio MI et catégorie IDH, chacun standardisé sur l\'ensemble des pays et des années (plus la distance est faible, plus les pays se ressemblent). Les colonnes Δ montrent l\'évolution de chaque pays de son année de correspondance à sa dernière année ; le graphique les suit depuis',
+        
+        # Performance debug panel
+        'perf_debug': '⏱️ Débogage des performances',
+        'perf_this_run': 'Cette exécution',
+        'perf_recent': 'Exécutions récentes (ce processus serveur)',
+        'perf_span': 'Mesure',
+        
+        # Error
+        'no_data': 'Aucune donnée disponible pour',
+        'in': 'en',
+    }
+}
+
+# Translation key for each indicator column
+INDICATOR_LABELS = {
+    'Incidence_Rate_ASR': 'incidence_rate',
+    'Mortality_Rate_ASR': 'mortality_rate',
+    'New_Cases': 'new_cases',
+    'Deaths': 'deaths',
+    'MI_Ratio': 'mi_ratio',
+    'Population_Millions': 'population',
+    'Screening_Coverage_%': 'screening_coverage',
+    'Early_Detection_Rate_%': 'early_detection',
+    'Treatment_Coverage_%': 'treatment_coverage',
+    'Five_Year_Survival_%': 'survival_rate',
+}
+
+# Helper function to get translated text
+def t(key, lang='en'):
+    """Get translated text for given key and language"""
+    return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, key)
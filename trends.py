@@ -0,0 +1,135 @@
+"""
+Trend Statistics / Statistiques de Tendance
+Linear slope, R² and CAGR of every indicator for every country, fitted once at load.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bundle import INDICATOR_COLUMNS, INTEGER_COLUMNS
+from ranks import DIRECTION
+
+# Per (indicator, country) arrays the table holds
+FIELDS = ['slope', 'intercept', 'r2', 'cagr', 'n', 'first_year', 'last_year',
+          'resid_sd', 'year_mean', 'year_ss']
+
+# Fewest years a fit needs before its R² (and a leaderboard place) means anything
+MIN_POINTS = 3
+
+# Indicators that can improve: the leaderboards rank only these. Raw counts
+# grow with population, so their slope is left out whatever their direction
+LEADERBOARD_COLUMNS = [col for col in INDICATOR_COLUMNS
+                       if DIRECTION[col] is not None and col not in INTEGER_COLUMNS]
+
+
+class TrendTable:
+    """Least-squares trend per (indicator, country) over the year x country matrix
+
+    All fits are solved together: the normal-equation sums (n, Σx, Σy, Σx²,
+    Σxy, Σy²) are masked reductions along the year axis of the
+    (indicators, countries, years) block, so one pass covers every country
+    and indicator, with missing years simply left out. `slope` is per year;
+    `cagr` is the compound annual growth from the first to the last observed
+    value (NaN unless both are positive). `resid_sd`, `year_mean` and
+    `year_ss` (residual standard deviation, mean and spread of the fitted
+    years) are what prediction intervals need. Each field is an
+    (indicators, countries) array.
+    """
+
+    def __init__(self, matrix):
+        values = matrix.values
+        years = np.asarray(matrix.years, dtype=float)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=-1)
+
+        # Centre the years so the sums stay well conditioned
+        x = np.where(valid, years - years.mean(), 0.0)
+        y = np.where(valid, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x_mean = x.sum(axis=-1) / n
+            y_mean = y.sum(axis=-1) / n
+            sxx = (x * x).sum(axis=-1) - n * x_mean ** 2
+            sxy = (x * y).sum(axis=-1) - n * x_mean * y_mean
+            syy = (y * y).sum(axis=-1) - n * y_mean ** 2
+            slope = np.where(n >= 2, sxy / sxx, np.nan)
+            intercept = y_mean - slope * (x_mean + years.mean())
+            r2 = np.where(syy > 0, sxy ** 2 / (sxx * syy), 1.0)
+            r2 = np.where(n >= MIN_POINTS, np.clip(r2, 0.0, 1.0), np.nan)
+            resid_var = np.clip(syy - slope * sxy, 0.0, None) / (n - 2)
+            resid_sd = np.where(n >= MIN_POINTS, np.sqrt(resid_var), np.nan)
+
+        # First and last observed year of each series
+        first = valid.argmax(axis=-1)
+        last = values.shape[-1] - 1 - valid[..., ::-1].argmax(axis=-1)
+        first_value = np.take_along_axis(values, first[..., None], axis=-1)[..., 0]
+        last_value = np.take_along_axis(values, last[..., None], axis=-1)[..., 0]
+        span = years[last] - years[first]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cagr = (last_value / first_value) ** (1 / span) - 1
+        cagr = np.where((n >= 2) & (first_value > 0) & (last_value > 0), cagr, np.nan)
+
+        empty = n == 0
+        self._setup({
+            'slope': slope,
+            'intercept': intercept,
+            'r2': r2,
+            'cagr': cagr,
+            'n': n.astype(np.int16),
+            'first_year': np.where(empty, -1, years[first]).astype(np.int16),
+            'last_year': np.where(empty, -1, years[last]).astype(np.int16),
+            'resid_sd': resid_sd,
+            'year_mean': x_mean + years.mean(),
+            'year_ss': sxx,
+        }, matrix)
+
+    @classmethod
+    def from_arrays(cls, arrays, matrix):
+        """Rebuild from arrays() output (e.g. memory maps) without copying"""
+        table = cls.__new__(cls)
+        table._setup(arrays, matrix)
+        return table
+
+    def arrays(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def _setup(self, arrays, matrix):
+        for field in FIELDS:
+            arrays[field].setflags(write=False)
+            setattr(self, field, arrays[field])
+        self.countries = matrix.countries
+        self._matrix = matrix
+        self._positions = {name: i for i, name in enumerate(self.countries)}
+        self._indicators = {col: i for i, col in enumerate(INDICATOR_COLUMNS)}
+
+    def frame(self, indicator):
+        """Country x field trends of one indicator"""
+        i = self._indicators[indicator]
+        return pd.DataFrame({field: getattr(self, field)[i] for field in FIELDS},
+                            index=pd.Index(self.countries, name='Country'))
+
+    def for_country(self, country):
+        """indicator x field trends of one country, or None if unknown"""
+        position = self._positions.get(country)
+        if position is None:
+            return None
+        return pd.DataFrame({field: getattr(self, field)[:, position] for field in FIELDS},
+                            index=list(INDICATOR_COLUMNS))
+
+    def leaderboard(self, indicator, improving=True, n=10, region=None, min_points=MIN_POINTS):
+        """Top `n` countries by slope, best direction first when `improving`
+
+        Improving follows the indicator's DIRECTION (ranks.py): falling for
+        incidence, mortality and MI ratio, rising otherwise; only countries
+        moving that way are listed. Countries with fewer than `min_points`
+        years are left out and `region` keeps only that region's countries.
+        Rows carry each country's latest region and HDI category.
+        """
+        if indicator not in LEADERBOARD_COLUMNS:
+            raise ValueError(f"{indicator} has no better direction to rank improvement by")
+        table = self.frame(indicator).join(self._matrix.groups())
+        table = table[table['n'] >= min_points]
+        if region is not None:
+            table = table[table['Region'] == region]
+        rising_first = improving != (DIRECTION[indicator] == 'lower')
+        table = table[table['slope'] > 0] if rising_first else table[table['slope'] < 0]
+        return table.sort_values('slope', ascending=not rising_first, kind='stable').head(n)
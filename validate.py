@@ -0,0 +1,250 @@
+"""
+Data Validation / Validation des Données
+Integrity checks run on every source row while the CSV is streamed, with a JSON anomaly report.
+
+Row checks are vectorized over each parsed chunk. The per-country checks only
+keep each country's distinct (Region, HDI_Category) pairs. The (Country, Year)
+check reads the source row counts ingest already keeps, and exact repeats are
+the rows ingest drops by their hash. Memory therefore
+tracks countries and years, not rows, as in ingest.py. The report is written
+beside the bundle whenever it is compiled or refreshed.
+
+Usage: python validate.py [csv_path] [--chunksize ROWS]   # JSON report on stdout, exit 1 on anomalies
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bundle import CSV_PATH, INDICATOR_COLUMNS, _write_atomic, read_manifest, version_dir
+
+REPORT = "validation.json"
+
+# MI_Ratio is published to 2 decimals: allow that rounding and a little more
+MI_TOLERANCE = 0.05
+PERCENT_COLUMNS = [col for col in INDICATOR_COLUMNS if col.endswith('%')]
+
+# Anomalies listed per check in the report; all of them are counted
+MAX_EXAMPLES = 20
+
+CHECKS = {
+    'mi_ratio': f"MI_Ratio differs from Mortality_Rate_ASR / Incidence_Rate_ASR x 100 "
+                f"by more than {MI_TOLERANCE}",
+    'deaths_over_cases': "Deaths exceed New_Cases",
+    'percent_range': "A percentage lies outside 0-100",
+    'missing_value': "A Country, Year, New_Cases or Deaths cell is blank; rows without a Country or Year "
+                     "are left out, a blank count is left out of its sum",
+    'not_a_number': "A numeric cell holds something that is not a number; it is read as blank",
+    'repeated_row': "A row repeats an earlier one exactly; it was dropped",
+    'duplicate_key': "A (Country, Year) has more distinct source rows than the extract's usual number per "
+                     "pair (1 for a country-level extract); they were reduced as sub-units or periods "
+                     "(see ingest.py)",
+    'inconsistent_attributes': "A country has more than one Region or HDI_Category; the first row's are kept",
+}
+# Checks made row by row as the chunks stream in
+ROW_CHECKS = ['repeated_row', 'mi_ratio', 'deaths_over_cases', 'percent_range', 'missing_value', 'not_a_number']
+
+# Cells every row needs; other indicators may be blank
+REQUIRED_COLUMNS = ['Country', 'Year', 'New_Cases', 'Deaths']
+# Checks made cell by cell, with the columns they cover
+CELL_CHECKS = {'percent_range': PERCENT_COLUMNS, 'missing_value': REQUIRED_COLUMNS}
+
+
+def _row_checks(chunk):
+    """{check: boolean mask over rows (or rows x CELL_CHECKS columns)} for one parsed chunk"""
+    incidence = chunk['Incidence_Rate_ASR'].to_numpy(dtype=float)
+    mortality = chunk['Mortality_Rate_ASR'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = mortality / incidence * 100
+    percent = chunk[PERCENT_COLUMNS].to_numpy(dtype=float)
+    # Comparisons with NaN are False: missing values are not anomalies here
+    return {
+        'mi_ratio': np.abs(chunk['MI_Ratio'].to_numpy(dtype=float) - expected) > MI_TOLERANCE,
+        'deaths_over_cases': chunk['Deaths'].to_numpy(dtype=float) > chunk['New_Cases'].to_numpy(dtype=float),
+        'percent_range': (percent < 0) | (percent > 100),
+    }
+
+
+def _example(chunk, position, line, check):
+    """JSON-ready description of one anomalous row"""
+    row = chunk.iloc[position]
+    example = {'line': int(line), 'country': None if pd.isna(row['Country']) else str(row['Country']),
+               'year': None if pd.isna(row['Year']) else int(row['Year'])}
+    if check == 'mi_ratio':
+        example.update({col: float(row[col])
+                        for col in ('Incidence_Rate_ASR', 'Mortality_Rate_ASR', 'MI_Ratio')})
+        incidence = float(row['Incidence_Rate_ASR'])
+        # No expected ratio without a positive incidence to divide by
+        example['expected'] = (round(float(row['Mortality_Rate_ASR']) / incidence * 100, 4)
+                               if incidence > 0 else None)
+    elif check == 'deaths_over_cases':
+        example.update({'New_Cases': int(row['New_Cases']), 'Deaths': int(row['Deaths'])})
+    return example
+
+
+class Validator:
+    """Collects anomalies from the chunks ingest streams, then builds the report
+
+    add() is called once per parsed chunk, in file order. report() finishes
+    with the reduced frame and its source row counts.
+    """
+
+    def __init__(self, first_line=2):
+        self.line = first_line  # file line of the next row (line 1 is the header)
+        self.counts = {check: 0 for check in CHECKS}
+        self.examples = {check: [] for check in CHECKS}
+        self.attributes = {}  # country -> {column: [distinct values, first seen first]}
+
+    @classmethod
+    def resumed(cls, report, df, source_rows):
+        """Validator for rows appended after those `report` and `df` describe"""
+        validator = cls(first_line=source_rows + 2)
+        if report is not None:
+            for check in ROW_CHECKS:
+                validator.counts[check] = report['checks'][check]['count']
+                validator.examples[check] = list(report['checks'][check]['examples'])
+        validator._attributes(df)
+        if report is not None:
+            for example in report['checks']['inconsistent_attributes']['examples']:
+                seen = validator.attributes.setdefault(example['country'], {})
+                for col in ('Region', 'HDI_Category'):
+                    values = seen.setdefault(col, [])
+                    values.extend(value for value in example[col] if value not in values)
+        return validator
+
+    def add(self, chunk, repeated=None, unparsed=None):
+        """Check one chunk
+
+        `repeated` masks the rows ingest drops as exact repeats and
+        `unparsed` maps columns to the raw text of cells that are not
+        numbers (both from ingest.py).
+        """
+        if repeated is None:
+            repeated = np.zeros(len(chunk), dtype=bool)
+        unparsed = unparsed or {}
+        positions = np.flatnonzero(repeated)
+        examples = [_example(chunk, p, self.line + p, 'repeated_row') for p in positions[:self._room('repeated_row')]]
+        self._record('repeated_row', len(positions), examples)
+
+        examples = []
+        for column, texts in unparsed.items():
+            for p, text in zip(chunk.index.get_indexer(texts.index), texts):
+                if len(examples) < self._room('not_a_number'):
+                    examples.append({**_example(chunk, p, self.line + p, 'not_a_number'),
+                                     'column': column, 'value': str(text)})
+        self._record('not_a_number', sum(len(texts) for texts in unparsed.values()), examples)
+
+        checks = _row_checks(chunk)
+        # A cell that was not a number is reported as such, not as blank
+        blank = chunk[REQUIRED_COLUMNS].isna()
+        for column, texts in unparsed.items():
+            if column in blank.columns:
+                blank.loc[texts.index, column] = False
+        checks['missing_value'] = blank.to_numpy()
+        for check, mask in checks.items():
+            # A repeat is reported once, as such
+            mask = mask & ~(repeated[:, None] if mask.ndim == 2 else repeated)
+            if mask.ndim == 1:
+                positions = np.flatnonzero(mask)
+                examples = [_example(chunk, p, self.line + p, check) for p in positions[:self._room(check)]]
+            else:
+                # One anomaly per cell
+                positions, columns = np.nonzero(mask)
+                examples = []
+                for p, c in zip(positions[:self._room(check)], columns[:self._room(check)]):
+                    column = CELL_CHECKS[check][c]
+                    example = {**_example(chunk, p, self.line + p, check), 'column': column}
+                    if check == 'percent_range':
+                        example['value'] = float(chunk[column].iloc[p])
+                    examples.append(example)
+            self._record(check, len(positions), examples)
+        self._attributes(chunk)
+        self.line += len(chunk)
+
+    def _room(self, check):
+        return MAX_EXAMPLES - len(self.examples[check])
+
+    def _record(self, check, count, examples):
+        self.counts[check] += int(count)
+        self.examples[check].extend(examples)
+
+    def _attributes(self, frame):
+        # One entry per distinct (country, region, HDI) triple, not per row
+        distinct = frame.loc[frame['Country'].notna(), ['Country', 'Region', 'HDI_Category']].drop_duplicates()
+        for country, region, hdi in zip(distinct['Country'], distinct['Region'], distinct['HDI_Category']):
+            seen = self.attributes.setdefault(str(country), {'Region': [], 'HDI_Category': []})
+            for col, value in (('Region', str(region)), ('HDI_Category', str(hdi))):
+                if value not in seen.setdefault(col, []):
+                    seen[col].append(value)
+
+    def report(self, frame, counts, info):
+        """The anomaly report for the reduced `frame` (one row per pair) and its source `counts`"""
+        checks = {check: {'description': CHECKS[check], 'count': self.counts[check],
+                          'examples': self.examples[check]}
+                  for check in ROW_CHECKS}
+
+        # Rows per pair: ingest counts the source rows behind every reduced value
+        rows = counts['rows'].to_numpy(dtype=np.int64)
+        usual = int(np.bincount(rows).argmax()) if len(rows) else 1
+        extra = np.flatnonzero(rows > usual)
+        checks['duplicate_key'] = {
+            'description': CHECKS['duplicate_key'], 'count': len(extra), 'expected_rows': usual,
+            'examples': [{'country': str(frame['Country'].iloc[i]), 'year': int(frame['Year'].iloc[i]),
+                          'rows': int(rows[i])} for i in extra[:MAX_EXAMPLES]],
+        }
+
+        conflicts = [{'country': country, **values} for country, values in sorted(self.attributes.items())
+                     if len(values['Region']) > 1 or len(values['HDI_Category']) > 1]
+        checks['inconsistent_attributes'] = {
+            'description': CHECKS['inconsistent_attributes'], 'count': len(conflicts),
+            'examples': conflicts[:MAX_EXAMPLES],
+        }
+        return {
+            'sha256': info['sha256'],
+            'source_rows': info['source_rows'],
+            'rows': len(frame),
+            'anomalies': sum(check['count'] for check in checks.values()),
+            'checks': checks,
+        }
+
+
+def save_report(directory, report):
+    path = os.path.join(directory, REPORT)
+    # Strict JSON: a NaN or infinity here is a bug, not something to write out
+    _write_atomic(path, lambda f: f.write(json.dumps(report, indent=2, allow_nan=False).encode('utf-8')))
+
+
+def load_report(csv_path=CSV_PATH, manifest=None):
+    """The anomaly report of the bundle version `manifest` (default: the current one), or None if there is none"""
+    manifest = manifest or read_manifest(csv_path)
+    if manifest is None:
+        return None
+    try:
+        with open(os.path.join(version_dir(csv_path, manifest), REPORT), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    from ingest import DEFAULT_CHUNKSIZE, stream_country_years
+
+    parser = argparse.ArgumentParser(description="Check a CSV's integrity and print the anomaly report")
+    parser.add_argument('csv', nargs='?', default=CSV_PATH)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, metavar='ROWS')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validator = Validator()
+    frame, counts, info = stream_country_years(args.csv, args.chunksize, validator)
+    report = validator.report(frame, counts, info)
+    elapsed = time.perf_counter() - start
+    print(json.dumps(report, indent=2))
+    summary = ', '.join(f"{check} {result['count']}" for check, result in report['checks'].items())
+    print(f"{info['source_rows']:,} rows checked in {elapsed:.1f} s: {summary}", file=sys.stderr)
+    sys.exit(1 if report['anomalies'] else 0)